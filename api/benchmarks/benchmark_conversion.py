@@ -0,0 +1,71 @@
+"""Compares converting parsed recipes with the unit factor and density tables against pint quantities per line.
+
+Run from the api folder: python -m benchmarks.benchmark_conversion [recipes]
+"""
+import sys
+from time import perf_counter
+
+from functions.conversion import convert_ingredients, load_density_table
+from functions.units import get_unit_registry
+from functions.util import parse_recipe_ingredients
+
+INGREDIENTS = """2 cups bread flour
+1 1/2 cups all-purpose flour
+1 cup brown sugar
+1/2 cup sugar
+2 tbsp honey
+1 teaspoon salt
+2 1/4 teaspoons instant yeast
+1 lb butter
+250 ml milk
+100 grams chocolate chips
+1/4 cup olive oil
+2 eggs
+1 cup water
+3 tablespoons cocoa
+1 pinch cinnamon"""
+
+def legacy_convert(ingredients: list) -> list:
+    ureg = get_unit_registry()
+    densities = load_density_table()
+    result = []
+    for ingredient in ingredients:
+        try:
+            quantity = ingredient["quantity"] * ureg(ingredient["unit"])
+        except Exception:
+            result.append(None)
+            continue
+
+        if quantity.check("[mass]"):
+            result.append(quantity.to("gram").magnitude)
+        elif quantity.check("[volume]"):
+            density = densities.match(ingredient["raw"])
+            result.append(None if density is None else quantity.to("milliliter").magnitude * density)
+        else:
+            result.append(None)
+
+    return result
+
+def measure(name: str, convert, recipes: list) -> list:
+    start = perf_counter()
+    result = [convert(recipe) for recipe in recipes]
+    elapsed = perf_counter() - start
+    print(f"{name:>8}: {len(recipes) / elapsed:>10,.0f} recipes/s {elapsed / len(recipes) * 1_000_000:8.1f}us per recipe")
+
+    return result
+
+def main(count: int = 2_000):
+    ingredients = parse_recipe_ingredients(INGREDIENTS)
+    recipes = [[dict(ingredient) for ingredient in ingredients] for _ in range(count)]
+
+    legacy_convert(ingredients)
+    convert_ingredients(ingredients)
+
+    legacy = measure("pint", legacy_convert, recipes)
+    tables = measure("tables", convert_ingredients, recipes)
+
+    for expected, converted in zip(legacy[0], tables[0]):
+        assert (expected is None) == (converted["grams"] is None) and (expected is None or abs(round(expected, 2) - converted["grams"]) < 0.01)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
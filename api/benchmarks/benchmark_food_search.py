@@ -0,0 +1,61 @@
+"""Compares the inverted food search index against scanning every food description per ingredient.
+
+Run from the api folder: python -m benchmarks.benchmark_food_search [foods] [recipes] [ingredients]
+"""
+import sys
+import random
+import string
+from time import perf_counter
+
+from functions.food_search import FoodSearchIndex, build_search_index, tokenize, trigrams
+
+WORDS = ["flour", "bread", "wheat", "whole", "white", "enriched", "bleached", "egg", "large", "milk", "butter", "salted",
+         "sugar", "granulated", "brown", "salt", "table", "almond", "raw", "roasted", "oil", "olive", "rice", "oat",
+         "rolled", "cheese", "cheddar", "parmesan", "tomato", "canned", "onion", "garlic", "pepper", "black", "yeast",
+         "dry", "active", "honey", "cream", "sour", "chocolate", "dark", "cocoa", "powder", "baking", "soda", "vanilla"]
+
+NAMES = ["bread flour", "eggs", "unsalted butter", "granulated sugar", "table salt", "whole milk", "olive oil",
+         "dark chocolate", "active dry yeast", "brown sugar", "parmesan cheese", "rolled oats", "garlic", "honey", "buter"]
+
+def synthetic_foods(count: int) -> list:
+    # usda descriptions start with a common food word followed by a long tail of rarer qualifiers
+    rand = random.Random(42)
+    qualifiers = ["".join(rand.choices(string.ascii_lowercase, k=rand.randint(4, 9))) for _ in range(count // 3)]
+
+    return [{ "id": str(index), "description": ", ".join(rand.sample(WORDS, rand.randint(1, 2)) + rand.sample(qualifiers, rand.randint(1, 4))) }
+            for index in range(count)]
+
+def linear_search(foods: list, name: str, limit: int = 5) -> list:
+    query = set(trigrams(tokenize(name)))
+    scored = [(2 * len(query & grams) / (len(query) + len(grams)), id) for id, grams in foods]
+
+    return sorted(scored, reverse=True)[:limit]
+
+def measure(name: str, search, recipes: list):
+    latencies = []
+    for recipe in recipes:
+        start = perf_counter()
+        search(recipe)
+        latencies.append(perf_counter() - start)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    print(f"{name:>8}: {len(recipes) / sum(latencies):>10,.0f} recipes/s p50 {p50:8.2f}ms p95 {p95:8.2f}ms")
+
+def main(count: int = 5_000, requests: int = 200, ingredients: int = 12):
+    foods = synthetic_foods(count)
+
+    start = perf_counter()
+    index = FoodSearchIndex(build_search_index(foods))
+    print(f"indexed {count} foods in {perf_counter() - start:0.3f}s")
+
+    rand = random.Random(7)
+    recipes = [rand.sample(NAMES, ingredients) for _ in range(requests)]
+
+    scan = [(food["id"], set(trigrams(tokenize(food["description"])))) for food in foods]
+    measure("linear", lambda recipe: [linear_search(scan, name) for name in recipe], recipes)
+    measure("index", index.search_many, recipes)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
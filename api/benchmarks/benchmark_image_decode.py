@@ -0,0 +1,88 @@
+"""Compares latency and peak memory of the image resize paths on large JPEG and AVIF files.
+
+Each measurement runs in its own process so peak RSS is not shared between runs.
+Run from the api folder: python -m benchmarks.benchmark_image_decode [image files...]
+When no files are given, a 48MP JPEG and a 12MP AVIF are generated in a temporary folder.
+"""
+import io
+import os
+import sys
+import random
+import resource
+import tempfile
+import subprocess
+from time import perf_counter
+
+MODES = ["full", "thumbnail", "reduced"]
+
+def generate_images(folder: str) -> list:
+    from PIL import Image, ImageDraw
+    import pillow_avif
+
+    random.seed(42)
+    image = Image.new("RGB", (8000, 6000))
+    draw = ImageDraw.Draw(image)
+    for _ in range(3000):
+        x, y = random.randint(0, 8000), random.randint(0, 6000)
+        draw.ellipse((x, y, x + random.randint(10, 600), y + random.randint(10, 600)), fill=tuple(random.randint(0, 255) for _ in range(3)))
+
+    jpeg = os.path.join(folder, "large.jpg")
+    avif = os.path.join(folder, "large.avif")
+    image.save(jpeg, quality=90)
+    image.resize((4000, 3000)).save(avif, quality=70, speed=8)
+
+    return [jpeg, avif]
+
+def peak_rss_mb() -> float:
+    # VmHWM resets on exec, ru_maxrss is inherited from the parent process on linux
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run(path: str, mode: str):
+    from PIL import Image
+    import pillow_avif
+
+    from functions.util import MAX_IMAGE_SIZE, open_image_reduced
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    baseline = peak_rss_mb()
+    start = perf_counter()
+
+    if mode == "full":
+        # what a decode without any decoder level help costs
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        image.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS, reducing_gap=None)
+    elif mode == "thumbnail":
+        # the path parse_image used before the reduced decoder
+        image = Image.open(io.BytesIO(data))
+        image.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+    else:
+        image = open_image_reduced(data, MAX_IMAGE_SIZE)
+
+    image.save(io.BytesIO(), format=Image.open(io.BytesIO(data)).format)
+
+    elapsed = perf_counter() - start
+    peak = peak_rss_mb() - baseline
+    print(f"{os.path.basename(path):>12} {mode:>10}: {elapsed * 1000:8.0f}ms {peak:8.0f}MB peak")
+
+def main(paths: list):
+    with tempfile.TemporaryDirectory() as folder:
+        for path in paths or generate_images(folder):
+            for mode in MODES:
+                subprocess.run([sys.executable, "-m", "benchmarks.benchmark_image_decode", "--run", path, mode], check=True)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        run(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:])
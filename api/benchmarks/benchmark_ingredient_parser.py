@@ -0,0 +1,99 @@
+"""Compares the ingredient line parser against the implementation it replaced.
+
+Run from the api folder: python -m benchmarks.benchmark_ingredient_parser
+"""
+import re
+import random
+from fractions import Fraction
+from time import perf_counter
+
+from pint import UnitRegistry
+
+from functions.ingredient_parser import IngredientParser
+
+LINES = [
+    "2 teaspoons lemon juice",
+    "1 1/2 cups all-purpose flour",
+    "½ cup unsalted butter, melted",
+    "¾ teaspoon kosher salt",
+    "4 boneless pork chops",
+    "3 large eggs",
+    "250 grams bread flour",
+    "1 tbsp olive oil",
+    "2 1/4 tsp instant yeast",
+    "1 (14 ounce) can diced tomatoes",
+    "8 oz cream cheese, softened",
+    "2 lbs ground beef",
+    "1/3 cup brown sugar",
+    "500 ml whole milk",
+    "Salt and pepper to taste",
+    "3 cloves garlic, minced",
+]
+
+def legacy_replace_unicode_fractions(text: str):
+    result = text.replace("½", "1/2")
+    result = result.replace("¼", "1/4")
+    result = result.replace("¾", "3/4")
+    result = result.replace("⅓", "1/3")
+    result = result.replace("⅔", "2/3")
+
+    return result
+
+def legacy_parse_recipe_ingredient(text: str, lang: str, ureg: UnitRegistry):
+    text = legacy_replace_unicode_fractions(text)
+    qty_re = re.search(r"^(?P<Value>\d{1,5}\s\d{1,5}\/\d{1,5}|\d{1,5}\/\d{1,5}|\d{1,5}\.?\d{0,5})\d*\s?(?P<Unit>\w*\b)",
+                    text)
+
+    if not qty_re:
+        return { "raw": text, "quantity": 0, "unit": "" }
+
+    value = qty_re.group("Value")
+    unit = qty_re.group("Unit")
+    
+    unit_value = ""
+    if unit and unit in ureg:
+        unit_value = ureg.get_name(unit)
+
+    parts = value.split(" ")
+    
+    if parts.__len__() == 2:
+        whole = int(parts[0])
+        fraction = Fraction(parts[1])
+        return { "raw": text, "quantity": whole + float(fraction).__round__(2), "unit": unit_value }
+    
+    if parts[0].count("/") == 1:
+        fraction = Fraction(parts[0])
+        return { "raw": text, "quantity": float(fraction).__round__(2), "unit": unit_value }
+        
+    regular = parts[0]
+    return { "raw": text, "quantity": float(regular), "unit": unit_value }
+
+def measure(name: str, parse, lines: list) -> list:
+    start = perf_counter()
+    result = [parse(line) for line in lines]
+    elapsed = perf_counter() - start
+    print(f"{name:>8}: {len(lines) / elapsed:>12,.0f} lines/s ({elapsed:0.3f}s)")
+
+    return result
+
+def main(count: int = 50_000):
+    random.seed(42)
+    lines = [random.choice(LINES) for _ in range(count)]
+    ureg = UnitRegistry()
+
+    start = perf_counter()
+    parser = IngredientParser(ureg)
+    print(f"parser build time: {perf_counter() - start:0.4f}s")
+
+    start = perf_counter()
+    table_parser = IngredientParser()
+    print(f"prebuilt table parser build time: {perf_counter() - start:0.4f}s")
+
+    legacy = measure("legacy", lambda line: legacy_parse_recipe_ingredient(line, "en", ureg), lines)
+    engine = measure("engine", parser.parse, lines)
+    table = measure("table", table_parser.parse, lines)
+
+    assert legacy == engine == table, "parsers returned different results"
+
+if __name__ == "__main__":
+    main()
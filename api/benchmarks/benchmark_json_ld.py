@@ -0,0 +1,47 @@
+"""Compares reading the test recipe page from its JSON-LD only against building the scraper over the whole page.
+
+Run from the api folder: python -m benchmarks.benchmark_json_ld [iterations]
+"""
+import sys
+import tracemalloc
+from time import perf_counter
+
+import recipe_scrapers
+
+from functions.util import get_recipe_from_json_ld, get_recipe_from_scraper
+
+URL = "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+
+def full_scrape(html: bytes) -> dict:
+    return get_recipe_from_scraper(recipe_scrapers.scrape_html(html, URL, supported_only=False))
+
+def fast_scrape(html: bytes) -> dict:
+    return get_recipe_from_json_ld(html, URL)
+
+def measure(name: str, scrape, html: bytes, iterations: int) -> dict:
+    tracemalloc.start()
+    result = scrape(html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = perf_counter()
+    for _ in range(iterations):
+        scrape(html)
+    elapsed = perf_counter() - start
+    print(f"{name:>8}: {elapsed / iterations * 1000:8.2f}ms per page {peak / 1024 / 1024:8.2f}MB peak")
+
+    return result
+
+def main(iterations: int = 50):
+    html = open("test/test_recipe.html", "rb").read()
+
+    full_scrape(html)
+    fast_scrape(html)
+
+    full = measure("full", full_scrape, html, iterations)
+    fast = measure("json-ld", fast_scrape, html, iterations)
+
+    assert full == fast
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""Measures loading the nutrient matrix and calculating recipes against summing the foods' nutrient lists.
+
+Run from the api folder: python -m benchmarks.benchmark_nutrition [foods] [requests] [ingredients]
+"""
+import sys
+import json
+import random
+import tempfile
+from time import perf_counter
+
+from functions.nutrition import build_nutrition_data, load_nutrition_table, write_nutrition_data
+from functions.units import load_unit_table
+
+def synthetic_foods(count: int) -> list:
+    with open("test/merged_data.json") as file:
+        samples = json.load(file)
+
+    return [{ **samples[index % len(samples)], "id": str(index) } for index in range(count)]
+
+def legacy_calculate(foods: dict, ingredients: list) -> dict:
+    totals = {}
+    for ingredient in ingredients:
+        grams = ingredient["quantity"] * load_unit_table().factor(ingredient["unit"])[1]
+        for nutrient in foods[ingredient["id"]]["foodNutrients"]:
+            totals[nutrient["number"]] = totals.get(nutrient["number"], 0) + nutrient["amount"] * grams / 100
+
+    return totals
+
+def measure(name: str, calculate, recipes: list):
+    latencies = []
+    for recipe in recipes:
+        start = perf_counter()
+        calculate(recipe)
+        latencies.append(perf_counter() - start)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1_000_000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1_000_000
+    print(f"{name:>8}: {len(recipes) / sum(latencies):>10,.0f} recipes/s p50 {p50:8.1f}us p95 {p95:8.1f}us")
+
+def main(count: int = 20_000, requests: int = 5_000, ingredients: int = 15):
+    foods = synthetic_foods(count)
+    directory = tempfile.mkdtemp()
+
+    start = perf_counter()
+    write_nutrition_data(*build_nutrition_data(foods), directory)
+    print(f"built {count} foods in {perf_counter() - start:0.3f}s")
+
+    start = perf_counter()
+    table = load_nutrition_table(directory)
+    print(f"loaded in {(perf_counter() - start) * 1000:0.1f}ms, matrix {table.matrix.nbytes / 1024:,.0f}KB")
+
+    rand = random.Random(42)
+    recipes = [[{ "id": str(rand.randrange(count)), "quantity": rand.uniform(1, 500), "unit": rand.choice(["gram", "ounce"]) }
+                for _ in range(ingredients)] for _ in range(requests)]
+
+    by_id = { food["id"]: food for food in foods }
+    measure("legacy", lambda recipe: legacy_calculate(by_id, recipe), recipes)
+    measure("matrix", table.calculate, recipes)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
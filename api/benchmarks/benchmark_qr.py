@@ -0,0 +1,42 @@
+"""Compares the QR code fast path against building a new svg QRCode per share.
+
+Run from the api folder: python -m benchmarks.benchmark_qr
+"""
+import random
+import string
+from time import perf_counter
+
+import qrcode
+import qrcode.image.svg
+
+from functions.qr import render_qr_code
+
+def legacy_render_qr_code(share_id: str) -> str:
+    qr = qrcode.QRCode(image_factory=qrcode.image.svg.SvgPathImage)
+    qr.add_data(share_id)
+    qr.make(fit=True)
+
+    return qr.make_image().to_string(encoding='unicode')
+
+def measure(name: str, render, codes: list) -> list:
+    start = perf_counter()
+    result = [render(code) for code in codes]
+    elapsed = perf_counter() - start
+    size = sum(len(item) for item in result) / len(result)
+    print(f"{name:>8}: {len(codes) / elapsed:>10,.0f} codes/s ({elapsed:0.3f}s) {size:>8,.0f} chars per code")
+
+    return result
+
+def main(count: int = 2_000):
+    rand = random.Random(42)
+    codes = [''.join(rand.choices(population=string.ascii_uppercase + string.digits, k=6)) for _ in range(count)]
+
+    legacy = measure("legacy", legacy_render_qr_code, codes)
+    svg = measure("svg", render_qr_code, codes)
+    measure("bitmap", lambda code: render_qr_code(code, "bitmap"), codes)
+    measure("png", lambda code: render_qr_code(code, "png"), codes)
+
+    assert legacy == svg, "svg output changed"
+
+if __name__ == "__main__":
+    main()
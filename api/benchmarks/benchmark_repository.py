@@ -0,0 +1,73 @@
+"""Measures share-recipe and receive-recipe throughput and latency against the local repository.
+
+Run from the api folder: python -m benchmarks.benchmark_repository [requests] [concurrency] [latency ms]
+"""
+import os
+import sys
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import azure.functions as func
+
+from functions import receive_recipe, share_recipe
+from functions.repository import LocalRepository
+
+RECIPE = {
+    "title": "Brazilian cheese bread",
+    "notes": "Best served warm",
+    "ingredients": ["1 cup milk", "1/2 cup vegetable oil", "1 teaspoon salt", "2 cups tapioca flour", "2 eggs", "1 1/2 cups grated parmesan"],
+    "steps": ["Preheat the oven to 400 degrees", "Boil the milk, oil and salt", "Stir in the flour", "Mix in the eggs and cheese", "Bake for 20 minutes"],
+}
+
+def timed(call) -> tuple:
+    start = perf_counter()
+    response = call()
+    return perf_counter() - start, response
+
+def report(name: str, elapsed: float, latencies: list):
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000
+    print(f"{name:>8}: {len(latencies) / elapsed:>10,.0f} req/s p50 {p50:7.2f}ms p95 {p95:7.2f}ms")
+
+def run(name: str, calls: list, concurrency: int) -> list:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = perf_counter()
+        results = list(pool.map(timed, calls))
+        report(name, perf_counter() - start, [elapsed for elapsed, _ in results])
+
+    return [response for _, response in results]
+
+def main(count: int = 2_000, concurrency: int = 16, latency_ms: float = 5):
+    directory = tempfile.mkdtemp()
+    os.environ["LOCAL_REPOSITORY_PATH"] = os.path.join(directory, "items.db")
+    os.environ["LOCAL_REPOSITORY_LATENCY_MS"] = str(latency_ms)
+
+    repository = LocalRepository()
+    repository.connect()
+    share_recipe.mock_repository(repository)
+    receive_recipe.mock_repository(repository)
+
+    share = share_recipe.share_recipe.build().get_user_function()
+    receive = receive_recipe.receive_recipe.build().get_user_function()
+    body = json.dumps(RECIPE).encode()
+
+    print(f"{count} requests, concurrency {concurrency}, simulated latency {latency_ms}ms")
+
+    shared = run("share", [lambda: share(func.HttpRequest(method="POST", url="api/share-recipe", body=body))] * count, concurrency)
+    codes = [json.loads(response.get_body())["id"] for response in shared if response.status_code == 202]
+
+    def receive_call(code: str):
+        return lambda: receive(func.HttpRequest(method="POST", url="api/receive-recipe", body=json.dumps({ "code": code }).encode()))
+
+    repository.cache.clear()
+    run("receive", [receive_call(code) for code in codes], concurrency)
+    run("cached", [receive_call(code) for code in codes], concurrency)
+
+    for operation, stats in repository.stats().items():
+        print(f"{operation:>12}: {stats}")
+
+if __name__ == "__main__":
+    main(*(float(value) if index == 2 else int(value) for index, value in enumerate(sys.argv[1:])))
@@ -1,9 +1,20 @@
 import azure.functions as func
-from functions.parse_recipe import bp as parse_recipe_bp
-from functions.parse_recipe_html import bp as parse_recipe_html_bp
-from functions.process_image import bp as process_image_bp
-from functions.receive_recipe import bp as receive_recipe_bp
-from functions.share_recipe import bp as share_recipe_bp
+from functions.startup import profile_imports
+from functions.repository import warm_up_in_background
+from functions.nutrition import nutrition_data_available
+from functions.food_search import search_index_available
+
+with profile_imports():
+    from functions.parse_recipe import bp as parse_recipe_bp
+    from functions.parse_recipe_html import bp as parse_recipe_html_bp
+    from functions.parse_recipes import bp as parse_recipes_bp
+    from functions.parse_recipe_text import bp as parse_recipe_text_bp
+    from functions.import_backup import bp as import_backup_bp
+    from functions.process_image import bp as process_image_bp
+    from functions.receive_recipe import bp as receive_recipe_bp
+    from functions.share_recipe import bp as share_recipe_bp
+    from functions.calc_nutrition import bp as calc_nutrition_bp
+    from functions.lookup_ingredients import bp as lookup_ingredients_bp
 
 app = func.FunctionApp(http_auth_level=func.AuthLevel.FUNCTION)
 
@@ -11,4 +22,14 @@ app.register_functions(parse_recipe_bp)
 app.register_functions(process_image_bp)
 app.register_functions(receive_recipe_bp)
 app.register_functions(share_recipe_bp)
-app.register_functions(parse_recipe_html_bp)
\ No newline at end of file
+app.register_functions(parse_recipe_html_bp)
+app.register_functions(parse_recipes_bp)
+app.register_functions(parse_recipe_text_bp)
+app.register_functions(import_backup_bp)
+# the nutrition data is built from the notebooks dataset, its routes are only served once it is deployed
+if nutrition_data_available():
+    app.register_functions(calc_nutrition_bp)
+if search_index_available():
+    app.register_functions(lookup_ingredients_bp)
+
+warm_up_in_background()
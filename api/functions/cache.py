@@ -0,0 +1,207 @@
+import os
+import hashlib
+import tempfile
+from contextlib import suppress
+from collections import Counter, OrderedDict
+from threading import Lock
+from time import monotonic, time
+from typing import Any, Callable, Dict, Hashable, Union
+
+class CacheEntry:
+    __slots__ = ("value", "size", "expires_at")
+
+    def __init__(self, value: Any, size: int, expires_at: Union[float, None]):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and monotonic() >= self.expires_at
+
+class LruCache:
+    """Thread safe least recently used cache bounded by the total size of its values
+    Args:
+        max_bytes (int): maximum size of all values combined, 0 disables the cache
+        ttl (float): default time to live in seconds, None means entries never expire
+        sizeof (Callable): function used to measure a value, default is len
+    """
+    def __init__(self, max_bytes: int, ttl: Union[float, None] = None, sizeof: Callable[[Any], int] = len):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.counters = Counter()
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Gets a fresh value from the cache and records a hit or a miss
+        Args:
+            key (Hashable): cache key
+        Returns:
+            Any: the cached value or None when missing or expired
+        """
+        entry = self.get_entry(key)
+
+        if entry is None or entry.expired:
+            self.counters["misses"] += 1
+            return None
+
+        self.counters["hits"] += 1
+        return entry.value
+
+    def get_entry(self, key: Hashable) -> Union[CacheEntry, None]:
+        """Gets an entry even if it is expired so callers can revalidate it. No hit or miss is recorded
+        Args:
+            key (Hashable): cache key
+        Returns:
+            CacheEntry: the entry or None when missing
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key: Hashable, value: Any, ttl: Union[float, None] = None):
+        """Adds or replaces a value evicting the least recently used entries when the cache is full
+        Args:
+            key (Hashable): cache key
+            value (Any): value to store
+            ttl (float): time to live in seconds, default is the cache ttl
+        """
+        size = self.sizeof(value)
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._remove(key)
+
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = CacheEntry(value, size, expires_at)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.counters["evictions"] += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.counters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache counters along with its current size
+        Returns:
+            dict: entries, bytes, max bytes, hit ratio and every counter recorded
+        """
+        with self._lock:
+            result = { "entries": len(self._entries), "bytes": self._size, "maxBytes": self.max_bytes }
+
+        result.update(self.counters)
+        result["hits"] = self.counters["hits"]
+        result["misses"] = self.counters["misses"]
+        lookups = result["hits"] + result["misses"]
+        result["hitRatio"] = result["hits"] / lookups if lookups else 0
+
+        return result
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+class DiskCache:
+    """Least recently used cache of bytes stored as files in a directory so it survives process restarts.
+    Recency is tracked through the file modification time
+    Args:
+        directory (str): folder where entries are stored, created when missing
+        max_bytes (int): maximum size of all files combined
+        ttl (float): time to live in seconds, None means entries never expire
+    """
+    def __init__(self, directory: str, max_bytes: int, ttl: Union[float, None] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.counters = Counter()
+        self._lock = Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+    def get(self, key: str) -> Union[bytes, None]:
+        path = self._path(key)
+
+        try:
+            if self.ttl is not None and time() - os.path.getmtime(path) >= self.ttl:
+                self.counters["misses"] += 1
+                return None
+
+            with open(path, "rb") as file:
+                value = file.read()
+
+            os.utime(path)
+        except OSError:
+            self.counters["misses"] += 1
+            return None
+
+        self.counters["hits"] += 1
+        return value
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+
+        path = self._path(key)
+
+        # write to a temporary file first so concurrent readers never see a partial entry
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(value)
+
+        with self._lock:
+            with suppress(OSError):
+                self._size -= os.path.getsize(path)
+
+            os.replace(temp_path, path)
+            self._size += len(value)
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        result = { "bytes": self._size, "maxBytes": self.max_bytes }
+        result.update(self.counters)
+        result["hits"] = self.counters["hits"]
+        result["misses"] = self.counters["misses"]
+        lookups = result["hits"] + result["misses"]
+        result["hitRatio"] = result["hits"] / lookups if lookups else 0
+
+        return result
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _evict(self):
+        entries = sorted((entry for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.endswith(".tmp")),
+                         key=lambda entry: entry.stat().st_mtime)
+
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+
+            with suppress(OSError):
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._size -= size
+                self.counters["evictions"] += 1
@@ -0,0 +1,54 @@
+import logging
+import json
+import jsonschema
+
+import azure.functions as func
+from jsonschema import validate
+
+from typing import Union
+from uuid import uuid4
+from time import perf_counter
+
+from .models import calcNutritionSchema
+from .nutrition import NutritionTable, load_nutrition_table
+
+bp = func.Blueprint()
+
+table: Union[NutritionTable, None] = None
+
+def mock_nutrition_table(mock: NutritionTable):
+    global table
+    table = mock
+
+def get_nutrition_table() -> NutritionTable:
+    return table if table is not None else load_nutrition_table()
+
+@bp.route(route="calc-nutrition", methods=["POST"])
+def calc_nutrition(req: func.HttpRequest) -> func.HttpResponse:
+    start = perf_counter()
+    correlation_id = uuid4()
+
+    try:
+        req_body = req.get_json()
+        validate(instance=req_body, schema=calcNutritionSchema)
+
+        logging.info(f"processing calc nutrition request id {correlation_id} for {len(req_body)} ingredients")
+
+        result = get_nutrition_table().calculate(req_body)
+
+        return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+    except (ValueError, jsonschema.exceptions.ValidationError) as e:
+        logging.error(f"Failed to process calc nutrition request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not calculate nutrition because the data provided is invalid. Please try again.", status_code=400)
+    except OSError as e:
+        logging.error(f"Failed to load nutrition data for request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not calculate nutrition because the nutrition data is not available.", status_code=500)
+    except Exception as e:
+        logging.error(f"Failed to process calc nutrition request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not calculate nutrition due to an internal issue. Please try again.", status_code=400)
+    finally:
+        end = perf_counter()
+        logging.info(f"Finished processing calc nutrition request id {correlation_id}. Time taken: {end - start:0.4f}s")
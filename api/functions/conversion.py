@@ -0,0 +1,147 @@
+import os
+import re
+import sys
+import json
+
+from functools import lru_cache
+from typing import Any, Dict, List, Union
+
+from .food_search import tokenize
+from .units import BASE_UNITS, load_unit_table, unit_key
+
+DENSITY_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "densities.json")
+
+# other names recipes use for the ingredients in the table, bare words go to the kind most recipes mean
+DENSITY_SYNONYMS = {
+    "flour": "All-Purpose Flour",
+    "oil": "Vegetable oil",
+    "cream": "Heavy cream",
+    "yeast": "Instant yeast",
+    "shortening": "Vegetable shortening",
+    "powdered sugar": "Confectioners' sugar",
+    "icing sugar": "Confectioners' sugar",
+    "granulated sugar": "Sugar",
+    "white sugar": "Sugar",
+    "plain flour": "All-Purpose Flour",
+    "cocoa powder": "Cocoa",
+    "corn starch": "Cornstarch",
+}
+
+# the ingredient name ends before notes such as a comma, a parenthesis or an alternative
+NAME_END_PATTERN = re.compile(r"[,;]|\s(?:or|for|plus|and)\s", re.IGNORECASE)
+NOTE_PATTERN = re.compile(r"\([^)]*\)")
+
+def build_density_table(foods: List[dict]) -> Dict[str, Any]:
+    """Extracts the weight of a volume of each ingredient from the King Arthur dataset created by the notebooks
+    Args:
+        foods (list): ingredients with description and foodPortions with gramWeight, value and uom
+    Returns:
+        dict: ingredient descriptions along with their grams per milliliter
+    """
+    table = load_unit_table()
+    ingredients = []
+
+    for food in foods:
+        for portion in food.get("foodPortions") or []:
+            factor = table.factor(unit_key(portion.get("uom") or ""))
+            value, grams = float(portion.get("value") or 0), float(str(portion.get("gramWeight") or 0).split(" to ")[0])
+
+            if factor is not None and factor[0] == "volume" and value > 0 and grams > 0:
+                ingredients.append([food["description"], round(grams / (value * factor[1]), 4)])
+                break
+
+    return { "ingredients": ingredients }
+
+def write_density_table(data: Dict[str, Any], path: str = DENSITY_TABLE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, separators=(",", ":"))
+
+class DensityTable:
+    """Finds how much a volume of an ingredient weighs. Descriptions must end with the same word as the
+    ingredient name and the most specific one wins, e.g. 2 cups brown sugar matches brown sugar rather than
+    sugar while 1 cup sugar snap peas matches neither
+    Args:
+        data (dict): table created by build_density_table
+    """
+    def __init__(self, data: Dict[str, Any]):
+        densities = { description: density for description, density in data["ingredients"] }
+        synonyms = [(synonym, densities[description]) for synonym, description in DENSITY_SYNONYMS.items() if description in densities]
+
+        self.entries = [(frozenset(tokenize(description)), density) for description, density in [*data["ingredients"], *synonyms]]
+        self.by_head: Dict[str, List[int]] = {}
+        for position, (description, _) in enumerate([*data["ingredients"], *synonyms]):
+            tokens = tokenize(description)
+            if tokens:
+                self.by_head.setdefault(tokens[-1], []).append(position)
+
+        self.match = lru_cache(maxsize=4096)(self._match)
+
+    def _match(self, text: str) -> Union[float, None]:
+        """Finds the grams per milliliter of the ingredient described by text
+        Args:
+            text (str): ingredient line or name e.g. 1 cup all-purpose flour
+        Returns:
+            float: grams per milliliter or None when no ingredient matches
+        """
+        tokens = tokenize(NAME_END_PATTERN.split(NOTE_PATTERN.sub(" ", text), 1)[0])
+        if not tokens:
+            return None
+
+        best, best_size = None, 0
+        for position in self.by_head.get(tokens[-1], ()):
+            entry_tokens, density = self.entries[position]
+            if len(entry_tokens) > best_size and entry_tokens <= set(tokens):
+                best, best_size = density, len(entry_tokens)
+
+        return best
+
+@lru_cache(maxsize=None)
+def load_density_table(path: str = DENSITY_TABLE_PATH) -> DensityTable:
+    with open(path) as file:
+        return DensityTable(json.load(file))
+
+def convert_ingredients(ingredients: List[dict], densities: Union[DensityTable, None] = None) -> List[dict]:
+    """Converts the quantities of parsed ingredients to grams or milliliters in a single array operation.
+    Volumes are also weighed when the ingredient is in the density table
+    Args:
+        ingredients (list): ingredients with raw text, quantity and canonical unit as returned by the parser
+        densities (DensityTable): weights of a volume of each ingredient, default is the prebuilt table
+    Returns:
+        list: ingredients with baseQuantity and baseUnit, both None when the unit is not a mass or volume,
+        and grams, None when the weight is not known
+    """
+    import numpy as np
+
+    table = load_unit_table()
+    densities = densities or load_density_table()
+    dimensions, factors, weights = [], [], []
+
+    for ingredient in ingredients:
+        dimension, factor = table.factor(ingredient.get("unit") or "") or (None, np.nan)
+        weight = 1.0 if dimension == "mass" else None
+        if dimension == "volume":
+            weight = densities.match(ingredient.get("raw") or "")
+
+        dimensions.append(dimension)
+        factors.append(factor)
+        weights.append(np.nan if weight is None else weight)
+
+    quantities = np.fromiter((ingredient.get("quantity") or 0 for ingredient in ingredients), dtype=np.float64, count=len(ingredients))
+    base = quantities * np.asarray(factors, dtype=np.float64)
+    grams = base * np.asarray(weights, dtype=np.float64)
+
+    return [{
+        **ingredient,
+        "baseQuantity": None if dimension is None else round(float(quantity), 2),
+        "baseUnit": BASE_UNITS.get(dimension),
+        "grams": None if np.isnan(mass) else round(float(mass), 2),
+    } for ingredient, dimension, quantity, mass in zip(ingredients, dimensions, base.tolist(), grams.tolist())]
+
+if __name__ == "__main__":
+    # python -m functions.conversion king_arthur_data.json rebuilds the density table from the notebook dataset
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python -m functions.conversion <king_arthur_data.json>")
+
+    with open(sys.argv[1]) as file:
+        write_density_table(build_density_table(json.load(file)))
@@ -0,0 +1,154 @@
+import os
+import math
+import multiprocessing
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Union
+
+import azure.functions as func
+
+# seconds internal batch work waits for a free slot, only requests from clients are rejected right away
+BATCH_QUEUE_TIMEOUT = float(os.environ.get("IMAGE_POOL_BATCH_TIMEOUT", "60"))
+
+class ExecutorSaturatedError(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Executor is saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+def busy_response(error: ExecutorSaturatedError) -> func.HttpResponse:
+    """Builds the response sent when image work is rejected so clients know when to try again
+    """
+    return func.HttpResponse("The server is busy processing other images. Please try again later.", status_code=503,
+                             headers={ "Retry-After": str(error.retry_after) })
+
+def _timed_call(fn: Callable, *args) -> tuple:
+    # runs in the worker process, monotonic is system wide so it can be compared with the submit time
+    started = monotonic()
+    result = fn(*args)
+    return result, started, monotonic() - started
+
+class ImageExecutor:
+    """Runs CPU bound image work in a process pool so request threads stay free. At most
+    max_workers + max_queue calls are accepted at once, extra calls are rejected right away
+    unless they are willing to wait
+    Args:
+        max_workers (int): number of processes, 0 runs the work inline on the calling thread
+        max_queue (int): number of calls allowed to wait for a free process
+    """
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.counters = Counter()
+        self._timings = { "queueWait": [0.0, 0.0], "execution": [0.0, 0.0] }
+        self._slots = BoundedSemaphore(max(max_workers, 1) + max_queue)
+        self._pool: Union[ProcessPoolExecutor, None] = None
+        self._lock = Lock()
+
+    def run(self, fn: Callable, *args, timeout: Union[float, None] = None) -> Any:
+        """Runs fn with args in the pool and waits for the result
+        Args:
+            fn (Callable): module level function, it is pickled to reach the worker process
+            timeout (float): seconds to wait for a free slot, None rejects the call right away
+        Raises:
+            ExecutorSaturatedError: when every process is busy and the queue is still full after timeout,
+            or when a worker process died and the pool has to be started again
+        Returns:
+            Any: fn result
+        """
+        acquired = self._slots.acquire(blocking=False) if timeout is None else self._slots.acquire(timeout=timeout)
+        if not acquired:
+            with self._lock:
+                self.counters["rejected"] += 1
+            raise ExecutorSaturatedError(self.retry_after())
+
+        with self._lock:
+            self.counters["active"] += 1
+
+        try:
+            submitted = monotonic()
+
+            if self.max_workers == 0:
+                result, started, elapsed = _timed_call(fn, *args)
+            else:
+                pool = self._get_pool()
+                try:
+                    result, started, elapsed = pool.submit(_timed_call, fn, *args).result()
+                except BrokenProcessPool:
+                    # a worker died, e.g. killed for its memory use, the next call starts a new pool
+                    self._reset_pool(pool)
+                    raise ExecutorSaturatedError(self.retry_after())
+
+            with self._lock:
+                self._record("queueWait", max(started - submitted, 0))
+                self._record("execution", elapsed)
+                self.counters["completed"] += 1
+
+            return result
+        finally:
+            with self._lock:
+                self.counters["active"] -= 1
+            self._slots.release()
+
+    def retry_after(self) -> int:
+        """Estimates how many seconds it takes to drain the queue based on the average execution time
+        """
+        completed = self.counters["completed"]
+        average = self._timings["execution"][0] / completed if completed else 1
+
+        return max(math.ceil(average * (self.max_queue + 1) / max(self.max_workers, 1)), 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the executor counters along with queue wait and execution times
+        Returns:
+            dict: active, completed and rejected calls, pool restarts, average and maximum seconds spent queued and executing
+        """
+        result = { "workers": self.max_workers, "maxQueue": self.max_queue }
+
+        with self._lock:
+            result["active"] = self.counters["active"]
+            result["completed"] = self.counters["completed"]
+            result["rejected"] = self.counters["rejected"]
+            result["restarted"] = self.counters["restarted"]
+
+            for name, (total, maximum) in self._timings.items():
+                result[f"{name}Avg"] = total / result["completed"] if result["completed"] else 0
+                result[f"{name}Max"] = maximum
+
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _reset_pool(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            # calls that failed on the same pool only replace it once
+            if self._pool is broken:
+                self._pool = None
+                self.counters["restarted"] += 1
+
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn avoids forking the host's threads along with the worker
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+            return self._pool
+
+    def _record(self, name: str, elapsed: float):
+        # called with the lock held
+        timing = self._timings[name]
+        timing[0] += elapsed
+        timing[1] = max(timing[1], elapsed)
+
+image_executor = ImageExecutor(
+    max_workers=int(os.environ.get("IMAGE_POOL_WORKERS", str(os.cpu_count() or 1))),
+    max_queue=int(os.environ.get("IMAGE_POOL_QUEUE", "4")))
@@ -0,0 +1,192 @@
+import os
+import re
+import sys
+import json
+import heapq
+import logging
+import math
+
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+from .nutrition import NUTRITION_DATA_DIR
+
+FOOD_SEARCH_INDEX_FILE = "food_search.json"
+
+# trigrams found in more than this share of the foods say little about a match and are skipped
+MAX_TRIGRAM_FREQUENCY = 0.2
+MIN_SCORE = 0.05
+MAX_CANDIDATES = int(os.environ.get("FOOD_SEARCH_MAX_CANDIDATES", "100"))
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into lowercase words reduced to their singular form, e.g. Eggs, whole becomes egg and whole
+    Args:
+        text (str): food description or ingredient name
+    Returns:
+        list: distinct words in order
+    """
+    tokens = {}
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if len(token) > 3 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("oes"):
+            token = token[:-2]
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+
+        if len(token) > 1 or token.isdigit():
+            tokens[token] = None
+
+    return list(tokens)
+
+def trigrams(tokens: Iterable[str]) -> List[str]:
+    result = {}
+    for token in tokens:
+        padded = f"${token}$"
+        for start in range(len(padded) - 2):
+            result[padded[start:start + 3]] = None
+
+    return list(result)
+
+def build_search_index(foods: List[dict]) -> Dict[str, Any]:
+    """Builds the inverted token and trigram index of the food descriptions in the merged dataset
+    Args:
+        foods (list): foods with id and description
+    Returns:
+        dict: ids, descriptions and the rows of each token and trigram
+    """
+    tokens, grams = {}, {}
+
+    for row, food in enumerate(foods):
+        food_tokens = tokenize(food.get("description") or "")
+
+        for token in food_tokens:
+            tokens.setdefault(token, []).append(row)
+        for trigram in trigrams(food_tokens):
+            grams.setdefault(trigram, []).append(row)
+
+    return {
+        "ids": [str(food["id"]) for food in foods],
+        "descriptions": [food.get("description") or "" for food in foods],
+        "tokens": tokens,
+        "trigrams": grams,
+    }
+
+def write_search_index(index: Dict[str, Any], directory: str = NUTRITION_DATA_DIR):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, FOOD_SEARCH_INDEX_FILE), "w") as file:
+        json.dump(index, file, separators=(",", ":"))
+
+class FoodSearchIndex:
+    """Finds foods by name. Words matched exactly weigh the most, trigrams catch typos and partial words
+    Args:
+        index (dict): index created by build_search_index
+    """
+    def __init__(self, index: Dict[str, Any]):
+        self.ids: List[str] = index["ids"]
+        self.descriptions: List[str] = index["descriptions"]
+        self.tokens: Dict[str, List[int]] = index["tokens"]
+        self.trigrams: Dict[str, List[int]] = index["trigrams"]
+        self.row_trigrams = [set(trigrams(tokenize(description))) for description in self.descriptions]
+        self.heads = [next(iter(tokenize(description)), "") for description in self.descriptions]
+
+        count = max(len(self.ids), 1)
+        self.idf = { token: math.log(1 + count / len(rows)) for token, rows in self.tokens.items() }
+        # words no food has count as the rarest ones so missing them lowers the score
+        self.unknown_idf = math.log(1 + count)
+        self.max_trigram_rows = max(int(count * MAX_TRIGRAM_FREQUENCY), 10)
+
+    def search(self, name: str, limit: int = 5) -> List[dict]:
+        """Ranks the foods that best match a name
+        Args:
+            name (str): ingredient name e.g. bread flour
+            limit (int): maximum number of foods returned
+        Returns:
+            list: foods with id, description and score, best first
+        """
+        query_tokens = tokenize(name)
+        query_trigrams = set(trigrams(query_tokens))
+        if not query_tokens:
+            return []
+
+        token_scores, trigram_counts = Counter(), Counter()
+        for token in query_tokens:
+            for row in self.tokens.get(token, ()):
+                token_scores[row] += self.idf[token]
+
+        # words no food has are likely typos or partial words, their trigrams bring in foods with similar words
+        for trigram in trigrams(token for token in query_tokens if token not in self.tokens):
+            rows = self.trigrams.get(trigram, ())
+            if len(rows) <= self.max_trigram_rows:
+                trigram_counts.update(rows)
+
+        # only the foods sharing the most words with the name are scored, trigrams break ties
+        ranks = token_scores.copy()
+        for row, count in trigram_counts.items():
+            ranks[row] += count / 1000
+
+        candidates = [row for row, _ in ranks.most_common(MAX_CANDIDATES)]
+
+        total_idf = sum(self.idf.get(token, self.unknown_idf) for token in query_tokens)
+        scored = []
+        for row in candidates:
+            # how much of the name the food covers, and how much of the food is left over to prefer plain foods
+            shared = len(query_trigrams & self.row_trigrams[row])
+            coverage = shared / len(query_trigrams)
+            similarity = 2 * shared / (len(query_trigrams) + len(self.row_trigrams[row]))
+            score = 0.6 * token_scores[row] / total_idf + 0.25 * coverage + 0.15 * similarity
+            if self.heads[row] in query_tokens:
+                score += 0.1
+
+            if score >= MIN_SCORE:
+                scored.append((score, row))
+
+        return [{ "id": self.ids[row], "description": self.descriptions[row], "score": round(score, 4) }
+                for score, row in heapq.nlargest(limit, scored)]
+
+    def search_many(self, names: List[str], limit: int = 5) -> List[List[dict]]:
+        """Ranks the foods of every name in a batch, names repeated in the batch are searched once
+        Args:
+            names (list): ingredient names
+            limit (int): maximum number of foods returned per name
+        Returns:
+            list: matches of each name in the same order
+        """
+        results = {}
+        for name in names:
+            key = " ".join(tokenize(name))
+            if key not in results:
+                results[key] = self.search(name, limit)
+
+        return [results[" ".join(tokenize(name))] for name in names]
+
+def search_index_available(directory: str = NUTRITION_DATA_DIR) -> bool:
+    return os.path.exists(os.path.join(directory, FOOD_SEARCH_INDEX_FILE))
+
+@lru_cache(maxsize=None)
+def load_search_index(directory: str = NUTRITION_DATA_DIR) -> FoodSearchIndex:
+    """Loads the prebuilt search index once per worker
+    Args:
+        directory (str): folder with the file written by write_search_index
+    Raises:
+        OSError: when the index was not built
+    Returns:
+        FoodSearchIndex: index ready to search
+    """
+    with open(os.path.join(directory, FOOD_SEARCH_INDEX_FILE)) as file:
+        index = json.load(file)
+
+    logging.info(f"Loaded food search index for {len(index['ids'])} foods from {directory}")
+
+    return FoodSearchIndex(index)
+
+if __name__ == "__main__":
+    # python -m functions.food_search merged_data.json builds the index from the dataset created by the notebooks
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python -m functions.food_search <merged_data.json> [output folder]")
+
+    with open(sys.argv[1]) as file:
+        write_search_index(build_search_index(json.load(file)), *sys.argv[2:3])
@@ -0,0 +1,225 @@
+import logging
+import json
+import os
+import base64
+import jsonschema
+
+import azure.functions as func
+from jsonschema import validate
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import IO, Dict, Iterator, List, Tuple, Union
+from uuid import uuid4
+from time import perf_counter
+from zipfile import BadZipFile, ZipFile, is_zipfile
+
+from .executor import BATCH_QUEUE_TIMEOUT, image_executor
+from .models import backupRecipeSchema
+from .util import guess_mime, image_cache, parse_recipe_texts, to_data_uri, transform_image_cached
+
+bp = func.Blueprint()
+
+# images are decoded by the image executor, this pool only keeps enough of them in flight
+max_workers = int(os.environ.get("IMPORT_BACKUP_MAX_WORKERS", "4"))
+executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import-backup")
+
+MAX_BACKUP_MEMBER_BYTES = int(os.environ.get("MAX_BACKUP_MEMBER_BYTES", str(50 * 1024 * 1024)))
+
+def read_backup(stream: IO[bytes]) -> Tuple[List[dict], List[dict], Dict[str, Tuple[ZipFile, str]]]:
+    """Reads a backup file. Zip archives are read one member at a time, images inside them are only
+    referenced so they are decompressed when processed
+    Args:
+        stream (IO): backup file, either a zip archive or a json document
+    Raises:
+        ValueError: when the file is not a valid backup or a recipe document is over MAX_BACKUP_MEMBER_BYTES
+    Returns:
+        tuple: recipes, categories and the images found in the archive by member name
+    """
+    if not is_zipfile(stream):
+        stream.seek(0)
+        recipes, categories = read_backup_document(json.load(stream))
+
+        return recipes, categories, {}
+
+    archive = ZipFile(stream)
+    recipes, categories, images = [], [], {}
+
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+
+        is_document = info.filename.lower().endswith(".json")
+
+        # an image too large is left out, a recipe document too large would silently import nothing
+        if info.file_size > MAX_BACKUP_MEMBER_BYTES:
+            if is_document:
+                raise ValueError(f"Backup member {info.filename} has {info.file_size} bytes which is over the limit of {MAX_BACKUP_MEMBER_BYTES}")
+
+            logging.warning(f"Skipping backup member {info.filename} with {info.file_size} bytes")
+            continue
+
+        if is_document:
+            with archive.open(info) as member:
+                member_recipes, member_categories = read_backup_document(json.load(member))
+
+            recipes.extend(member_recipes)
+            categories.extend(member_categories)
+        elif (guess_mime(info.filename) or "").startswith("image/"):
+            images[info.filename] = (archive, info.filename)
+            images.setdefault(os.path.basename(info.filename), (archive, info.filename))
+
+    return recipes, categories, images
+
+def read_backup_document(document: Union[list, dict]) -> Tuple[List[dict], List[dict]]:
+    """Gets the recipes and categories of a backup document. Version 1 is a list of recipes and
+    version 2 is an object with recipes and categories
+    Args:
+        document (list | dict): backup document
+    Raises:
+        ValueError: when the document is not a backup
+        ValidationError: when a recipe is not valid
+    Returns:
+        tuple: recipes and categories
+    """
+    if isinstance(document, list):
+        recipes, categories = document, []
+    elif isinstance(document, dict) and isinstance(document.get("recipes"), list):
+        recipes, categories = document["recipes"], document.get("categories") or []
+    else:
+        raise ValueError("The document is not a backup")
+
+    for recipe in recipes:
+        validate(instance=recipe, schema=backupRecipeSchema)
+
+    return recipes, categories
+
+def media_of(recipe: dict) -> List[dict]:
+    media = recipe.get("images") or recipe.get("media") or ([recipe["image"]] if recipe.get("image") else [])
+
+    return [{ "type": item.get("type") or "img", "url": item.get("url") } if isinstance(item, dict) else { "type": "img", "url": item }
+            for item in media if item]
+
+def process_media(item: dict, images: Dict[str, Tuple[ZipFile, str]]) -> dict:
+    """Reduces an embedded image the same way uploads are. Images are either data uris or the name of an image
+    in the archive, anything else e.g. a web address is returned as is
+    Args:
+        item (dict): media with type and url
+        images (dict): images found in the archive by member name
+    Returns:
+        dict: media with the image replaced by the reduced data uri
+    """
+    url = item.get("url")
+    if not isinstance(url, str):
+        return item
+
+    try:
+        if url.startswith("data:"):
+            header, _, data = url.partition(",")
+            mime = header[len("data:"):].split(";")[0]
+            if not mime.startswith("image/") or not header.endswith(";base64"):
+                return item
+
+            name, contents = "image", base64.b64decode(data)
+        elif url in images:
+            archive, name = images[url]
+            mime = guess_mime(name)
+            contents = archive.read(name)
+        else:
+            return item
+
+        image, mime = transform_image_cached(name, contents, True, mime, BATCH_QUEUE_TIMEOUT)
+
+        return { **item, "url": to_data_uri(image, mime) }
+    except Exception as e:
+        # a broken image should not prevent the rest of the recipe from being restored
+        logging.warning(f"Could not process backup image. Error: {e}")
+
+        return item
+
+def import_recipes(recipes: List[dict], images: Dict[str, Tuple[ZipFile, str]]) -> List[Tuple[dict, List[Future]]]:
+    """Parses the ingredients and steps of backup recipes and submits their images to be reduced
+    Args:
+        recipes (list): recipes from the backup
+        images (dict): images found in the archive by member name
+    Returns:
+        list: each recipe along with the futures of its media in the same order as the backup
+    """
+    texts = parse_recipe_texts([{
+        "id": index,
+        "ingredients": "\n".join(raw_of(item) for item in recipe.get("ingredients") or [] if item is not None),
+        "steps": "\n".join(raw_of(item) for item in recipe.get("steps") or [] if item is not None)
+    } for index, recipe in enumerate(recipes)])
+
+    result = []
+    for recipe, parsed in zip(recipes, texts):
+        imported = { key: value for key, value in recipe.items() if key not in ("image", "images", "media") }
+        imported.update(ingredients=parsed["ingredients"], steps=parsed["steps"])
+
+        result.append((imported, [executor.submit(process_media, item, images) for item in media_of(recipe)]))
+
+    return result
+
+def completed_recipes(pending: List[Tuple[dict, List[Future]]]) -> Iterator[Tuple[int, dict]]:
+    """Yields each recipe as soon as all of its media is processed
+    Args:
+        pending (list): recipes along with the futures of their media
+    Returns:
+        Iterator: recipe index in the backup and the recipe with its media
+    """
+    remaining = { index: len(media) for index, (_, media) in enumerate(pending) }
+    owners = { future: index for index, (_, media) in enumerate(pending) for future in media }
+
+    for index, count in remaining.items():
+        if count == 0:
+            yield index, finish_recipe(*pending[index])
+
+    for future in as_completed(owners):
+        index = owners[future]
+        remaining[index] -= 1
+        if remaining[index] == 0:
+            yield index, finish_recipe(*pending[index])
+
+def finish_recipe(recipe: dict, media: List[Future]) -> dict:
+    recipe["media"] = [future.result() for future in media]
+
+    return recipe
+
+def raw_of(item: Union[str, dict]) -> str:
+    return (item.get("raw") or "") if isinstance(item, dict) else str(item)
+
+@bp.route(route="import-backup", methods=["POST"])
+def import_backup(req: func.HttpRequest) -> func.HttpResponse:
+    start = perf_counter()
+    correlation_id = uuid4()
+    try:
+        logging.info(f"processing import backup request id {correlation_id}")
+
+        for file in req.files.values():
+            recipes, categories, images = read_backup(file.stream)
+            pending = import_recipes(recipes, images)
+
+            logging.info(f"importing {len(recipes)} recipes and {len(images)} images for request id {correlation_id}")
+
+            # the ndjson body is buffered, its lines follow the order recipes finish in and carry their backup index
+            if "application/x-ndjson" in (req.headers.get("Accept") or ""):
+                lines = [json.dumps({ "categories": categories }) + "\n"]
+                lines.extend(json.dumps({ "index": index, "recipe": recipe }) + "\n" for index, recipe in completed_recipes(pending))
+
+                return func.HttpResponse("".join(lines), status_code=200, mimetype="application/x-ndjson")
+
+            # ingredients and steps are parsed objects so this is not a version 2 backup the app can restore as is
+            result = { "recipes": [finish_recipe(*item) for item in pending], "categories": categories }
+
+            return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+
+        return func.HttpResponse("A single backup file is required to import", status_code=400)
+    except (ValueError, BadZipFile, jsonschema.exceptions.ValidationError) as e:
+        logging.error(f"Failed to process import backup request id {correlation_id}. Error: {e}")
+        return func.HttpResponse("Could not import the backup because the file provided is invalid. Please try again.", status_code=400)
+    except Exception as e:
+        logging.error(f"Failed to process import backup request id {correlation_id}. Error: {e}")
+        return func.HttpResponse("Could not import the backup due to an internal issue. Please try again.", status_code=400)
+    finally:
+        end = perf_counter()
+        logging.debug(f"Image executor stats: {image_executor.stats()}, image cache stats: {image_cache.stats()}")
+        logging.info(f"Finished processing import backup request id {correlation_id}. Time taken: {end - start:0.4f}s")
@@ -0,0 +1,100 @@
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from .units import UnitTable, build_unit_table, get_unit_registry, load_unit_table
+
+if TYPE_CHECKING:
+    from pint import UnitRegistry
+
+# every vulgar fraction available in unicode
+UNICODE_FRACTIONS = {
+    "½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4",
+    "⅕": "1/5", "⅖": "2/5", "⅗": "3/5", "⅘": "4/5", "⅙": "1/6",
+    "⅚": "5/6", "⅐": "1/7", "⅛": "1/8", "⅜": "3/8", "⅝": "5/8",
+    "⅞": "7/8", "⅑": "1/9", "⅒": "1/10", "↉": "0/3",
+}
+
+FRACTIONS_TABLE = str.maketrans(UNICODE_FRACTIONS)
+
+QUANTITY_PATTERN = re.compile(r"^(?P<Value>\d{1,5}\s\d{1,5}\/\d{1,5}|\d{1,5}\/\d{1,5}|\d{1,5}\.?\d{0,5})\d*\s?(?P<Unit>\w*\b)")
+
+TIME_PATTERN = re.compile(r"(?P<Minutes>\d{1,5}\.?\d{0,5})\s*(minutes|minute|min)\b|(?P<Hours>\d{1,5}\.?\d{0,5})\s*(hours|hour)\b|(?P<Days>\d{1,5}\.?\d{0,5})\s*(days|day)\b")
+
+class IngredientParser:
+    """Parses ingredient lines with patterns and unit lookups prepared once per unit registry
+    Args:
+        ureg (UnitRegistry): registry used to identify units, default is the shared registry built only when needed
+        lookup_cache_size (int): number of resolved tokens kept in memory
+    """
+    def __init__(self, ureg: "UnitRegistry" = None, lookup_cache_size: int = 4096):
+        self.ureg = ureg
+        self.units = UnitTable(build_unit_table(ureg)) if ureg is not None else load_unit_table()
+        self.lookup_unit = lru_cache(maxsize=lookup_cache_size)(self._resolve_unit)
+
+    def _resolve_unit(self, token: str) -> str:
+        """Finds the canonical unit name for a token, asking pint only when the unit table cannot decide
+        Args:
+            token (str): token found after the quantity e.g. cups
+        Returns:
+            str: canonical unit name or empty when the token is not a unit
+        """
+        unit = self.units.lookup(token)
+
+        if unit is None:
+            unit = self._lookup_unit_in_registry(token)
+
+        return unit
+
+    def parse(self, text: str):
+        """Parses a single recipe ingredient
+        Args:
+            text (str): the ingredient e.g. 10 grams flour
+        Returns:
+            dictionary: raw text, quantity parsed, unit identified
+        """
+        text = text.translate(FRACTIONS_TABLE)
+        qty_re = QUANTITY_PATTERN.search(text)
+
+        if not qty_re:
+            return { "raw": text, "quantity": 0, "unit": "" }
+
+        value = qty_re.group("Value")
+        unit = qty_re.group("Unit")
+
+        unit_value = self.lookup_unit(unit) if unit else ""
+
+        parts = value.split(" ")
+
+        if len(parts) == 2:
+            whole = int(parts[0])
+            fraction = Fraction(parts[1])
+            return { "raw": text, "quantity": whole + round(float(fraction), 2), "unit": unit_value }
+
+        if parts[0].count("/") == 1:
+            fraction = Fraction(parts[0])
+            return { "raw": text, "quantity": round(float(fraction), 2), "unit": unit_value }
+
+        return { "raw": text, "quantity": float(parts[0]), "unit": unit_value }
+
+    def _lookup_unit_in_registry(self, token: str) -> str:
+        ureg = self.ureg if self.ureg is not None else get_unit_registry()
+
+        if token in ureg:
+            return ureg.get_name(token)
+
+        return ""
+
+def get_ingredient_parser(ureg: "UnitRegistry" = None) -> IngredientParser:
+    """Gets the parser prepared for a unit registry, building it on first use
+    Args:
+        ureg (UnitRegistry): registry used to identify units, default uses the prebuilt unit table
+    Returns:
+        IngredientParser: parser for the registry
+    """
+    return _build_ingredient_parser(ureg)
+
+@lru_cache(maxsize=4)
+def _build_ingredient_parser(ureg: "UnitRegistry") -> IngredientParser:
+    return IngredientParser(ureg)
@@ -0,0 +1,71 @@
+import re
+import inspect
+
+from typing import TYPE_CHECKING, AnyStr, Union
+
+if TYPE_CHECKING:
+    from recipe_scrapers import AbstractScraper
+
+# the html tag holds the language, meta tags the open graph image and the scripts the recipe itself
+HTML_TAG_PATTERN = re.compile(rb"<html\b[^>]*>", re.IGNORECASE)
+META_TAG_PATTERN = re.compile(rb"<meta\b[^>]*>", re.IGNORECASE)
+JSON_LD_PATTERN = re.compile(rb"<script\b[^>]*application/ld\+json[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+# fields get_recipe_from_scraper reads, scrapers that implement any of them from the page need the whole page
+SCHEMA_FIELDS = ("title", "total_time", "yields", "ingredients", "instructions", "instructions_list", "image", "language", "nutrients")
+SCHEMA_BACKED_CLASSES = ("AbstractScraper", "SchemaScraperFactory.SchemaScraper")
+
+def reduce_page(html: AnyStr) -> Union[AnyStr, None]:
+    """Keeps only the parts of a page a schema.org recipe is read from: the html tag, meta tags and json-ld scripts
+    Args:
+        html (str | bytes): page contents
+    Returns:
+        str | bytes: small page of the same type as html, None when no json-ld script mentions a recipe
+    """
+    content = html.encode() if isinstance(html, str) else html
+
+    scripts = [script for script in JSON_LD_PATTERN.findall(content) if b"Recipe" in script]
+    if not scripts:
+        return None
+
+    opening = HTML_TAG_PATTERN.search(content)
+    reduced = b"".join([opening.group() if opening else b"<html>", b"<head>", *META_TAG_PATTERN.findall(content), *scripts, b"</head></html>"])
+
+    return reduced.decode() if isinstance(html, str) else reduced
+
+def is_schema_backed(scraper_class: type) -> bool:
+    """Checks whether a scraper reads every recipe field from schema.org rather than from the page elements
+    Args:
+        scraper_class (type): scraper registered for the host
+    Returns:
+        bool: True when the fields come from AbstractScraper or the generic schema scraper
+    """
+    for field in SCHEMA_FIELDS:
+        # recipe_scrapers wraps the methods with its plugins, unwrap finds the class that implements them
+        method = inspect.unwrap(getattr(scraper_class, field))
+        if method.__qualname__.rsplit(".", 1)[0] not in SCHEMA_BACKED_CLASSES:
+            return False
+
+    return True
+
+def scrape_json_ld(html: Union[str, bytes], url: str) -> Union["AbstractScraper", None]:
+    """Builds the scraper from the page's structured data only, skipping the DOM of the rest of the page.
+    Pages without a json-ld recipe, or from sites whose scraper reads the page, are left to the full scraper
+    Args:
+        html (str | bytes): page contents
+        url (str): URL of the page
+    Returns:
+        AbstractScraper: scraper over the reduced page or None when the whole page is needed
+    """
+    from recipe_scrapers import SCRAPERS, scrape_html
+    from recipe_scrapers._utils import get_host_name
+
+    scraper_class = SCRAPERS.get(get_host_name(url))
+    if scraper_class is not None and not is_schema_backed(scraper_class):
+        return None
+
+    reduced = reduce_page(html)
+    if reduced is None:
+        return None
+
+    return scrape_html(reduced, url, supported_only=False)
@@ -0,0 +1,61 @@
+import logging
+import json
+import jsonschema
+
+import azure.functions as func
+from jsonschema import validate
+
+from typing import Union
+from uuid import uuid4
+from time import perf_counter
+
+from .models import lookupIngredientsSchema
+from .food_search import FoodSearchIndex, load_search_index
+
+bp = func.Blueprint()
+
+MAX_LIMIT = 20
+
+index: Union[FoodSearchIndex, None] = None
+
+def mock_search_index(mock: FoodSearchIndex):
+    global index
+    index = mock
+
+def get_search_index() -> FoodSearchIndex:
+    return index if index is not None else load_search_index()
+
+@bp.route(route="lookup-ingredients", methods=["POST"])
+def lookup_ingredients(req: func.HttpRequest) -> func.HttpResponse:
+    start = perf_counter()
+    correlation_id = uuid4()
+
+    try:
+        req_body = req.get_json()
+        validate(instance=req_body, schema=lookupIngredientsSchema)
+
+        limit = int(req.params.get("limit") or "5")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+        logging.info(f"processing lookup ingredients request id {correlation_id} for {len(req_body)} ingredients")
+
+        matches = get_search_index().search_many(req_body, limit)
+        result = [{ "name": name, "items": items } for name, items in zip(req_body, matches)]
+
+        return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+    except (ValueError, jsonschema.exceptions.ValidationError) as e:
+        logging.error(f"Failed to process lookup ingredients request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not lookup ingredients because the data provided is invalid. Please try again.", status_code=400)
+    except OSError as e:
+        logging.error(f"Failed to load food search index for request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not lookup ingredients because the food data is not available.", status_code=500)
+    except Exception as e:
+        logging.error(f"Failed to process lookup ingredients request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not lookup ingredients due to an internal issue. Please try again.", status_code=400)
+    finally:
+        end = perf_counter()
+        logging.info(f"Finished processing lookup ingredients request id {correlation_id}. Time taken: {end - start:0.4f}s")
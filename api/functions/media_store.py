@@ -0,0 +1,228 @@
+import os
+import re
+import base64
+import hashlib
+import logging
+import tempfile
+
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from functools import lru_cache
+from time import monotonic, time
+from typing import List, Tuple, Union
+
+from .util import to_data_uri
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+class MediaStore(ABC):
+    """Content addressed storage for recipe media. Items are stored once per distinct content
+    """
+    @abstractmethod
+    def put(self, content: bytes, mime: str) -> str:
+        """Stores content under its hash
+        Args:
+            content (bytes): media file
+            mime (str): mime type of the file
+        Returns:
+            str: sha256 of the content in hex
+        """
+
+    @abstractmethod
+    def get(self, digest: str) -> Union[Tuple[bytes, str], None]:
+        """Reads content stored by put
+        Args:
+            digest (str): sha256 of the content in hex
+        Returns:
+            tuple: content and mime type or None when it does not exist
+        """
+
+    def url(self, digest: str) -> Union[str, None]:
+        """Address clients can use to download the content directly, None when the store is not public
+        """
+        return None
+
+class LocalMediaStore(MediaStore):
+    """Stores media as files in a folder, meant for development and tests. Files not written for
+    ttl seconds are removed
+    Args:
+        directory (str): folder where media is stored, created when missing
+        ttl (float): seconds media is kept after it was last shared, None keeps it forever
+    """
+    def __init__(self, directory: str, ttl: Union[float, None] = None):
+        self.directory = directory
+        self.ttl = ttl
+        self._pruned_at = monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+
+    def put(self, content: bytes, mime: str) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        path = os.path.join(self.directory, digest)
+
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            # mime type goes in the first line so a single read returns both
+            descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(mime.encode() + b"\n" + content)
+
+            os.replace(temp_path, path)
+
+        if self.ttl is not None and monotonic() - self._pruned_at > self.ttl:
+            self.prune()
+
+        return digest
+
+    def get(self, digest: str) -> Union[Tuple[bytes, str], None]:
+        if not HASH_PATTERN.match(digest):
+            return None
+
+        try:
+            with open(os.path.join(self.directory, digest), "rb") as file:
+                mime, _, content = file.read().partition(b"\n")
+        except OSError:
+            return None
+
+        return content, mime.decode()
+
+    def prune(self):
+        self._pruned_at = monotonic()
+        expired = time() - self.ttl
+
+        for entry in os.scandir(self.directory):
+            with suppress(OSError):
+                if entry.is_file() and entry.stat().st_mtime < expired:
+                    os.remove(entry.path)
+
+class BlobMediaStore(MediaStore):
+    """Stores media in an Azure Storage container shared by every instance of the app, expiration
+    is left to the storage account lifecycle policy
+    Args:
+        connection_string (str): storage account connection string
+        container (str): container name
+        public (bool): whether clients can read the blobs directly
+    """
+    def __init__(self, connection_string: str, container: str, public: bool = False):
+        # imported here so routes that never share media do not pay for loading the sdk
+        from azure.storage.blob import BlobServiceClient
+
+        self.public = public
+        self.container = BlobServiceClient.from_connection_string(connection_string).get_container_client(container)
+
+    def put(self, content: bytes, mime: str) -> str:
+        from azure.core.exceptions import ResourceExistsError
+        from azure.storage.blob import ContentSettings
+
+        digest = hashlib.sha256(content).hexdigest()
+
+        # the name is the content hash so an existing blob already holds the same bytes
+        with suppress(ResourceExistsError):
+            self.container.upload_blob(digest, content, overwrite=False, content_settings=ContentSettings(content_type=mime))
+
+        return digest
+
+    def get(self, digest: str) -> Union[Tuple[bytes, str], None]:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        if not HASH_PATTERN.match(digest):
+            return None
+
+        try:
+            download = self.container.download_blob(digest)
+        except ResourceNotFoundError:
+            return None
+
+        return download.readall(), download.properties.content_settings.content_type
+
+    def url(self, digest: str) -> Union[str, None]:
+        return f"{self.container.url}/{digest}" if self.public else None
+
+def create_media_store() -> Union[MediaStore, None]:
+    """Creates the store configured by the environment. Blob storage is used when MEDIA_BLOB_CONNECTION_STRING
+    is set and a local folder, meant for development, when MEDIA_STORE_DIR is set, otherwise media stays
+    inside the share items
+    Returns:
+        MediaStore: configured store or None
+    """
+    if os.environ.get("MEDIA_BLOB_CONNECTION_STRING"):
+        return BlobMediaStore(os.environ["MEDIA_BLOB_CONNECTION_STRING"],
+                              os.environ.get("MEDIA_BLOB_CONTAINER", "share-media"),
+                              os.environ.get("MEDIA_BLOB_PUBLIC", "").lower() in ("1", "true"))
+
+    if os.environ.get("MEDIA_STORE_DIR"):
+        return LocalMediaStore(os.environ["MEDIA_STORE_DIR"], float(os.environ.get("MEDIA_STORE_TTL", str(24 * 60 * 60))))
+
+    return None
+
+def offload_media(media: Union[List[dict], None], store: Union[MediaStore, None]) -> Union[List[dict], None]:
+    """Moves data uri media to the store leaving only its hash behind. Any other media is kept as is
+    Args:
+        media (list): media items with type and url
+        store (MediaStore): where the content goes, None keeps the media unchanged
+    Returns:
+        list: media items where data uris were replaced by hash, mime type and the store url when public
+    """
+    if store is None or not media:
+        return media
+
+    result = []
+    for item in media:
+        url = item.get("url") if isinstance(item, dict) else None
+        header, _, data = url.partition(",") if isinstance(url, str) else ("", "", "")
+
+        if not (header.startswith("data:") and header.endswith(";base64")):
+            result.append(item)
+            continue
+
+        mime = header[len("data:"):-len(";base64")]
+        try:
+            digest = store.put(base64.b64decode(data), mime)
+        except Exception as e:
+            logging.warning(f"Could not offload media, keeping it inline. Error: {e}")
+            result.append(item)
+            continue
+
+        result.append({ "type": item.get("type"), "hash": digest, "mime": mime, "url": store.url(digest) })
+
+    return result
+
+def resolve_media(media: Union[List[dict], None], store: Union[MediaStore, None]) -> Union[List[dict], None]:
+    """Turns media offloaded by offload_media back into items with a url, the store url when it is public
+    or a data uri read from the store otherwise
+    Args:
+        media (list): media items as stored in the share item
+        store (MediaStore): where the content was stored
+    Returns:
+        list: media items with type and url, items that cannot be found are returned as stored
+    """
+    if not media:
+        return media
+
+    result = []
+    for item in media:
+        if not isinstance(item, dict) or "hash" not in item:
+            result.append(item)
+            continue
+
+        if item.get("url"):
+            result.append({ "type": item.get("type"), "url": item["url"] })
+            continue
+
+        stored = store.get(item["hash"]) if store is not None else None
+        if stored is None:
+            # kept so the media is not lost, e.g. when it was stored by another instance's local folder
+            logging.warning(f"Could not find media {item['hash']} in the media store")
+            result.append(item)
+            continue
+
+        content, mime = stored
+        result.append({ "type": item.get("type"), "url": to_data_uri(content, mime) })
+
+    return result
+
+@lru_cache(maxsize=None)
+def get_shared_media_store() -> Union[MediaStore, None]:
+    # a single store per worker process created on first use, share and receive use the same one
+    return create_media_store()
@@ -65,6 +65,28 @@ recipeSchema = {
 }
 
 
+# items of older backups are either the raw text or an object with it, null items are skipped
+backupItemSchema = {
+    "type": ["string", "object", "null"],
+    "properties": {
+        "raw": {"type": ["string", "null"]},
+    },
+}
+
+backupRecipeSchema = {
+    "type": "object",
+    "properties": {
+        "ingredients": {
+            "type": ["array", "null"],
+            "items": backupItemSchema
+        },
+        "steps": {
+            "type": ["array", "null"],
+            "items": backupItemSchema
+        },
+    },
+}
+
 calcNutritionSchema = {
     "type": "array",
     "items": {
@@ -80,7 +102,71 @@ calcNutritionSchema = {
 
 lookupIngredientsSchema = {
     "type": "array",
+    "maxItems": 200,
     "items": {
         "type": "string",
     }
-}
\ No newline at end of file
+}
+
+parseRecipesSchema = {
+    "type": "array",
+    "minItems": 1,
+    "maxItems": 500,
+    "items": {
+        "type": "object",
+        "properties": {
+            "url": {"type": "string", "minLength": 1},
+            "downloadImage": {"type": ["boolean", "null"]},
+        },
+        "required": ["url"],
+    }
+}
+
+parseRecipeTextSchema = {
+    "type": "array",
+    "minItems": 1,
+    "maxItems": 500,
+    "items": {
+        "type": "object",
+        "properties": {
+            "id": {"type": ["string", "number", "null"]},
+            "ingredients": {"type": ["string", "null"]},
+            "steps": {"type": ["string", "null"]},
+        },
+    }
+}
+
+imageVariantsSchema = {
+    "type": "array",
+    "minItems": 1,
+    "maxItems": 12,
+    "items": {
+        "type": "object",
+        "properties": {
+            "size": {"type": "integer", "minimum": 16, "maximum": 4096},
+            "format": {"type": "string", "enum": ["jpeg", "webp", "avif", "png"]},
+            "quality": {"type": "integer", "minimum": 1, "maximum": 100},
+        },
+        "required": ["size", "format"],
+    }
+}
+
+receiveRecipesSchema = {
+    "type": "object",
+    "properties": {
+        "codes": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": 100,
+            "items": {"type": "string", "minLength": 1, "maxLength": 64}
+        },
+    },
+    "required": ["codes"],
+}
+
+shareRecipesSchema = {
+    "type": "array",
+    "minItems": 1,
+    "maxItems": 100,
+    "items": recipeSchema,
+}
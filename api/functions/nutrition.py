@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import logging
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
+
+from .units import load_unit_table, unit_key
+
+if TYPE_CHECKING:
+    import numpy
+
+NUTRITION_DATA_DIR = os.environ.get("NUTRITION_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+NUTRITION_MATRIX_FILE = "nutrients.npy"
+NUTRITION_INDEX_FILE = "nutrients.json"
+
+# USDA nutrient numbers kept by the notebooks and the name the app uses for each of them
+NUTRIENTS = {
+    "208": "calories",
+    "298": "totalFat",
+    "606": "saturatedFat",
+    "645": "monounsaturatedFat",
+    "646": "polyunsaturatedFat",
+    "205": "carbohydrates",
+    "269.3": "sugar",
+    "291": "fiber",
+    "203": "protein",
+    "601": "cholesterol",
+    "307": "sodium",
+    "301": "calcium",
+    "303": "iron",
+    "306": "potassium",
+    "328": "vitaminD",
+}
+
+def build_nutrition_data(foods: List[dict]) -> Tuple["numpy.ndarray", Dict[str, Any]]:
+    """Turns the merged dataset created by the notebooks into a nutrient matrix and its index
+    Args:
+        foods (list): foods with id, description, foodNutrients per 100 grams and foodPortions
+    Returns:
+        tuple: food by nutrient float32 matrix with amounts per gram and the index with ids, nutrients and portions
+    """
+    import numpy as np
+
+    columns = { number: column for column, number in enumerate(NUTRIENTS) }
+    matrix = np.zeros((len(foods), len(columns)), dtype=np.float32)
+    units = {}
+    portions = []
+
+    for row, food in enumerate(foods):
+        for nutrient in food.get("foodNutrients") or []:
+            column = columns.get(str(nutrient["number"]))
+            if column is not None:
+                matrix[row, column] = float(nutrient.get("amount") or 0) / 100
+                units.setdefault(nutrient["number"], (nutrient.get("uom") or "").lower())
+
+        # king arthur portions come after the usda ones so their baking weights win
+        food_portions = {}
+        for portion in food.get("foodPortions") or []:
+            value, grams = float(portion.get("value") or 0), float(portion.get("gramWeight") or 0)
+            if value <= 0 or grams <= 0:
+                continue
+
+            key = unit_key(portion.get("uom") or "")
+            if key in ("", "undetermined"):
+                key = (portion.get("modifier") or "").strip().lower()
+            if not key:
+                continue
+
+            food_portions[key] = grams / value
+            if not load_unit_table().lookup(key):
+                food_portions["each"] = grams / value
+
+        portions.append(food_portions)
+
+    index = {
+        "ids": [str(food["id"]) for food in foods],
+        "descriptions": [food.get("description") or "" for food in foods],
+        "nutrients": [{ "number": number, "name": name, "uom": units.get(number, "") } for number, name in NUTRIENTS.items()],
+        "portions": portions,
+    }
+
+    return matrix, index
+
+def write_nutrition_data(matrix: "numpy.ndarray", index: Dict[str, Any], directory: str = NUTRITION_DATA_DIR):
+    import numpy as np
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, NUTRITION_MATRIX_FILE), matrix, allow_pickle=False)
+    with open(os.path.join(directory, NUTRITION_INDEX_FILE), "w") as file:
+        json.dump(index, file, separators=(",", ":"))
+
+class NutritionTable:
+    """Calculates nutrition facts from the prebuilt nutrient matrix
+    Args:
+        matrix (numpy.ndarray): food by nutrient amounts per gram
+        index (dict): index created by build_nutrition_data
+    """
+    def __init__(self, matrix: "numpy.ndarray", index: Dict[str, Any]):
+        self.matrix = matrix
+        self.ids: List[str] = index["ids"]
+        self.descriptions: List[str] = index["descriptions"]
+        self.nutrients: List[dict] = index["nutrients"]
+        self.portions: List[Dict[str, float]] = index["portions"]
+        self.rows = { id: row for row, id in enumerate(self.ids) }
+        self.densities = [self._density(portions) for portions in self.portions]
+        self.resolve_unit = lru_cache(maxsize=1024)(self._resolve_unit)
+
+    @staticmethod
+    def _resolve_unit(unit: str) -> Tuple[str, Union[str, None], float]:
+        key = unit_key(unit)
+        dimension, factor = load_unit_table().factor(key) or (None, 0)
+
+        return key, dimension, factor
+
+    @staticmethod
+    def _density(portions: Dict[str, float]) -> Union[float, None]:
+        # the largest volume portion gives the most precise grams per milliliter
+        table = load_unit_table()
+        volumes = [(factor[1], grams) for unit, grams in portions.items()
+                   for factor in [table.factor(unit)] if factor is not None and factor[0] == "volume"]
+
+        return max(volumes)[1] / max(volumes)[0] if volumes else None
+
+    def grams(self, row: int, quantity: float, unit: str) -> Union[float, None]:
+        """Converts a quantity of a food to grams using a portion of the same unit, the mass unit factors,
+        or the food density for other volumes
+        Args:
+            row (int): food row in the matrix
+            quantity (float): amount of the unit
+            unit (str): unit of the quantity
+        Returns:
+            float: grams or None when the unit cannot be converted for the food
+        """
+        key, dimension, factor = self.resolve_unit(unit)
+
+        grams_per_unit = self.portions[row].get(key)
+        if grams_per_unit is not None:
+            return quantity * grams_per_unit
+
+        if dimension == "mass":
+            return quantity * factor
+        if dimension == "volume" and self.densities[row] is not None:
+            return quantity * factor * self.densities[row]
+
+        return None
+
+    def calculate(self, ingredients: List[dict]) -> Dict[str, Any]:
+        """Totals the nutrients of a list of ingredients in a single gather and multiply over the matrix
+        Args:
+            ingredients (list): ingredients with food id, quantity and unit
+        Returns:
+            dict: total grams, nutrients by name and the ingredients that could not be calculated
+        """
+        import numpy as np
+
+        rows, grams, missing = [], [], []
+        for ingredient in ingredients:
+            row = self.rows.get(ingredient["id"])
+            weight = None if row is None else self.grams(row, ingredient["quantity"], ingredient["unit"])
+
+            if weight is None:
+                missing.append(ingredient)
+                continue
+
+            rows.append(row)
+            grams.append(weight)
+
+        weights = np.asarray(grams, dtype=np.float64)
+        totals = weights @ self.matrix[rows] if rows else np.zeros(len(self.nutrients))
+
+        return {
+            "grams": round(float(weights.sum()), 2),
+            "nutrition": { nutrient["name"]: round(float(total), 2) for nutrient, total in zip(self.nutrients, totals) },
+            "missing": missing,
+        }
+
+def nutrition_data_available(directory: str = NUTRITION_DATA_DIR) -> bool:
+    return all(os.path.exists(os.path.join(directory, name)) for name in (NUTRITION_MATRIX_FILE, NUTRITION_INDEX_FILE))
+
+@lru_cache(maxsize=None)
+def load_nutrition_table(directory: str = NUTRITION_DATA_DIR) -> NutritionTable:
+    """Loads the prebuilt nutrient matrix once per worker. The matrix is memory mapped so workers share its pages
+    Args:
+        directory (str): folder with the files written by write_nutrition_data
+    Raises:
+        OSError: when the data was not built
+    Returns:
+        NutritionTable: table ready to calculate
+    """
+    import numpy as np
+
+    matrix = np.load(os.path.join(directory, NUTRITION_MATRIX_FILE), mmap_mode="r", allow_pickle=False)
+    with open(os.path.join(directory, NUTRITION_INDEX_FILE)) as file:
+        index = json.load(file)
+
+    logging.info(f"Loaded nutrition data for {len(index['ids'])} foods from {directory}")
+
+    return NutritionTable(matrix, index)
+
+if __name__ == "__main__":
+    # python -m functions.nutrition merged_data.json builds the data from the dataset created by the notebooks
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python -m functions.nutrition <merged_data.json> [output folder]")
+
+    with open(sys.argv[1]) as file:
+        write_nutrition_data(*build_nutrition_data(json.load(file)), *sys.argv[2:3])
@@ -6,7 +6,9 @@ import azure.functions as func
 from uuid import uuid4
 from time import perf_counter
 
-from .util import get_mock_html, get_recipe_from_scraper, get_html
+from .util import get_recipe_from_html, fetch_html, html_cache, recipe_cache
+from .util import build_multipart, download_recipe_image, negotiate, ImageDownloadError
+from .executor import ExecutorSaturatedError, busy_response
 
 bp = func.Blueprint()
 
@@ -28,17 +30,37 @@ def parse_recipe(req: func.HttpRequest) -> func.HttpResponse:
         
         if mock_recipe_html is not None:
             print("using mock and url " + url)
-            scraper = get_mock_html(mock_recipe_html, url)
+            html = mock_recipe_html
         else:
-            scraper = get_html(url)
+            html = fetch_html(url)
 
-        result = get_recipe_from_scraper(scraper, download_image)
+        # multipart responses carry the image bytes as their own part instead of a base64 data uri
+        if download_image and negotiate(req.headers.get("Accept"), ["application/json", "multipart/mixed"]) == "multipart/mixed":
+            import requests
+            from PIL import UnidentifiedImageError
+
+            result = get_recipe_from_html(html, url)
+            try:
+                image, mime = download_recipe_image(result["image"])
+            except (ImageDownloadError, requests.RequestException, UnidentifiedImageError, OSError) as e:
+                logging.warning(f"Could not download recipe image for parse request id {correlation_id}. Error: {e}")
+                return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+
+            body, content_type = build_multipart([("recipe", "application/json", json.dumps(result).encode()), ("image", mime, image)])
+
+            return func.HttpResponse(body, status_code=200, mimetype="multipart/mixed", headers={ "Content-Type": content_type })
+
+        result = get_recipe_from_html(html, url, download_image)
 
         return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+    except ExecutorSaturatedError as e:
+        logging.warning(f"Rejected parse request id {correlation_id}. Error: {e}")
+        return busy_response(e)
     except Exception as e:
         logging.error(f"Failed to process parse request id {correlation_id}. Error: {e}")
         
         return func.HttpResponse("Could not find a recipe in the web page", status_code=400)
     finally:
         end = perf_counter()
+        logging.debug(f"html cache stats: {html_cache.stats()}, recipe cache stats: {recipe_cache.stats()}")
         logging.info(f"Finished processing parse request id {correlation_id}. Time taken: {end - start:0.4f}s")
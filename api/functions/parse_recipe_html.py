@@ -6,9 +6,8 @@ import azure.functions as func
 from uuid import uuid4
 from time import perf_counter
 
-from recipe_scrapers import scrape_html, AbstractScraper
-
-from .util import get_recipe_from_scraper
+from .util import get_recipe_from_html
+from .executor import ExecutorSaturatedError, busy_response
 
 bp = func.Blueprint()
 
@@ -19,16 +18,19 @@ def parse_recipe_html(req: func.HttpRequest) -> func.HttpResponse:
 
     url: str = req.form.get("url")
     html: str = req.form.get("html")
-    scraper: AbstractScraper
+    contents: bytes
     download_image: bool = req.form.get("downloadImage") or False
     try:
         logging.info(f"processing parse request id {correlation_id} for url: {html}")
         for file in req.files.values():
-            scraper = scrape_html(file.stream.read(), url, wild_mode=True)
+            contents = file.stream.read()
         
-        result = get_recipe_from_scraper(scraper, download_image)
+        result = get_recipe_from_html(contents, url, download_image)
 
         return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+    except ExecutorSaturatedError as e:
+        logging.warning(f"Rejected parse request id {correlation_id}. Error: {e}")
+        return busy_response(e)
     except Exception as e:
         logging.error(f"Failed to process parse request id {correlation_id}. Error: {e}")
         
@@ -0,0 +1,36 @@
+import logging
+import json
+import jsonschema
+
+import azure.functions as func
+from jsonschema import validate
+
+from uuid import uuid4
+from time import perf_counter
+
+from .models import parseRecipeTextSchema
+from .util import parse_recipe_texts
+
+bp = func.Blueprint()
+
+@bp.route(route="parse-recipe-text", methods=["POST"]) 
+def parse_recipe_text(req: func.HttpRequest) -> func.HttpResponse:
+    start = perf_counter()
+    correlation_id = uuid4()
+
+    try:
+        req_body = req.get_json()
+        validate(instance=req_body, schema=parseRecipeTextSchema)
+
+        logging.info(f"processing parse text request id {correlation_id} for {len(req_body)} recipes")
+
+        result = parse_recipe_texts(req_body)
+
+        return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+    except (ValueError, jsonschema.exceptions.ValidationError) as e:
+        logging.error(f"Failed to process parse text request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not parse recipes because the data provided is invalid. Please try again.", status_code=400)
+    finally:
+        end = perf_counter()
+        logging.info(f"Finished processing parse text request id {correlation_id}. Time taken: {end - start:0.4f}s")
@@ -0,0 +1,112 @@
+import logging
+import json
+import os
+import jsonschema
+
+import azure.functions as func
+from jsonschema import validate
+
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, as_completed
+from typing import Iterator, List, Tuple
+from uuid import uuid4
+from time import perf_counter
+
+from .executor import BATCH_QUEUE_TIMEOUT
+from .models import parseRecipesSchema
+from .util import get_recipe_from_html, fetch_html, html_cache, recipe_cache
+
+bp = func.Blueprint()
+
+# a single pool per worker keeps the number of outbound fetches bounded
+# no matter how many batch requests are running at the same time
+max_workers = int(os.environ.get("PARSE_RECIPES_MAX_WORKERS", "8"))
+executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse-recipes")
+
+# seconds a batch waits for its sites, the ones still running are reported as timed out
+BATCH_TIMEOUT = float(os.environ.get("PARSE_RECIPES_TIMEOUT", "60"))
+
+mock_recipe_html = None
+def set_mock_recipe_html(mock_recipe: str):
+    global mock_recipe_html
+    mock_recipe_html = mock_recipe
+
+def parse_entry(url: str, download_image: bool) -> dict:
+    """Fetches and parses a single entry of a batch request
+    Args:
+        url (str): URL of the recipe
+        download_image (bool): whether to download the image or not
+    Returns:
+        dict: url and either the parsed recipe or the error message
+    """
+    try:
+        html = mock_recipe_html if mock_recipe_html is not None else fetch_html(url)
+
+        return { "url": url, "recipe": get_recipe_from_html(html, url, download_image, BATCH_QUEUE_TIMEOUT) }
+    except Exception as e:
+        logging.warning(f"Failed to parse recipe from url: {url}. Error: {e}")
+
+        return { "url": url, "error": "Could not find a recipe in the web page" }
+
+def collect_entries(futures: List[Future], urls: List[str], timeout: float) -> Iterator[Tuple[int, dict]]:
+    """Yields the result of each entry as soon as it finishes, entries not finished within timeout
+    seconds get a timeout error
+    Args:
+        futures (list): futures of parse_entry in request order
+        urls (list): URL of each entry
+        timeout (float): seconds to wait for the whole batch
+    Returns:
+        Iterator: entry index and its result
+    """
+    indexes = { future: index for index, future in enumerate(futures) }
+    pending = set(futures)
+
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            pending.discard(future)
+            yield indexes[future], future.result()
+    except TimeoutError:
+        for future in sorted(pending, key=indexes.get):
+            # entries still queued are dropped, running ones finish in the background bounded by the fetch timeout
+            future.cancel()
+            logging.warning(f"Timed out parsing recipe from url: {urls[indexes[future]]}")
+
+            yield indexes[future], { "url": urls[indexes[future]], "error": "Timed out waiting for the web page" }
+
+@bp.route(route="parse-recipes", methods=["POST"]) 
+def parse_recipes(req: func.HttpRequest) -> func.HttpResponse:
+    start = perf_counter()
+    correlation_id = uuid4()
+
+    try:
+        req_body = req.get_json()
+        validate(instance=req_body, schema=parseRecipesSchema)
+
+        logging.info(f"processing parse batch request id {correlation_id} for {len(req_body)} urls")
+
+        urls = [entry.get("url") for entry in req_body]
+        futures = [executor.submit(parse_entry, entry.get("url"), entry.get("downloadImage") or False) for entry in req_body]
+        entries = collect_entries(futures, urls, BATCH_TIMEOUT)
+
+        # the ndjson body is buffered, its lines follow the order sites finish in and carry the entry index
+        # so results for the same url can be told apart
+        if "application/x-ndjson" in (req.headers.get("Accept") or ""):
+            lines = [json.dumps({ "index": index, **entry }) + "\n" for index, entry in entries]
+
+            return func.HttpResponse("".join(lines), status_code=200, mimetype="application/x-ndjson")
+
+        results = dict(entries)
+        result = [results[index] for index in range(len(futures))]
+
+        return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+    except (ValueError, jsonschema.exceptions.ValidationError) as e:
+        logging.error(f"Failed to process parse batch request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not parse recipes because the data provided is invalid. Please try again.", status_code=400)
+    except Exception as e:
+        logging.error(f"Failed to process parse batch request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not parse recipes due to an internal issue. Please try again.", status_code=400)
+    finally:
+        end = perf_counter()
+        logging.debug(f"html cache stats: {html_cache.stats()}, recipe cache stats: {recipe_cache.stats()}")
+        logging.info(f"Finished processing parse batch request id {correlation_id}. Time taken: {end - start:0.4f}s")
@@ -1,13 +1,16 @@
 import logging
 import json
+import jsonschema
 
 import azure.functions as func
+from jsonschema import validate
 
-from zipfile import ZipFile
 from uuid import uuid4
 from time import perf_counter
 
-from .util import parse_image
+from .executor import ExecutorSaturatedError, busy_response, image_executor
+from .models import imageVariantsSchema
+from .util import build_multipart, image_cache, negotiate, to_data_uri, transform_image_cached, transform_image_variants_cached
 
 bp = func.Blueprint()
 
@@ -25,17 +28,55 @@ def process_image(req: func.HttpRequest) -> func.HttpResponse:
             if not file.content_type.startswith("image"):
                 return func.HttpResponse("Only image files are accepted", status_code=400)
 
+            variants = req.form.get("variants")
+            if variants:
+                try:
+                    variants = json.loads(variants)
+                    validate(instance=variants, schema=imageVariantsSchema)
+                except (ValueError, jsonschema.exceptions.ValidationError) as e:
+                    logging.error(f"Failed to process image request id {correlation_id}. Error: {e}")
+                    return func.HttpResponse("The image variants requested are invalid", status_code=400)
+
+                return process_image_variants(req, filename, contents, variants)
+
+            image, mime = transform_image_cached(filename, contents)
+
+            # clients asking for the image itself skip the base64 data uri wrapped in json
+            if negotiate(req.headers.get("Accept"), ["application/json", mime, "application/octet-stream"]) != "application/json":
+                safe_name = filename.replace('"', "")
+                headers = { "Content-Disposition": f'inline; filename="{safe_name}"' }
+                return func.HttpResponse(image, status_code=200, mimetype=mime, headers=headers)
+
             result = {
                 "name": filename,
-                "image": parse_image(filename, contents)
+                "image": to_data_uri(image, mime)
             }
 
             return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
         
         return func.HttpResponse("A single file is required to process", status_code=400)
+    except ExecutorSaturatedError as e:
+        logging.warning(f"Rejected image request id {correlation_id}. Error: {e}")
+        return busy_response(e)
     except Exception as e:
         logging.error(f"Failed to process image request id {correlation_id}. Error: {e}")
         return func.HttpResponse("The image file is invalid", status_code=400)
     finally:
         end = perf_counter()
-        logging.info(f"Finished processing image request id {correlation_id}. Time taken: {end - start:0.4f}s")
\ No newline at end of file
+        logging.debug(f"Image executor stats: {image_executor.stats()}, image cache stats: {image_cache.stats()}")
+        logging.info(f"Finished processing image request id {correlation_id}. Time taken: {end - start:0.4f}s")
+
+def process_image_variants(req: func.HttpRequest, filename: str, contents: bytes, variants: list) -> func.HttpResponse:
+    results = transform_image_variants_cached(contents, variants)
+
+    if negotiate(req.headers.get("Accept"), ["application/json", "multipart/mixed"]) == "multipart/mixed":
+        body, content_type = build_multipart([(f"{variant['size']}.{variant['format']}", mime, image) for variant, image, mime in results])
+
+        return func.HttpResponse(body, status_code=200, mimetype="multipart/mixed", headers={ "Content-Type": content_type })
+
+    result = {
+        "name": filename,
+        "variants": [{ **variant, "image": to_data_uri(image, mime) } for variant, image, mime in results]
+    }
+
+    return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
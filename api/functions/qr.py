@@ -0,0 +1,132 @@
+import io
+import base64
+
+from threading import local
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from qrcode import QRCode
+
+# share codes are 6 uppercase alphanumerics, version 1 holds up to 20 of them with medium error correction
+QR_VERSION = 1
+QR_BORDER = 4
+
+QR_FORMATS = ("svg", "bitmap", "png")
+
+_encoders = local()
+
+def get_encoder(fit: bool = False) -> "QRCode":
+    """Gets the encoder of the current thread, creating it on first use
+    Args:
+        fit (bool): whether the encoder picks the version based on the data
+    Returns:
+        QRCode: encoder ready to receive data
+    """
+    name = "fit" if fit else "fixed"
+    encoder = getattr(_encoders, name, None)
+
+    if encoder is None:
+        import qrcode
+
+        encoder = qrcode.QRCode(version=None if fit else QR_VERSION, error_correction=qrcode.constants.ERROR_CORRECT_M, border=QR_BORDER)
+        setattr(_encoders, name, encoder)
+
+    encoder.clear()
+
+    return encoder
+
+def encode(data: str) -> List[List[bool]]:
+    """Encodes data as a matrix of dark modules without the quiet zone. Data that does not fit
+    in the fixed version falls back to the smallest version that holds it
+    Args:
+        data (str): data to encode, e.g. a share code
+    Returns:
+        list: rows of modules, True for dark
+    """
+    from qrcode.exceptions import DataOverflowError
+
+    encoder = get_encoder()
+    encoder.add_data(data)
+    try:
+        encoder.make(fit=False)
+    except DataOverflowError:
+        encoder = get_encoder(fit=True)
+        encoder.add_data(data)
+        encoder.make(fit=True)
+
+    return [list(row) for row in encoder.modules]
+
+def to_svg(modules: List[List[bool]]) -> str:
+    """Writes the same svg as qrcode's SvgPathImage with the default box size without building an element tree
+    Args:
+        modules (list): matrix created by encode
+    Returns:
+        str: svg document with a single path
+    """
+    dimension = len(modules) + QR_BORDER * 2
+    subpaths = [f"M{x},{y}H{x + 1}V{y + 1}H{x}z"
+                for y, row in enumerate(modules, QR_BORDER) for x, dark in enumerate(row, QR_BORDER) if dark]
+
+    return (f'<svg width="{dimension}mm" height="{dimension}mm" version="1.1" viewBox="0 0 {dimension} {dimension}" xmlns="http://www.w3.org/2000/svg">'
+            f'<path d="{"".join(subpaths)}" id="qr-path" fill="#000000" fill-opacity="1" fill-rule="nonzero" stroke="none"/></svg>')
+
+def to_bitmap(modules: List[List[bool]]) -> bytes:
+    """Packs the modules one bit each, row by row with every row padded to a whole byte
+    Args:
+        modules (list): matrix created by encode
+    Returns:
+        bytes: packed modules, the most significant bit is the leftmost module
+    """
+    result = bytearray()
+    for row in modules:
+        value = 0
+        for dark in row:
+            value = (value << 1) | dark
+
+        padding = -len(row) % 8
+        result += (value << padding).to_bytes((len(row) + padding) // 8, "big")
+
+    return bytes(result)
+
+def to_png(modules: List[List[bool]], box_size: int = 4) -> bytes:
+    """Draws the modules as a black and white png including the quiet zone
+    Args:
+        modules (list): matrix created by encode
+        box_size (int): pixels per module
+    Returns:
+        bytes: png file
+    """
+    from PIL import Image
+
+    size = len(modules) + QR_BORDER * 2
+    image = Image.new("1", (size, size), 1)
+    image.putdata([0 if dark else 1 for row in pad(modules) for dark in row])
+
+    buffered = io.BytesIO()
+    image.resize((size * box_size, size * box_size), Image.Resampling.NEAREST).save(buffered, format="PNG", optimize=True)
+
+    return buffered.getvalue()
+
+def pad(modules: List[List[bool]]) -> List[List[bool]]:
+    size = len(modules) + QR_BORDER * 2
+    blank = [[False] * size for _ in range(QR_BORDER)]
+
+    return blank + [[False] * QR_BORDER + row + [False] * QR_BORDER for row in modules] + blank
+
+def render_qr_code(data: str, format: str = "svg") -> str:
+    """Renders a QR code in the format requested
+    Args:
+        data (str): data to encode, e.g. a share code
+        format (str): svg, bitmap (base64 packed modules) or png (data uri)
+    Returns:
+        str: svg document, base64 bitmap or png data uri
+    """
+    modules = encode(data)
+
+    if format == "bitmap":
+        return base64.b64encode(to_bitmap(modules)).decode()
+
+    if format == "png":
+        return "data:image/png;base64," + base64.b64encode(to_png(modules)).decode()
+
+    return to_svg(modules)
@@ -1,23 +1,70 @@
 import logging
 import json
+import jsonschema
 
 import azure.functions as func
-from azure.cosmos import exceptions
+from jsonschema import validate
 
+from typing import Tuple, Union
 from uuid import uuid4
 from time import perf_counter
 
-from .repository import Repository
+from .repository import Repository, shared_repository
+from .models import receiveRecipesSchema
+from .media_store import MediaStore, resolve_media, get_shared_media_store
 
-repository = Repository()
+repository = shared_repository
+media_store: Union[MediaStore, None] = None
 bp = func.Blueprint()
 
+# properties returned to clients, the ones added by cosmos db are left out
+SHARE_ITEM_FIELDS = ("id", "title", "notes", "ingredients", "steps", "source", "media")
+
 def mock_repository(mock_repository: Repository):
     global repository
     repository = mock_repository
 
+def mock_media_store(mock_media_store: MediaStore):
+    global media_store
+    media_store = mock_media_store
+
+def get_media_store() -> Union[MediaStore, None]:
+    return media_store if media_store is not None else get_shared_media_store()
+
+def clean_items(items: list) -> list:
+    # offloaded media is only read from the store for the items being returned
+    return [{ **{ field: item.get(field) for field in SHARE_ITEM_FIELDS }, "media": resolve_media(item.get("media"), get_media_store()) }
+            for item in items]
+
+def read_recipes(codes: list) -> Tuple[list, list]:
+    """Reads share items by code, collections are replaced by the recipes they contain
+    Args:
+        codes (list): share codes of recipes or collections
+    Returns:
+        tuple: items found and codes missing, both in the order requested
+    """
+    items = repository.read_items(codes)
+
+    nested = [id for code in codes if code in items for id in items[code].get("collection") or []]
+    if nested:
+        items.update(repository.read_items(nested))
+
+    found, missing = [], []
+    for code in codes:
+        item = items.get(code)
+        recipe_ids = item.get("collection") if item is not None else None
+        for id in (recipe_ids if recipe_ids is not None else [code]):
+            if id in items:
+                found.append(items[id])
+            else:
+                missing.append(id)
+
+    return found, missing
+
 @bp.route(route="receive-recipe", methods=["POST"]) 
 def receive_recipe(req: func.HttpRequest) -> func.HttpResponse:
+    from azure.cosmos import exceptions
+
     start = perf_counter()
     correlation_id = uuid4()
 
@@ -32,18 +79,11 @@ def receive_recipe(req: func.HttpRequest) -> func.HttpResponse:
 
         item = repository.read_item(code)
 
-        # removes the properties added by cosmos db
-        item_clean = {
-            "id": item.get("id"),
-            "title": item.get("title"),
-            "notes": item.get("notes"),
-            "ingredients": item.get("ingredients"),
-            "steps": item.get("steps"),
-            "source": item.get("source"),
-            "media": item.get("media"),
-        }
-
-        result = json.dumps(item_clean)
+        if item.get("collection") is not None:
+            found, missing = read_recipes(item["collection"])
+            result = json.dumps({ "id": code, "items": clean_items(found), "missing": missing })
+        else:
+            result = json.dumps(clean_items([item])[0])
 
         return func.HttpResponse(result, status_code=200, mimetype="application/json")
     except exceptions.CosmosResourceNotFoundError as e:
@@ -56,4 +96,38 @@ def receive_recipe(req: func.HttpRequest) -> func.HttpResponse:
         return func.HttpResponse("Could not receive the recipe due to an internal issue. Please try again.", status_code=400)
     finally:
         end = perf_counter()
-        logging.info(f"Finished processing receive recipe request id {correlation_id}. Time taken: {end - start:0.4f}s")
\ No newline at end of file
+        logging.debug(f"Repository stats: {repository.stats()}")
+        logging.info(f"Finished processing receive recipe request id {correlation_id}. Time taken: {end - start:0.4f}s")
+
+@bp.route(route="receive-recipes", methods=["POST"]) 
+def receive_recipes(req: func.HttpRequest) -> func.HttpResponse:
+    start = perf_counter()
+    correlation_id = uuid4()
+
+    if not repository.connected:
+        repository.connect()
+
+    try:
+        req_body = req.get_json()
+        validate(instance=req_body, schema=receiveRecipesSchema)
+
+        codes = list(dict.fromkeys(req_body["codes"]))
+        logging.info(f"processing share batch request id {correlation_id} for {len(codes)} codes")
+
+        found, missing = read_recipes(codes)
+
+        result = { "items": clean_items(found), "missing": missing }
+
+        return func.HttpResponse(json.dumps(result), status_code=200, mimetype="application/json")
+    except (ValueError, jsonschema.exceptions.ValidationError) as e:
+        logging.error(f"Failed to process share batch request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not receive the recipes because the data provided is invalid. Please try again.", status_code=400)
+    except Exception as e:
+        logging.error(f"Failed to process share batch request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not receive the recipes due to an internal issue. Please try again.", status_code=400)
+    finally:
+        end = perf_counter()
+        logging.debug(f"Repository stats: {repository.stats()}")
+        logging.info(f"Finished processing receive recipes request id {correlation_id}. Time taken: {end - start:0.4f}s")
@@ -1,28 +1,388 @@
 import os
-from typing import Any, Dict
-from azure.cosmos import CosmosClient
+import json
+import math
+import sqlite3
+import logging
+import tempfile
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread, local
+from time import perf_counter, sleep, time
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping
+
+from .cache import LruCache
 
 DATABASE_NAME = "sharp-cooking"
 CONTAINER_NAME = "ShareItems"
 
+# stored for codes that do not exist so repeated scans of a bad code do not reach cosmos
+NOT_FOUND = object()
+
+class OperationMetrics:
+    """Latency and request charge of a repository operation. Percentiles are computed over the most recent samples
+    Args:
+        samples (int): number of recent latencies kept
+    """
+    def __init__(self, samples: int = 1024):
+        self.count = 0
+        self.request_charge = 0.0
+        self.latencies: Deque[float] = deque(maxlen=samples)
+        self._lock = Lock()
+
+    def record(self, elapsed: float, request_charge: float):
+        with self._lock:
+            self.count += 1
+            self.request_charge += request_charge
+            self.latencies.append(elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            count, request_charge = self.count, self.request_charge
+
+        def percentile(value: float) -> float:
+            return latencies[min(int(len(latencies) * value), len(latencies) - 1)] * 1000 if latencies else 0
+
+        return {
+            "count": count,
+            "requestCharge": request_charge,
+            "p50Ms": percentile(0.5),
+            "p95Ms": percentile(0.95),
+            "maxMs": latencies[-1] * 1000 if latencies else 0,
+        }
+
 class Repository:
+    def __init__(self):
+        self.metrics: Dict[str, OperationMetrics] = {}
+        self.cache = LruCache(
+            max_bytes=int(os.environ.get("REPOSITORY_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            ttl=float(os.environ.get("REPOSITORY_CACHE_TTL", "3600")),
+            sizeof=lambda item: 1 if item is NOT_FOUND else len(json.dumps(item)))
+        self.not_found_ttl = float(os.environ.get("REPOSITORY_NOT_FOUND_TTL", "5"))
+        self.max_connections = int(os.environ.get("COSMOS_MAX_CONNECTIONS", "16"))
+        self._writers: Any = None
+        self._lock = Lock()
+
     def connect(self):
-        endpoint = os.environ.get("COSMOS_ENDPOINT")
-        key = os.environ.get("COSMOS_KEY")
+        """Creates the cosmos client once per process. Every route shares it so connections, TLS sessions
+        and the container metadata are reused
+        """
+        with self._lock:
+            if self.connected:
+                return
+
+            endpoint = os.environ.get("COSMOS_ENDPOINT")
+            key = os.environ.get("COSMOS_KEY")
 
-        if endpoint is None or key is None:
-            return
-        
-        self.client = CosmosClient(url=endpoint, credential=key)
-        self.database = self.client.get_database_client(DATABASE_NAME)
-        self.container = self.database.get_container_client(CONTAINER_NAME)
+            if endpoint is None or key is None:
+                return
+
+            # imported here so routes that never touch cosmos do not pay for loading the sdk
+            from azure.cosmos import CosmosClient
+            from azure.core.pipeline.transport import RequestsTransport
+            from requests import Session
+            from requests.adapters import HTTPAdapter
+
+            session = Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=self.max_connections))
+
+            preferred_regions = [region.strip() for region in os.environ.get("COSMOS_PREFERRED_REGIONS", "").split(",") if region.strip()]
+
+            self.client = CosmosClient(url=endpoint, credential=key,
+                                       preferred_locations=preferred_regions,
+                                       connection_timeout=int(os.environ.get("COSMOS_CONNECTION_TIMEOUT", "10")),
+                                       transport=RequestsTransport(session=session, session_owner=False))
+            self.database = self.client.get_database_client(DATABASE_NAME)
+            self.container = self.database.get_container_client(CONTAINER_NAME)
 
     @property
     def connected(self) -> bool:
         return hasattr(self, 'container') and self.container is not None
 
+    def warm_up(self):
+        """Connects and reads the container properties so the first request finds the connection open
+        and the partition routing already cached
+        """
+        start = perf_counter()
+        try:
+            self.connect()
+            if self.connected:
+                self.container.read()
+                logging.info(f"Repository warmed up in {perf_counter() - start:0.4f}s")
+        except Exception as e:
+            logging.warning(f"Failed to warm up the repository. Error: {e}")
+
     def read_item(self, id: str) -> Dict[str, Any]:
-        return self.container.read_item(id, partition_key=id)
-    
+        """Reads a share item, serving it from memory until it expires in cosmos
+        Args:
+            id (str): share code, also the partition key
+        Raises:
+            CosmosResourceNotFoundError: when the item does not exist
+        Returns:
+            dict: the item
+        """
+        from azure.cosmos import exceptions
+
+        item = self.cache.get(id)
+        if item is NOT_FOUND:
+            raise exceptions.CosmosResourceNotFoundError(status_code=404, message=f"Item {id} does not exist")
+
+        if item is not None:
+            return item
+
+        try:
+            item = self._measure("read_item", lambda hook: self.container.read_item(id, partition_key=id, response_hook=hook))
+        except exceptions.CosmosResourceNotFoundError:
+            self.cache.set(id, NOT_FOUND, ttl=self.not_found_ttl)
+            raise
+
+        self._cache_item(id, item)
+
+        return item
+
+    def read_items(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Reads many share items at once. Cached items are served from memory and the rest is
+        fetched with a single multi item read
+        Args:
+            ids (list): share codes, also the partition keys
+        Returns:
+            dict: items found by id, codes that do not exist are left out
+        """
+        result = {}
+        pending = []
+        for id in dict.fromkeys(ids):
+            item = self.cache.get(id)
+            if item is None:
+                pending.append(id)
+            elif item is not NOT_FOUND:
+                result[id] = item
+
+        if not pending:
+            return result
+
+        def read_many(hook: Callable):
+            # read_items takes no response hook, its result carries the combined headers instead
+            items = self.container.read_items([(id, id) for id in pending])
+            hook(items.get_response_headers(), None)
+            return items
+
+        items = self._measure("read_items", read_many)
+        found = { item.get("id"): item for item in items }
+
+        for id in pending:
+            item = found.get(id)
+            if item is None:
+                self.cache.set(id, NOT_FOUND, ttl=self.not_found_ttl)
+                continue
+
+            result[id] = item
+            self._cache_item(id, item)
+
+        return result
+
     def create_item(self, item: Dict[str, Any]):
-        self.container.create_item(item)
\ No newline at end of file
+        try:
+            return self._measure("create_item", lambda hook: self.container.create_item(item, response_hook=hook))
+        finally:
+            # drops a cached not found for the code that was just taken
+            self.cache.delete(item.get("id"))
+
+    def create_items(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Creates many items concurrently. Each share item is its own partition so they cannot go
+        in a single transactional batch, the writes share the connection pool instead
+        Args:
+            items (list): items to create
+        Raises:
+            CosmosHttpResponseError: the first write that failed
+        Returns:
+            list: the created items in the same order
+        """
+        with self._lock:
+            if self._writers is None:
+                self._writers = ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix="repository")
+
+        return list(self._writers.map(self.create_item, items))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = { operation: metrics.stats() for operation, metrics in self.metrics.items() }
+        result["cache"] = self.cache.stats()
+
+        return result
+
+    def _cache_item(self, id: str, item: Dict[str, Any]):
+        # never kept past the moment cosmos deletes the item, items about to expire are not cached at all
+        remaining = remaining_ttl(item)
+        if remaining is None:
+            self.cache.set(id, item)
+        elif remaining > 0:
+            self.cache.set(id, item, ttl=min(remaining, self.cache.ttl))
+
+    def _measure(self, operation: str, call: Callable[[Callable], Any]) -> Any:
+        charge = [0.0]
+
+        def hook(headers: Mapping[str, str], _):
+            charge[0] = float(headers.get("x-ms-request-charge") or 0)
+
+        start = perf_counter()
+        try:
+            return call(hook)
+        finally:
+            metrics = self.metrics.get(operation)
+            if metrics is None:
+                metrics = self.metrics.setdefault(operation, OperationMetrics())
+
+            metrics.record(perf_counter() - start, charge[0])
+
+def remaining_ttl(item: Dict[str, Any]) -> Any:
+    """Computes how long an item still lives in cosmos based on its last write and time to live
+    Args:
+        item (dict): item read from cosmos
+    Returns:
+        float: seconds until the item expires or None when it does not expire
+    """
+    ttl = item.get("ttl")
+    written = item.get("_ts")
+
+    if not isinstance(ttl, (int, float)) or ttl < 0:
+        return None
+
+    if not isinstance(written, (int, float)):
+        return ttl
+
+    return written + ttl - time()
+
+class LocalContainer:
+    """SQLite stand in for the subset of the cosmos container used by the repository. Latency and request
+    charges are simulated so share and receive can be benchmarked without an account
+    Args:
+        path (str): database file
+        latency (float): seconds added to every operation
+    """
+    def __init__(self, path: str, latency: float = 0):
+        self.path = path
+        self.latency = latency
+        self._connections = local()
+        # sqlite allows a single writer, waiting on a lock avoids its busy retry sleeps
+        self._write_lock = Lock()
+
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY, body TEXT NOT NULL, expires_at REAL)")
+
+    def read(self) -> Dict[str, Any]:
+        return { "id": CONTAINER_NAME }
+
+    def read_item(self, item: str, partition_key: str, response_hook: Callable = None) -> Dict[str, Any]:
+        from azure.cosmos import exceptions
+
+        found = self._read([item])
+        body = found.get(item)
+        self._respond(response_hook, request_charge(body or {}, write=False))
+
+        if body is None:
+            raise exceptions.CosmosResourceNotFoundError(status_code=404, message=f"Item {item} does not exist")
+
+        return body
+
+    def read_items(self, items: List[tuple]) -> "LocalItemList":
+        found = self._read([id for id, _ in items])
+        # read many is billed like the point reads it replaces plus a small query overhead
+        charge = sum(request_charge(body, write=False) for body in found.values()) + 2
+        self._respond(None, charge)
+
+        return LocalItemList(found.values(), { "x-ms-request-charge": str(charge) })
+
+    def create_item(self, body: Dict[str, Any], response_hook: Callable = None) -> Dict[str, Any]:
+        from azure.cosmos import exceptions
+
+        created = { **body, "_ts": int(time()) }
+        ttl = body.get("ttl")
+        expires_at = created["_ts"] + ttl if isinstance(ttl, (int, float)) and ttl >= 0 else None
+
+        connection = self._connect()
+        try:
+            with self._write_lock, connection:
+                # an expired item frees its id the same way cosmos does
+                connection.execute("DELETE FROM items WHERE id = ? AND expires_at <= ?", (body["id"], time()))
+                connection.execute("INSERT INTO items (id, body, expires_at) VALUES (?, ?, ?)", (body["id"], json.dumps(created), expires_at))
+        except sqlite3.IntegrityError:
+            raise exceptions.CosmosResourceExistsError(status_code=409, message=f"Item {body['id']} already exists")
+
+        self._respond(response_hook, request_charge(created, write=True))
+
+        return created
+
+    def _read(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        placeholders = ",".join("?" * len(ids))
+        rows = self._connect().execute(f"SELECT id, body FROM items WHERE id IN ({placeholders}) AND (expires_at IS NULL OR expires_at > ?)",
+                                       (*ids, time())).fetchall()
+
+        return { id: json.loads(body) for id, body in rows }
+
+    def _respond(self, response_hook: Callable, charge: float):
+        if self.latency:
+            sleep(self.latency)
+
+        if response_hook is not None:
+            response_hook({ "x-ms-request-charge": str(charge) }, None)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.connection = connection
+
+        return connection
+
+class LocalItemList(list):
+    def __init__(self, items: Iterable[Dict[str, Any]], headers: Dict[str, str]):
+        super().__init__(items)
+        self.headers = headers
+
+    def get_response_headers(self) -> Dict[str, str]:
+        return self.headers
+
+def request_charge(body: Dict[str, Any], write: bool) -> float:
+    """Approximates the cosmos request units of a point operation, about 1 per KB read and 5.5 per KB written
+    """
+    kilobytes = max(math.ceil(len(json.dumps(body)) / 1024), 1)
+
+    return round(kilobytes * (5.5 if write else 1), 2)
+
+class LocalRepository(Repository):
+    """Repository backed by a local SQLite file for offline load tests. Items expire using their ttl
+    """
+    def connect(self):
+        with self._lock:
+            if self.connected:
+                return
+
+            path = os.environ.get("LOCAL_REPOSITORY_PATH", os.path.join(tempfile.gettempdir(), "sharp-cooking-share-items.db"))
+            latency = float(os.environ.get("LOCAL_REPOSITORY_LATENCY_MS", "0")) / 1000
+
+            self.container = LocalContainer(path, latency)
+
+def create_repository() -> Repository:
+    """Creates the repository selected by REPOSITORY_BACKEND, cosmos (default) or local
+    """
+    backend = os.environ.get("REPOSITORY_BACKEND", "cosmos").lower()
+
+    if backend == "local":
+        return LocalRepository()
+
+    if backend != "cosmos":
+        raise ValueError(f"Unknown repository backend {backend}")
+
+    return Repository()
+
+# a single repository per worker process, share and receive use the same client
+shared_repository = create_repository()
+
+def warm_up_in_background():
+    """Warms up the shared repository without holding back the host startup. Nothing happens
+    when cosmos is not configured
+    """
+    if isinstance(shared_repository, LocalRepository) or (os.environ.get("COSMOS_ENDPOINT") and os.environ.get("COSMOS_KEY")):
+        Thread(target=shared_repository.warm_up, name="repository-warm-up", daemon=True).start()
@@ -1,29 +1,55 @@
 import logging
 import json
-import json
 import random
 import string
 import jsonschema
-import qrcode
-import qrcode.image.svg
 
 import azure.functions as func
 from jsonschema import validate
 
+from typing import Union
 from uuid import uuid4
 from time import perf_counter
 
-from .repository import Repository
-from .models import recipeSchema
+from .repository import Repository, shared_repository
+from .models import recipeSchema, shareRecipesSchema
+from .qr import QR_FORMATS, render_qr_code
+from .media_store import MediaStore, offload_media, get_shared_media_store
 
-repository = Repository()
+repository = shared_repository
+media_store: Union[MediaStore, None] = None
 bp = func.Blueprint()
-qr = qrcode.QRCode(image_factory=qrcode.image.svg.SvgPathImage)
+
+SHARE_TTL = 60 * 60
 
 def mock_repository(mock_repository: Repository):
     global repository
     repository = mock_repository
 
+def mock_media_store(mock_media_store: MediaStore):
+    global media_store
+    media_store = mock_media_store
+
+def get_media_store() -> Union[MediaStore, None]:
+    return media_store if media_store is not None else get_shared_media_store()
+
+def new_share_id() -> str:
+    rand = random.SystemRandom()
+
+    return ''.join(rand.choices(population=string.ascii_uppercase +  string.digits, k=6))
+
+def new_share_item(share_id: str, recipe: dict) -> dict:
+    return {
+        "id": share_id,
+        "title": recipe.get("title"),
+        "notes": recipe.get("notes"),
+        "ingredients": recipe.get("ingredients"),
+        "steps": recipe.get("steps"),
+        "source": recipe.get("source"),
+        "media": offload_media(recipe.get("media"), get_media_store()),
+        "ttl": SHARE_TTL
+    }
+
 @bp.route(route="share-recipe", methods=["POST"]) 
 def share_recipe(req: func.HttpRequest) -> func.HttpResponse:
     start = perf_counter()
@@ -32,8 +58,7 @@ def share_recipe(req: func.HttpRequest) -> func.HttpResponse:
     if not repository.connected:
         repository.connect()
 
-    rand = random.SystemRandom()
-    share_id = ''.join(rand.choices(population=string.ascii_uppercase +  string.digits, k=6))
+    share_id = new_share_id()
 
     try:
         logging.info(f"processing share request id {correlation_id}")
@@ -41,31 +66,17 @@ def share_recipe(req: func.HttpRequest) -> func.HttpResponse:
         req_body = req.get_json()
         validate(instance=req_body, schema=recipeSchema)
 
-        ttl = 60 * 60
-
-        new_item = {
-            "id": share_id,
-            "title": req_body.get("title"),
-            "notes": req_body.get("notes"),
-            "ingredients": req_body.get("ingredients"),
-            "steps": req_body.get("steps"),
-            "source": req_body.get("source"),
-            "media": req_body.get("media"),
-            "ttl": ttl
-        }
-        operation_result = repository.create_item(new_item)
-        logging.debug(operation_result)
-
-        qr = qrcode.QRCode(image_factory=qrcode.image.svg.SvgPathImage)
-        qr.add_data(share_id)
-        qr.make(fit=True)
+        qr_format = req.params.get("qrFormat") or "svg"
+        if qr_format not in QR_FORMATS:
+            raise ValueError(f"Unknown QR code format {qr_format}")
 
-        img = qr.make_image()
+        operation_result = repository.create_item(new_share_item(share_id, req_body))
+        logging.debug(operation_result)
 
-        result = json.dumps({ "id": share_id, "qr_code": img.to_string(encoding='unicode'), "ttl": ttl })
+        result = json.dumps({ "id": share_id, "qr_code": render_qr_code(share_id, qr_format), "ttl": SHARE_TTL })
 
         return func.HttpResponse(result, status_code=202, mimetype="application/json")
-    except jsonschema.exceptions.ValidationError as e:
+    except (ValueError, jsonschema.exceptions.ValidationError) as e:
         logging.error(f"Failed to process share request id {correlation_id}. Error: {e}")
 
         return func.HttpResponse("Could not share recipe because the data provided is invalid. Please try again.", status_code=400)
@@ -75,4 +86,47 @@ def share_recipe(req: func.HttpRequest) -> func.HttpResponse:
         return func.HttpResponse("Could share the recipe due to an internal issue. Please try again.", status_code=400)
     finally:
         end = perf_counter()
-        logging.info(f"Finished processing share request id {correlation_id}. Time taken: {end - start:0.4f}s")
\ No newline at end of file
+        logging.debug(f"Repository stats: {repository.stats()}")
+        logging.info(f"Finished processing share request id {correlation_id}. Time taken: {end - start:0.4f}s")
+
+@bp.route(route="share-recipes", methods=["POST"]) 
+def share_recipes(req: func.HttpRequest) -> func.HttpResponse:
+    start = perf_counter()
+    correlation_id = uuid4()
+
+    if not repository.connected:
+        repository.connect()
+
+    try:
+        req_body = req.get_json()
+        validate(instance=req_body, schema=shareRecipesSchema)
+
+        qr_format = req.params.get("qrFormat") or "svg"
+        if qr_format not in QR_FORMATS:
+            raise ValueError(f"Unknown QR code format {qr_format}")
+
+        logging.info(f"processing share batch request id {correlation_id} for {len(req_body)} recipes")
+
+        items = [new_share_item(new_share_id(), recipe) for recipe in req_body]
+        repository.create_items(items)
+
+        # the collection is written last so its code never points to recipes that are not there yet
+        collection_id = new_share_id()
+        recipe_ids = [item["id"] for item in items]
+        repository.create_item({ "id": collection_id, "collection": recipe_ids, "ttl": SHARE_TTL })
+
+        result = json.dumps({ "id": collection_id, "qr_code": render_qr_code(collection_id, qr_format), "ttl": SHARE_TTL, "recipes": recipe_ids })
+
+        return func.HttpResponse(result, status_code=202, mimetype="application/json")
+    except (ValueError, jsonschema.exceptions.ValidationError) as e:
+        logging.error(f"Failed to process share batch request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not share recipes because the data provided is invalid. Please try again.", status_code=400)
+    except Exception as e:
+        logging.error(f"Failed to process share batch request id {correlation_id}. Error: {e}")
+
+        return func.HttpResponse("Could not share the recipes due to an internal issue. Please try again.", status_code=400)
+    finally:
+        end = perf_counter()
+        logging.debug(f"Repository stats: {repository.stats()}")
+        logging.info(f"Finished processing share recipes request id {correlation_id}. Time taken: {end - start:0.4f}s")
@@ -0,0 +1,87 @@
+import builtins
+import logging
+import os
+import sys
+
+from contextlib import contextmanager
+from importlib.util import resolve_name
+from time import perf_counter
+from typing import Dict, List
+
+class ImportProfiler:
+    """Records how long each module takes to import. Self time excludes the modules it imported in turn
+    """
+    def __init__(self):
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._stack: List[List[float]] = []
+        self._original_import = None
+
+    def install(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        builtins.__import__ = self._original_import
+
+    @property
+    def total(self) -> float:
+        return sum(timing["self"] for timing in self.timings.values())
+
+    def report(self, top: int = 25) -> List[str]:
+        """Formats the slowest imports
+        Args:
+            top (int): number of modules to include
+        Returns:
+            list: one line per module ordered by cumulative time
+        """
+        slowest = sorted(self.timings.items(), key=lambda item: item[1]["cumulative"], reverse=True)[:top]
+
+        return [f"{timing['cumulative'] * 1000:9.1f}ms cumulative {timing['self'] * 1000:9.1f}ms self  {name}" for name, timing in slowest]
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = name
+        if level > 0:
+            module_name = resolve_name("." * level + name, (globals or {}).get("__package__") or "")
+
+        if module_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        # the child accumulator collects the time spent importing nested modules
+        self._stack.append([0.0])
+        start = perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = perf_counter() - start
+            children = self._stack.pop()[0]
+
+            if self._stack:
+                self._stack[-1][0] += elapsed
+
+            if module_name not in self.timings:
+                self.timings[module_name] = { "cumulative": elapsed, "self": elapsed - children }
+
+@contextmanager
+def profile_imports():
+    """Logs per module import timings for the block when the IMPORT_PROFILE setting is enabled.
+    A warning is logged when the total exceeds IMPORT_BUDGET_MS
+    """
+    if os.environ.get("IMPORT_PROFILE", "").lower() not in ("1", "true"):
+        yield None
+        return
+
+    profiler = ImportProfiler()
+    profiler.install()
+    try:
+        yield profiler
+    finally:
+        profiler.uninstall()
+
+        total_ms = profiler.total * 1000
+        logging.info(f"Imports took {total_ms:0.1f}ms")
+        for line in profiler.report(int(os.environ.get("IMPORT_PROFILE_TOP", "25"))):
+            logging.info(line)
+
+        budget_ms = float(os.environ.get("IMPORT_BUDGET_MS", "0"))
+        if budget_ms and total_ms > budget_ms:
+            logging.warning(f"Imports took {total_ms:0.1f}ms which is over the budget of {budget_ms:0.1f}ms")
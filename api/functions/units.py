@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import logging
+
+from contextlib import suppress
+from functools import lru_cache
+from importlib.metadata import version
+from typing import TYPE_CHECKING, Any, Dict, Tuple, Union
+
+if TYPE_CHECKING:
+    from pint import UnitRegistry
+
+UNIT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "unit_table.json")
+
+# every mass is converted to grams and every volume to milliliters
+BASE_UNITS = { "mass": "gram", "volume": "milliliter" }
+MIN_PREFIX_SCALE = 1e-3
+
+@lru_cache(maxsize=None)
+def get_unit_registry() -> "UnitRegistry":
+    """Gets the unit registry shared by the parsers, building it on first use
+    Returns:
+        UnitRegistry: pint default registry
+    """
+    from pint import UnitRegistry
+
+    return UnitRegistry()
+
+def build_unit_table(ureg: "UnitRegistry") -> Dict[str, Any]:
+    """Extracts from a pint registry everything needed to resolve unit names without it
+    Args:
+        ureg (UnitRegistry): registry to extract the definitions from
+    Returns:
+        dict: pint version, units by name, symbol and alias, prefixes, suffixes, non multiplicative units
+        and the factor converting each mass and volume unit to its base unit
+    """
+    dimensions = { ureg.get_dimensionality(base): dimension for dimension, base in BASE_UNITS.items() }
+    factors = {}
+    for definition in ureg._units.values():
+        dimension = dimensions.get(ureg.get_dimensionality(definition.name)) if definition.is_multiplicative else None
+        if dimension is not None:
+            factors[definition.name] = [dimension, float(ureg.Quantity(1, definition.name).to(BASE_UNITS[dimension]).magnitude)]
+
+    return {
+        "pint_version": version("pint"),
+        "units": { key: definition.name for key, definition in ureg._units.items() },
+        "prefixes": [[key, definition.name] for key, definition in ureg._prefixes.items()],
+        "suffixes": [[key, value] for key, value in ureg._suffixes.items()],
+        "non_multiplicative": sorted({ definition.name for definition in ureg._units.values() if not definition.is_multiplicative }),
+        "factors": factors,
+        "prefix_factors": { definition.name: float(definition.converter.scale) for definition in ureg._prefixes.values() },
+    }
+
+class UnitTable:
+    """Resolves unit names the same way pint's get_name does for tokens made of ascii letters
+    Args:
+        data (dict): table created by build_unit_table
+    """
+    def __init__(self, data: Dict[str, Any]):
+        self.pint_version = data["pint_version"]
+        self.units: Dict[str, str] = data["units"]
+        self.prefixes = [tuple(prefix) for prefix in data["prefixes"]]
+        self.suffixes = [tuple(suffix) for suffix in data["suffixes"]]
+        self.non_multiplicative = set(data["non_multiplicative"])
+        self.factors: Dict[str, Tuple[str, float]] = { name: tuple(factor) for name, factor in data["factors"].items() }
+        self.prefix_factors: Dict[str, float] = data["prefix_factors"]
+        self.factor = lru_cache(maxsize=1024)(self._resolve_factor)
+
+    def lookup(self, token: str) -> Union[str, None]:
+        """Finds the canonical unit name for a token
+        Args:
+            token (str): token e.g. cups
+        Returns:
+            str: canonical unit name, empty when it is not a unit or None when pint is needed to decide
+        """
+        if not (token.isascii() and token.isalpha()):
+            return None
+
+        unit = self.units.get(token)
+        if unit is not None:
+            return unit
+
+        # mirrors pint's parse_unit_name: every prefix and suffix combination around a known unit
+        candidates = {}
+        for suffix, suffix_value in self.suffixes:
+            for prefix, prefix_name in self.prefixes:
+                if token.startswith(prefix) and token.endswith(suffix):
+                    name = token[len(prefix):]
+                    if suffix:
+                        name = name[:-len(suffix)]
+                        if len(name) == 1:
+                            continue
+                    if name in self.units:
+                        candidates[(prefix_name, self.units[name], suffix_value)] = None
+
+        for prefix_name, unit_name, suffix_value in list(candidates):
+            if suffix_value:
+                return None
+            if prefix_name:
+                candidates.pop(("", prefix_name + unit_name, ""), None)
+
+        if not candidates:
+            return ""
+
+        prefix_name, unit_name, _ = next(iter(candidates))
+        if prefix_name:
+            # pint raises for prefixed offset units, let it do so
+            if unit_name in self.non_multiplicative:
+                return None
+
+            return prefix_name + unit_name
+
+        return unit_name
+
+    def _resolve_factor(self, unit: str) -> Union[Tuple[str, float], None]:
+        """Finds what a unit measures and how many base units it is worth
+        Args:
+            unit (str): canonical unit name as returned by lookup e.g. cup or milliliter
+        Returns:
+            tuple: mass or volume and the factor to grams or milliliters, None for any other unit
+        """
+        factor = self.factors.get(unit)
+        if factor is not None or not unit:
+            return factor
+
+        # prefixed names such as milliliter are not in the registry, lookup builds them from prefix and unit.
+        # recipes never measure below milli so smaller prefixes are misread words, e.g. fl oz read as femtoliter
+        for prefix, scale in self.prefix_factors.items():
+            if scale < MIN_PREFIX_SCALE:
+                continue
+            if prefix and unit.startswith(prefix) and unit[len(prefix):] in self.factors:
+                dimension, factor = self.factors[unit[len(prefix):]]
+                return dimension, scale * factor
+
+        return None
+
+@lru_cache(maxsize=1024)
+def unit_key(unit: str) -> str:
+    """Normalizes a unit so portions and requests can be matched, e.g. tbsp and tablespoons are both tablespoon
+    Args:
+        unit (str): unit as written in the data or the request
+    Returns:
+        str: canonical unit name or the lowercase word when it is not a unit e.g. each
+    """
+    table = load_unit_table()
+    unit = (unit or "").strip()
+
+    return table.lookup(unit) or table.lookup(unit.lower()) or unit.lower()
+
+def write_unit_table(data: Dict[str, Any], path: str = UNIT_TABLE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, separators=(",", ":"), sort_keys=True)
+
+@lru_cache(maxsize=None)
+def load_unit_table(path: str = UNIT_TABLE_PATH) -> UnitTable:
+    """Loads the prebuilt unit table. When it is missing or was built with a different pint version,
+    it is regenerated from pint and saved again if the folder is writable
+    Args:
+        path (str): location of the table
+    Returns:
+        UnitTable: table matching the installed pint version
+    """
+    data = None
+    with suppress(OSError, ValueError):
+        with open(path) as file:
+            data = json.load(file)
+
+    if data is None or data.get("pint_version") != version("pint") or "factors" not in data:
+        logging.warning(f"Unit table at {path} is missing or was not built for pint {version('pint')}. Regenerating it.")
+        data = build_unit_table(get_unit_registry())
+
+        with suppress(OSError):
+            write_unit_table(data, path)
+
+    return UnitTable(data)
+
+if __name__ == "__main__":
+    # python -m functions.units regenerates the table, --check fails when it is out of date
+    table = build_unit_table(get_unit_registry())
+
+    if "--check" in sys.argv:
+        with open(UNIT_TABLE_PATH) as file:
+            if json.load(file) != table:
+                sys.exit(f"{UNIT_TABLE_PATH} is out of date. Run python -m functions.units to regenerate it.")
+    else:
+        write_unit_table(table)
@@ -1,19 +1,29 @@
 from contextlib import suppress
 import io
+import os
+import json
+import hashlib
+import logging
+from typing import Any, Callable, List, NamedTuple, Tuple, Union
+from uuid import uuid4
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from zipfile import ZipFile
-from fractions import Fraction
+from typing import TYPE_CHECKING
 import re
-import requests
 import base64
 import mimetypes
-from PIL import Image
-from pint import UnitRegistry
-import pillow_avif
-from recipe_scrapers import scrape_html, AbstractScraper
 
-ureg = UnitRegistry()
+from .cache import LruCache, DiskCache
+from .executor import image_executor
+from .ingredient_parser import FRACTIONS_TABLE, TIME_PATTERN, get_ingredient_parser
 
-def parse_recipe_ingredients(text: str, ureg: UnitRegistry):
+# requests, Pillow, pint and recipe_scrapers are imported by the functions that use them so
+# a cold start only pays for the libraries needed by the route being called
+if TYPE_CHECKING:
+    from pint import UnitRegistry
+    from recipe_scrapers import AbstractScraper
+
+def parse_recipe_ingredients(text: str, ureg: "UnitRegistry" = None):
     """Parses a recipe collection of ingredientes that are formatted in a single string separated by \n
     Args:
         text (str): ingredients
@@ -21,11 +31,12 @@ def parse_recipe_ingredients(text: str, ureg: UnitRegistry):
         list: list of ingredients with raw, unit, and quantity
     """
     ingredients = text.split("\n")
+    parser = get_ingredient_parser(ureg)
     
     result = []
     for ingredient in ingredients:
         if ingredient and not ingredient.isspace():
-            result.append(parse_recipe_ingredient(ingredient, "en", ureg))
+            result.append(parser.parse(ingredient))
     
     return result
 
@@ -45,30 +56,232 @@ def parse_recipe_instructions(text: str):
     
     return result    
 
-def parse_image(name: str, image: bytes, resize: bool = True, mime: str = "") -> str:
-    """Extracts an image from a backup file and convert to uri format
+def parse_recipe_texts(recipes: list, ureg: "UnitRegistry" = None):
+    """Parses the ingredients and instructions of many recipes at once. Each distinct line is parsed
+    a single time no matter how many recipes contain it
+    Args:
+        recipes (list): recipes with id, ingredients and steps formatted in strings separated by \n
+    Returns:
+        list: list of recipes with id and parsed ingredients and steps
+    """
+    parser = get_ingredient_parser(ureg)
+    ingredients = {}
+    instructions = {}
+
+    result = []
+    for recipe in recipes:
+        ingredient_lines = [line for line in (recipe.get("ingredients") or "").split("\n") if line and not line.isspace()]
+        instruction_lines = [line for line in (recipe.get("steps") or "").split("\n") if line and not line.isspace()]
+
+        for line in ingredient_lines:
+            if line not in ingredients:
+                ingredients[line] = parser.parse(line)
+
+        for line in instruction_lines:
+            if line not in instructions:
+                instructions[line] = parse_recipe_instruction(line, "en")
+
+        result.append({
+            "id": recipe.get("id"),
+            "ingredients": [ingredients[line] for line in ingredient_lines],
+            "steps": [instructions[line] for line in instruction_lines]
+        })
+
+    return result
+
+MAX_IMAGE_SIZE = (1024, 1024)
+
+def open_image_reduced(image: bytes, max_size: tuple):
+    """Opens an image already reduced to fit in max_size. JPEG files are downscaled by the decoder
+    so the full resolution bitmap is never allocated, other formats are reduced by an integer
+    factor before the final LANCZOS resample
+    Args:
+        image (bytes): image file
+        max_size (tuple): maximum width and height
+    Returns:
+        Image: decoded image no larger than max_size
+    """
+    from PIL import Image
+    import pillow_avif
+
+    image_open = Image.open(io.BytesIO(image))
+
+    # draft picks the largest DCT scale (up to 1/8) that still keeps the image at least max_size,
+    # thumbnail skips its own draft once one was applied
+    if image_open.format == "JPEG":
+        image_open.draft(None, max_size)
+
+    image_open.thumbnail(max_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+    return image_open
+
+def transform_image(name: str, image: bytes, resize: bool = True, mime: str = "") -> Tuple[bytes, str]:
+    """Re-encodes an image, optionally reducing it to fit in MAX_IMAGE_SIZE
     Args:
         name (str): file name
-        image (bytes): backup file
+        image (bytes): image file
         resize (bool): whether to resize the image or not, default is True
+        mime (str): mime type of the image, default is guessed from the name
     Returns:
-        str: uri formatted base 64 file
+        tuple: image bytes and mime type
     """
     if not mime:
         mime = guess_mime(name)
     
-    image_open = Image.open(io.BytesIO(image))
+    from PIL import Image
+    import pillow_avif
+
+    if resize:
+        image_open = open_image_reduced(image, MAX_IMAGE_SIZE)
+    else:
+        image_open = Image.open(io.BytesIO(image))
     
     format = mime.lower().replace("image/", "")
     
     buffered = io.BytesIO()
-    if resize:
-        image_open.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
-        image_open.save(buffered, format=format)
-    else:
-        image_open.save(buffered, format=format)
+    image_open.save(buffered, format=format)
         
-    return ("data:" +  mime + ";" + "base64," + base64.b64encode(buffered.getvalue()).decode())
+    return buffered.getvalue(), mime
+
+def transform_image_variants(image: bytes, variants: List[dict]) -> List[Tuple[dict, bytes, str]]:
+    """Produces several sizes and formats of an image from a single decode. Variants are processed
+    from the largest to the smallest size and each resize starts from the previous, larger, result
+    Args:
+        image (bytes): image file
+        variants (list): variants with size (max width and height), format and optional quality
+    Returns:
+        list: variant, image bytes and mime type in the same order as requested
+    """
+    largest = max(variant["size"] for variant in variants)
+    image_open = open_image_reduced(image, (largest, largest))
+
+    from PIL import Image
+
+    results = {}
+    for index, variant in sorted(enumerate(variants), key=lambda item: item[1]["size"], reverse=True):
+        size = variant["size"]
+        if image_open.width > size or image_open.height > size:
+            image_open.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        encoded = image_open
+        if variant["format"] == "jpeg" and image_open.mode not in ("RGB", "L"):
+            encoded = image_open.convert("RGB")
+
+        options = { "quality": variant["quality"] } if "quality" in variant else {}
+        buffered = io.BytesIO()
+        encoded.save(buffered, format=variant["format"], **options)
+
+        results[index] = (variant, buffered.getvalue(), "image/" + variant["format"])
+
+    return [results[index] for index in range(len(variants))]
+
+def image_result_size(result: Union[Tuple[bytes, str], List[Tuple[dict, bytes, str]]]) -> int:
+    if isinstance(result, tuple):
+        return len(result[0])
+
+    return sum(len(image) for _, image, _ in result)
+
+# processed images keyed by the hash of the original bytes and the transform parameters
+image_cache = LruCache(
+    max_bytes=int(os.environ.get("IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    sizeof=image_result_size)
+
+def run_image_transform(key: tuple, image: bytes, transform: Callable, *args, queue_timeout: Union[float, None] = None) -> Any:
+    """Runs an image transform in the image executor unless the same bytes were already transformed with the same parameters
+    Args:
+        key (tuple): transform parameters that change the result
+        image (bytes): original image, its hash is part of the cache key
+        transform (Callable): module level transform to run on a cache miss
+        queue_timeout (float): seconds to wait for the image executor, None rejects the call when it is saturated
+    Returns:
+        Any: result of the transform
+    """
+    key = (hashlib.sha256(image).digest(), *key)
+    result = image_cache.get(key)
+
+    if result is not None:
+        image_cache.counters["bytesSaved"] += len(image)
+        return result
+
+    result = image_executor.run(transform, *args, timeout=queue_timeout)
+    image_cache.set(key, result)
+
+    return result
+
+def transform_image_cached(name: str, image: bytes, resize: bool = True, mime: str = "", queue_timeout: Union[float, None] = None) -> Tuple[bytes, str]:
+    """Same as transform_image but runs in the image executor and skips images that were already processed
+    """
+    mime = mime or guess_mime(name)
+
+    return run_image_transform(("image", resize, mime), image, transform_image, name, image, resize, mime, queue_timeout=queue_timeout)
+
+def transform_image_variants_cached(image: bytes, variants: List[dict]) -> List[Tuple[dict, bytes, str]]:
+    """Same as transform_image_variants but runs in the image executor and skips images that were already processed
+    """
+    return run_image_transform(("variants", json.dumps(variants, sort_keys=True)), image, transform_image_variants, image, variants)
+
+def parse_image(name: str, image: bytes, resize: bool = True, mime: str = "") -> str:
+    """Extracts an image from a backup file and convert to uri format
+    Args:
+        name (str): file name
+        image (bytes): backup file
+        resize (bool): whether to resize the image or not, default is True
+    Returns:
+        str: uri formatted base 64 file
+    """
+    return to_data_uri(*transform_image_cached(name, image, resize, mime))
+
+def to_data_uri(content: bytes, mime: str) -> str:
+    return ("data:" +  mime + ";" + "base64," + base64.b64encode(content).decode())
+
+def negotiate(accept: Union[str, None], offered: List[str]) -> str:
+    """Picks the response type the client prefers based on the Accept header
+    Args:
+        accept (str): Accept header value, e.g. image/*;q=0.9, application/json
+        offered (list): types the route can produce, the first one is the default
+    Returns:
+        str: the offered type with the highest quality, ties go to the earliest offered type
+    """
+    if not accept:
+        return offered[0]
+
+    best, best_quality = offered[0], 0.0
+    for media_range in accept.split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                with suppress(ValueError):
+                    quality = float(param[2:])
+
+        major, _, minor = media_type.lower().partition("/")
+        for candidate in offered:
+            candidate_major, _, candidate_minor = candidate.partition("/")
+            matches = major == "*" or (major == candidate_major and minor in ("*", candidate_minor))
+
+            if matches and (quality > best_quality or (quality == best_quality and offered.index(candidate) < offered.index(best))):
+                best, best_quality = candidate, quality
+
+    return best
+
+def build_multipart(parts: List[Tuple[str, str, bytes]]) -> Tuple[bytes, str]:
+    """Builds a multipart/mixed body
+    Args:
+        parts (list): name, content type and content of each part
+    Returns:
+        tuple: body and the content type header including the boundary
+    """
+    boundary = uuid4().hex
+    body = io.BytesIO()
+
+    for name, content_type, content in parts:
+        body.write(f"--{boundary}\r\nContent-Type: {content_type}\r\nContent-Disposition: inline; name=\"{name}\"\r\n\r\n".encode())
+        body.write(content)
+        body.write(b"\r\n")
+
+    body.write(f"--{boundary}--\r\n".encode())
+
+    return body.getvalue(), f"multipart/mixed; boundary={boundary}"
 
 def guess_mime(file_name: str) -> str:
     """Guesses the mime type of a file
@@ -87,7 +300,7 @@ def guess_mime(file_name: str) -> str:
     
     return result
 
-def parse_recipe_ingredient(text: str, lang: str, ureg: UnitRegistry):
+def parse_recipe_ingredient(text: str, lang: str, ureg: "UnitRegistry" = None):
     """Parses a single recipe ingredient
     Args:
         text (str): the ingredient e.g. 10 grams flour
@@ -95,33 +308,7 @@ def parse_recipe_ingredient(text: str, lang: str, ureg: UnitRegistry):
     Returns:
         dictionary: raw text, quantity parsed, unit identified
     """
-    text = replace_unicode_fractions(text)
-    qty_re = re.search(r"^(?P<Value>\d{1,5}\s\d{1,5}\/\d{1,5}|\d{1,5}\/\d{1,5}|\d{1,5}\.?\d{0,5})\d*\s?(?P<Unit>\w*\b)",
-                    text)
-
-    if not qty_re:
-        return { "raw": text, "quantity": 0, "unit": "" }
-
-    value = qty_re.group("Value")
-    unit = qty_re.group("Unit")
-    
-    unit_value = ""
-    if unit and unit in ureg:
-        unit_value = ureg.get_name(unit)
-
-    parts = value.split(" ")
-    
-    if parts.__len__() == 2:
-        whole = int(parts[0])
-        fraction = Fraction(parts[1])
-        return { "raw": text, "quantity": whole + float(fraction).__round__(2), "unit": unit_value }
-    
-    if parts[0].count("/") == 1:
-        fraction = Fraction(parts[0])
-        return { "raw": text, "quantity": float(fraction).__round__(2), "unit": unit_value }
-        
-    regular = parts[0]
-    return { "raw": text, "quantity": float(regular), "unit": unit_value }
+    return get_ingredient_parser(ureg).parse(text)
 
 def replace_unicode_fractions(text: str):
     """Replaces unicode based fraction values such as ½ with string fractions such as 1/2
@@ -130,13 +317,7 @@ def replace_unicode_fractions(text: str):
     Returns:
         str: text with replaced fractions
     """    
-    result = text.replace("½", "1/2")
-    result = result.replace("¼", "1/4")
-    result = result.replace("¾", "3/4")
-    result = result.replace("⅓", "1/3")
-    result = result.replace("⅔", "2/3")
-
-    return result
+    return text.translate(FRACTIONS_TABLE)
 
 def parse_recipe_instruction(text: str, lang: str):
     """Parses a single recipe instruction
@@ -146,8 +327,7 @@ def parse_recipe_instruction(text: str, lang: str):
     Returns:
         dictionary: raw instruction, minutes identified for the instruction
     """    
-    qty_re = re.findall(r"(?P<Minutes>\d{1,5}\.?\d{0,5})\s*(minutes|minute|min)\b|(?P<Hours>\d{1,5}\.?\d{0,5})\s*(hours|hour)\b|(?P<Days>\d{1,5}\.?\d{0,5})\s*(days|day)\b",
-                    text)
+    qty_re = TIME_PATTERN.findall(text)
     minutes = 0
     
     for match in qty_re:
@@ -174,27 +354,211 @@ request_headers = {
     "Upgrade-Insecure-Requests": "1"
 }
 
-def get_recipe_image(image_url: str):
+def get_recipe_image(image_url: str, queue_timeout: Union[float, None] = None):
     """Pulls an image from a web server and formats the result in URI and base64
     Args:
         image_url (str): URL of the image to pull
+        queue_timeout (float): seconds to wait for the image executor, None rejects the call when it is saturated
     Returns:
         str: URI in base64
     """    
-    response = requests.get(image_url, headers=request_headers)
-    parsedImage = parse_image(response.url, response.content, False, response.headers['Content-Type'])
-    return parsedImage
+    return to_data_uri(*download_recipe_image(image_url, queue_timeout=queue_timeout))
+
+class ImageDownloadError(Exception):
+    pass
+
+MAX_IMAGE_DOWNLOAD_BYTES = int(os.environ.get("MAX_IMAGE_DOWNLOAD_BYTES", str(10 * 1024 * 1024)))
+IMAGE_DOWNLOAD_TIMEOUT = float(os.environ.get("IMAGE_DOWNLOAD_TIMEOUT", "15"))
+HTML_FETCH_TIMEOUT = float(os.environ.get("HTML_FETCH_TIMEOUT", "15"))
+
+def download_recipe_image(image_url: str, max_bytes: int = MAX_IMAGE_DOWNLOAD_BYTES, queue_timeout: Union[float, None] = None) -> Tuple[bytes, str]:
+    """Pulls an image from a web server reading at most max_bytes and reduces it the same way uploads are
+    Args:
+        image_url (str): URL of the image to pull
+        max_bytes (int): largest download accepted
+        queue_timeout (float): seconds to wait for the image executor, None rejects the call when it is saturated
+    Raises:
+        ImageDownloadError: when the response is not an image or is larger than max_bytes
+    Returns:
+        tuple: image bytes and mime type
+    """
+    import requests
+
+    with requests.get(image_url, headers=request_headers, stream=True, timeout=IMAGE_DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+
+        mime = (response.headers.get("Content-Type") or "").split(";")[0].strip()
+        if not mime.startswith("image/"):
+            raise ImageDownloadError(f"{image_url} is not an image, content type is {mime}")
+
+        # check the declared size first so oversized images are rejected before reading the body
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > max_bytes:
+            raise ImageDownloadError(f"{image_url} has {length} bytes which is over the limit of {max_bytes}")
+
+        buffered = io.BytesIO()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffered.write(chunk)
+            if buffered.tell() > max_bytes:
+                raise ImageDownloadError(f"{image_url} is over the limit of {max_bytes} bytes")
+
+        url = response.url
+
+    return transform_image_cached(url, buffered.getvalue(), True, mime, queue_timeout)
+
+
+class CachedPage(NamedTuple):
+    content: bytes
+    etag: Union[str, None]
+    last_modified: Union[str, None]
+
+html_cache = LruCache(
+    max_bytes=int(os.environ.get("HTML_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    ttl=float(os.environ.get("HTML_CACHE_TTL", "300")),
+    sizeof=lambda page: len(page.content))
+
+def normalize_url(url: str) -> str:
+    """Normalizes a URL so equivalent addresses share the same cache key
+    Args:
+        url (str): URL to normalize
+    Returns:
+        str: URL with lower case scheme and host, no default port, sorted query and no fragment
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+def fetch_html(url: str) -> bytes:
+    """Downloads a web page reusing cached copies while they are fresh. Expired copies are revalidated
+    with a conditional GET using the ETag and Last-Modified headers from the original response
+    Args:
+        url (str): URL of the page
+    Returns:
+        bytes: page contents
+    """
+    key = normalize_url(url)
+    entry = html_cache.get_entry(key)
 
+    if entry is not None and not entry.expired:
+        html_cache.counters["hits"] += 1
+        return entry.value.content
 
-def get_html(url: str) -> AbstractScraper:
-    html = requests.get(url, headers=request_headers).content
+    headers = request_headers
+    if entry is not None:
+        headers = dict(request_headers)
+        if entry.value.etag:
+            headers["If-None-Match"] = entry.value.etag
+        if entry.value.last_modified:
+            headers["If-Modified-Since"] = entry.value.last_modified
+
+    import requests
+
+    response = requests.get(url, headers=headers, timeout=HTML_FETCH_TIMEOUT)
+
+    if entry is not None and response.status_code == 304:
+        html_cache.counters["revalidations"] += 1
+        html_cache.set(key, entry.value)
+        return entry.value.content
+
+    html_cache.counters["misses"] += 1
+
+    if response.status_code == 200:
+        html_cache.set(key, CachedPage(response.content, response.headers.get("ETag"), response.headers.get("Last-Modified")))
+
+    return response.content
+
+def get_html(url: str) -> "AbstractScraper":
+    from recipe_scrapers import scrape_html
+
+    html = fetch_html(url)
 
     return scrape_html(html, url, supported_only=False)
 
-def get_mock_html(mock_html: str, url: str) -> AbstractScraper:
+def get_mock_html(mock_html: str, url: str) -> "AbstractScraper":
+    from recipe_scrapers import scrape_html
+
     return scrape_html(mock_html, url, supported_only=False)
 
-def get_recipe_from_scraper(scraper: AbstractScraper, download_image: bool = False):
+recipe_cache = LruCache(
+    max_bytes=int(os.environ.get("RECIPE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+    ttl=float(os.environ.get("RECIPE_CACHE_TTL", "86400")))
+
+# the disk cache is optional and only used when a folder is configured, e.g. a mounted share
+recipe_disk_cache = DiskCache(
+    os.environ["RECIPE_CACHE_DIR"],
+    max_bytes=int(os.environ.get("RECIPE_CACHE_DIR_MAX_BYTES", str(256 * 1024 * 1024))),
+    ttl=float(os.environ.get("RECIPE_CACHE_TTL", "86400"))) if os.environ.get("RECIPE_CACHE_DIR") else None
+
+def get_recipe_from_html(html: Union[str, bytes], url: str, download_image: bool = False, queue_timeout: Union[float, None] = None):
+    """Parses a recipe from the page html reusing previous results for the same url and content
+    Args:
+        html (str | bytes): page contents
+        url (str): URL of the page
+        download_image (bool): whether to download the image or not, default is False
+        queue_timeout (float): seconds the image download waits for the image executor, None rejects it when saturated
+    Returns:
+        dict: dictionary with recipe information
+    """
+    content = html.encode() if isinstance(html, str) else html
+    key = f"{normalize_url(url)}|{hashlib.sha256(content).hexdigest()}|{int(bool(download_image))}"
+
+    cached = recipe_cache.get(key)
+    if cached is None and recipe_disk_cache is not None:
+        cached = recipe_disk_cache.get(key)
+        if cached is not None:
+            recipe_cache.set(key, cached)
+
+    if cached is not None:
+        return json.loads(cached)
+
+    result = get_recipe_from_json_ld(html, url)
+    if result is None:
+        from recipe_scrapers import scrape_html
+
+        scraper = scrape_html(html, url, supported_only=False)
+        result = get_recipe_from_scraper(scraper)
+
+    # when the image could not be downloaded the recipe is not cached so the next request tries again
+    if download_image and not download_result_image(result, queue_timeout):
+        return result
+
+    serialized = json.dumps(result).encode()
+    recipe_cache.set(key, serialized)
+    if recipe_disk_cache is not None:
+        recipe_disk_cache.set(key, serialized)
+
+    return result
+
+def get_recipe_from_json_ld(html: Union[str, bytes], url: str) -> Union[dict, None]:
+    """Parses a recipe from the json-ld structured data of the page without building the DOM of the whole page
+    Args:
+        html (str | bytes): page contents
+        url (str): URL of the page
+    Returns:
+        dict: dictionary with recipe information or None when the structured data is missing or incomplete
+    """
+    from .json_ld import scrape_json_ld
+
+    try:
+        scraper = scrape_json_ld(html, url)
+        result = get_recipe_from_scraper(scraper) if scraper is not None else None
+    except Exception as e:
+        logging.info(f"Could not parse the recipe from structured data, using the whole page. Error: {e}")
+        return None
+
+    if result is None or not (result["title"] and result["ingredients"] and result["steps"]):
+        return None
+
+    return result
+
+def get_recipe_from_scraper(scraper: "AbstractScraper", download_image: bool = False):
     """Parses a recipe from a scraper
     Args:
         scraper (AbstractScraper): scraper object
@@ -204,7 +568,7 @@ def get_recipe_from_scraper(scraper: AbstractScraper, download_image: bool = Fal
     """    
     lang = scraper.language() or "en"
     
-    ingredients = map(lambda x: parse_recipe_ingredient(x, lang, ureg), scraper.ingredients())
+    ingredients = map(get_ingredient_parser().parse, scraper.ingredients())
     instructions = map(lambda x: parse_recipe_instruction(x, lang), scraper.instructions_list())
     yields, yields_description = parse_yields(scraper.yields())
     result = {
@@ -223,10 +587,34 @@ def get_recipe_from_scraper(scraper: AbstractScraper, download_image: bool = Fal
     with suppress(NotImplementedError):
         result["nutrients"] = parse_nutrients(scraper.nutrients())
 
-    result["image"] = get_recipe_image(result["image"]) if download_image else result["image"]
+    if download_image:
+        download_result_image(result)
 
     return result
 
+def download_result_image(result: dict, queue_timeout: Union[float, None] = None) -> bool:
+    """Replaces the image url of a recipe by the downloaded image. The url is still usable by the client
+    so an image that cannot be downloaded or decoded does not fail the whole recipe
+    Args:
+        result (dict): recipe with image url
+        queue_timeout (float): seconds to wait for the image executor, None rejects the call when it is saturated
+    Returns:
+        bool: False when the image could not be downloaded and the url was kept
+    """
+    import requests
+    from PIL import UnidentifiedImageError
+
+    if not result["image"]:
+        return True
+
+    try:
+        result["image"] = get_recipe_image(result["image"], queue_timeout)
+    except (ImageDownloadError, requests.RequestException, UnidentifiedImageError, OSError) as e:
+        logging.warning(f"Could not download recipe image. Error: {e}")
+        return False
+
+    return True
+
 def parse_nutrients(nutrients: dict):
     return {
         "calories": parse_nutrient_value(nutrients.get("calories")),
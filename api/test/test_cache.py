@@ -0,0 +1,101 @@
+import os
+from unittest import mock
+
+from ..functions import cache
+from ..functions.cache import LruCache, DiskCache
+
+def test_cache_get_set():
+    lru = LruCache(max_bytes=100)
+    lru.set("a", b"12345")
+
+    assert lru.get("a") == b"12345"
+    assert lru.get("b") is None
+
+    stats = lru.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 5
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hitRatio"] == 0.5
+
+def test_cache_evicts_least_recently_used():
+    lru = LruCache(max_bytes=10)
+    lru.set("a", b"1234")
+    lru.set("b", b"1234")
+    lru.get("a")
+    lru.set("c", b"1234")
+
+    assert lru.get("a") == b"1234"
+    assert lru.get("b") is None
+    assert lru.get("c") == b"1234"
+    assert lru.stats()["evictions"] == 1
+    assert lru.stats()["bytes"] == 8
+
+def test_cache_skips_values_larger_than_cache():
+    lru = LruCache(max_bytes=3)
+    lru.set("a", b"1234")
+
+    assert lru.get("a") is None
+    assert lru.stats()["bytes"] == 0
+
+def test_cache_replace_updates_size():
+    lru = LruCache(max_bytes=10)
+    lru.set("a", b"1234")
+    lru.set("a", b"12")
+
+    assert lru.get("a") == b"12"
+    assert lru.stats()["bytes"] == 2
+
+def test_cache_expiration():
+    lru = LruCache(max_bytes=10, ttl=60)
+
+    with mock.patch.object(cache, "monotonic", return_value=100):
+        lru.set("a", b"1234")
+
+    with mock.patch.object(cache, "monotonic", return_value=159):
+        assert lru.get("a") == b"1234"
+
+    with mock.patch.object(cache, "monotonic", return_value=160):
+        assert lru.get("a") is None
+        assert lru.get_entry("a").expired
+        assert lru.get_entry("a").value == b"1234"
+
+def test_cache_delete():
+    lru = LruCache(max_bytes=10)
+    lru.set("a", b"1234")
+    lru.delete("a")
+
+    assert lru.get("a") is None
+    assert lru.stats()["bytes"] == 0
+
+def test_disk_cache_get_set(tmp_path):
+    disk = DiskCache(str(tmp_path), max_bytes=100)
+    disk.set("a", b"12345")
+
+    assert disk.get("a") == b"12345"
+    assert disk.get("b") is None
+
+    # a new instance over the same folder sees the previous entries
+    reopened = DiskCache(str(tmp_path), max_bytes=100)
+    assert reopened.get("a") == b"12345"
+    assert reopened.stats()["bytes"] == 5
+
+def test_disk_cache_evicts_oldest(tmp_path):
+    disk = DiskCache(str(tmp_path), max_bytes=10)
+    disk.set("a", b"1234")
+    os.utime(disk._path("a"), (1, 1))
+    disk.set("b", b"1234")
+    disk.set("c", b"1234")
+
+    assert disk.get("a") is None
+    assert disk.get("b") == b"1234"
+    assert disk.get("c") == b"1234"
+    assert disk.stats()["bytes"] == 8
+    assert disk.stats()["evictions"] == 1
+
+def test_disk_cache_expiration(tmp_path):
+    disk = DiskCache(str(tmp_path), max_bytes=10, ttl=60)
+    disk.set("a", b"1234")
+    os.utime(disk._path("a"), (1, 1))
+
+    assert disk.get("a") is None
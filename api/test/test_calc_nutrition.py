@@ -0,0 +1,64 @@
+import json
+import azure.functions as func
+
+from unittest import mock
+
+from ..functions import calc_nutrition
+from ..functions.calc_nutrition import calc_nutrition as calc_nutrition_route
+from ..functions.nutrition import NutritionTable, build_nutrition_data
+
+calc_url = 'api/calc-nutrition'
+
+def setup_module():
+    with open("test/merged_data.json") as file:
+        calc_nutrition.mock_nutrition_table(NutritionTable(*build_nutrition_data(json.load(file))))
+
+def teardown_module():
+    calc_nutrition.mock_nutrition_table(None)
+
+def test_calc_nutrition():
+    request = func.HttpRequest(
+        method='POST',
+        url=calc_url,
+        body=json.dumps([
+            {"quantity": 100, "unit": "gram", "id": "790018"},
+            {"quantity": 1, "unit": "tablespoon", "id": "790508"},
+        ]).encode('utf8')
+    )
+
+    func_call = calc_nutrition_route.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert parsed_response["grams"] == 114.2
+    assert parsed_response["nutrition"]["calories"] == round(363 + 0.142 * 717, 2)
+    assert parsed_response["nutrition"]["protein"] == round(14.3 + 0.142 * 0.85, 2)
+    assert parsed_response["missing"] == []
+
+def test_calc_nutrition_bad_data():
+    request = func.HttpRequest(
+        method='POST',
+        url=calc_url,
+        body=json.dumps([{"quantity": -1, "unit": "gram", "id": "790018"}]).encode('utf8')
+    )
+
+    func_call = calc_nutrition_route.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not calculate nutrition because the data provided is invalid. Please try again."
+
+def test_calc_nutrition_unexpected_error():
+    request = func.HttpRequest(
+        method='POST',
+        url=calc_url,
+        body=json.dumps([{"quantity": 1, "unit": "gram", "id": "790018"}]).encode('utf8')
+    )
+
+    with mock.patch.object(NutritionTable, "calculate", side_effect=RuntimeError("boom")):
+        func_call = calc_nutrition_route.build().get_user_function()
+        response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not calculate nutrition due to an internal issue. Please try again."
@@ -0,0 +1,63 @@
+from ..functions.conversion import DensityTable, build_density_table, convert_ingredients, load_density_table
+from ..functions.util import parse_recipe_ingredients
+
+def test_build_density_table():
+    data = build_density_table([
+        { "description": "All-Purpose Flour", "foodPortions": [{ "gramWeight": "120", "value": 1, "uom": "cup" }] },
+        { "description": "Honey", "foodPortions": [{ "gramWeight": "21 to 22", "value": 1, "uom": "tablespoon" }] },
+        { "description": "Instant yeast", "foodPortions": [{ "gramWeight": "7", "value": 2.25, "uom": "teaspoons" }] },
+        { "description": "Egg", "foodPortions": [{ "gramWeight": "50", "value": 1, "uom": "each" }] },
+    ])
+
+    assert data == { "ingredients": [["All-Purpose Flour", 0.5072], ["Honey", 1.4202], ["Instant yeast", 0.6312]] }
+
+def test_density_table_match():
+    table = DensityTable({ "ingredients": [["Sugar", 0.8369], ["Brown sugar", 0.9003], ["Bread Flour", 0.5072]] })
+
+    assert table.match("2 cups brown sugar") == 0.9003
+    assert table.match("1 cup sugar") == 0.8369
+    assert table.match("3 cups bread flour, sifted") == 0.5072
+    assert table.match("1 cup flour") is None
+    assert table.match("2 cups (250g) bread flour") == 0.5072
+    assert table.match("1 cup sugar or honey") == 0.8369
+
+def test_density_table_match_head_noun():
+    table = DensityTable({ "ingredients": [["Sugar", 0.8369], ["Confectioners' sugar", 0.4776], ["Bread Flour", 0.5072]] })
+
+    assert table.match("1 cup sugar snap peas") is None
+    assert table.match("1 cup bread flour for dusting") == 0.5072
+    assert table.match("1 cup powdered sugar") == 0.4776
+    assert table.match("1 cup confectioners' sugar, sifted") == 0.4776
+
+def test_convert_ingredients():
+    result = convert_ingredients([
+        { "raw": "2 cups bread flour", "quantity": 2, "unit": "cup" },
+        { "raw": "1 lb butter", "quantity": 1, "unit": "pound" },
+        { "raw": "250 ml milk", "quantity": 250, "unit": "milliliter" },
+        { "raw": "1 cup mystery", "quantity": 1, "unit": "cup" },
+        { "raw": "2 eggs", "quantity": 2, "unit": "" },
+    ])
+
+    assert result[0] == { "raw": "2 cups bread flour", "quantity": 2, "unit": "cup", "baseQuantity": 473.18, "baseUnit": "milliliter", "grams": 240 }
+    assert (result[1]["baseQuantity"], result[1]["baseUnit"], result[1]["grams"]) == (453.59, "gram", 453.59)
+    assert (result[2]["baseQuantity"], result[2]["baseUnit"], result[2]["grams"]) == (250, "milliliter", 239.88)
+    assert (result[3]["baseQuantity"], result[3]["grams"]) == (236.59, None)
+    assert (result[4]["baseQuantity"], result[4]["baseUnit"], result[4]["grams"]) == (None, None, None)
+
+def test_convert_ingredients_parsed():
+    result = convert_ingredients(parse_recipe_ingredients("2 fl oz milk\n1 cup powdered sugar"))
+
+    assert (result[0]["baseQuantity"], result[0]["baseUnit"], result[0]["grams"]) == (None, None, None)
+    assert (result[1]["baseQuantity"], result[1]["grams"]) == (236.59, 112.99)
+
+def test_convert_ingredients_common_lines():
+    result = convert_ingredients(parse_recipe_ingredients("2 cups flour\n2 cups bread flour\n1/4 cup canola oil\n1 cup whipping cream\n1 tsp yeast"))
+
+    assert [ingredient["grams"] for ingredient in result] == [240, 240, 49.5, 227.01, 3.11]
+
+def test_convert_ingredients_empty():
+    assert convert_ingredients([]) == []
+
+def test_load_density_table():
+    assert load_density_table() is load_density_table()
+    assert load_density_table().match("1 cup all-purpose flour") == 0.5072
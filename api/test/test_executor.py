@@ -0,0 +1,125 @@
+import os
+import operator
+
+from threading import Event, Thread, Timer
+
+from ..functions.executor import ImageExecutor, ExecutorSaturatedError, busy_response
+from ..functions.util import transform_image
+
+def test_executor_inline():
+    executor = ImageExecutor(max_workers=0, max_queue=0)
+
+    assert executor.run(operator.add, 2, 3) == 5
+
+    stats = executor.stats()
+    assert stats["completed"] == 1
+    assert stats["rejected"] == 0
+    assert stats["executionMax"] >= stats["executionAvg"] >= 0
+
+def test_executor_process_pool():
+    executor = ImageExecutor(max_workers=1, max_queue=1)
+    try:
+        assert executor.run(operator.mul, 6, 7) == 42
+        assert executor.run(operator.mul, 2, 3) == 6
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["queueWaitMax"] >= 0
+
+def exit_worker():
+    os._exit(1)
+
+def test_executor_replaces_broken_process_pool():
+    executor = ImageExecutor(max_workers=1, max_queue=1)
+    try:
+        try:
+            executor.run(exit_worker)
+            assert False, "the pool should be broken"
+        except ExecutorSaturatedError as e:
+            assert e.retry_after >= 1
+
+        assert executor.run(operator.mul, 6, 7) == 42
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["restarted"] == 1
+    assert stats["completed"] == 1
+    assert stats["active"] == 0
+
+def test_executor_process_pool_image_transform():
+    image = open("test/test_image.jpeg", "rb").read()
+    executor = ImageExecutor(max_workers=1, max_queue=0)
+    try:
+        result, mime = executor.run(transform_image, "test_image.jpeg", image, True, "image/jpeg")
+    finally:
+        executor.shutdown()
+
+    assert mime == "image/jpeg"
+    assert result.startswith(b"\xff\xd8")
+    assert result == transform_image("test_image.jpeg", image, True, "image/jpeg")[0]
+
+def test_executor_saturated_waits_with_timeout():
+    executor = ImageExecutor(max_workers=0, max_queue=0)
+    started = Event()
+    release = Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    worker = Thread(target=executor.run, args=(block,))
+    worker.start()
+    started.wait(5)
+    try:
+        try:
+            executor.run(operator.add, 1, 1, timeout=0.01)
+            assert False, "the executor should still be saturated"
+        except ExecutorSaturatedError:
+            pass
+
+        assert executor.stats()["active"] == 1
+
+        # internal callers wait for the slot instead of being rejected
+        Timer(0.1, release.set).start()
+        assert executor.run(operator.add, 1, 1, timeout=5) == 2
+    finally:
+        release.set()
+        worker.join()
+
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["active"] == 0
+
+def test_executor_saturated():
+    executor = ImageExecutor(max_workers=0, max_queue=0)
+    started = Event()
+    release = Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    worker = Thread(target=executor.run, args=(block,))
+    worker.start()
+    started.wait(5)
+    try:
+        executor.run(operator.add, 1, 1)
+        assert False, "the executor should be saturated"
+    except ExecutorSaturatedError as e:
+        assert e.retry_after >= 1
+    finally:
+        release.set()
+        worker.join()
+
+    assert executor.stats()["rejected"] == 1
+    assert executor.run(operator.add, 1, 1) == 2
+
+def test_busy_response():
+    response = busy_response(ExecutorSaturatedError(3))
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
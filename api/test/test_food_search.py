@@ -0,0 +1,48 @@
+import json
+
+from ..functions.food_search import FoodSearchIndex, build_search_index, load_search_index, search_index_available, tokenize, write_search_index
+
+def read_foods() -> list:
+    with open("test/merged_data.json") as file:
+        return json.load(file)
+
+def test_tokenize():
+    assert tokenize("Eggs, Grade A, Large, egg whole") == ["egg", "grade", "large", "whole"]
+    assert tokenize("Tomatoes, cherries and swiss chard") == ["tomato", "cherry", "and", "swiss", "chard"]
+    assert tokenize("2% milk") == ["2", "milk"]
+
+def test_build_search_index():
+    index = build_search_index(read_foods())
+
+    assert index["ids"][1] == "790018"
+    assert index["tokens"]["flour"] == [0, 1]
+    assert index["trigrams"]["$eg"] == [2]
+
+def test_search():
+    index = FoodSearchIndex(build_search_index(read_foods()))
+
+    bread_flour = index.search("bread flour")
+    assert bread_flour[0]["id"] == "790018"
+    assert bread_flour[1]["id"] == "789890"
+    assert bread_flour[0]["score"] > bread_flour[1]["score"]
+
+    assert index.search("eggs", 1) == [{ "id": "748967", "description": "Eggs, Grade A, Large, egg whole", "score": index.search("egg", 1)[0]["score"] }]
+    assert index.search("unsalted butter")[0]["id"] == "790508"
+
+    # typos still find the food through trigrams
+    assert index.search("buter")[0]["id"] == "790508"
+    assert index.search("xyz") == []
+    assert index.search("") == []
+
+def test_search_many(tmp_path):
+    assert not search_index_available(str(tmp_path))
+    write_search_index(build_search_index(read_foods()), str(tmp_path))
+    assert search_index_available(str(tmp_path))
+    index = load_search_index(str(tmp_path))
+
+    assert index is load_search_index(str(tmp_path))
+
+    result = index.search_many(["table salt", "sugar", "Table Salt"], 2)
+
+    assert [items[0]["id"] for items in result] == ["746775", "746784", "746775"]
+    assert result[0] is result[2]
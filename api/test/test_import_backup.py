@@ -0,0 +1,138 @@
+import io
+import json
+import base64
+
+from unittest import mock
+from zipfile import ZipFile
+
+from ..functions import import_backup as import_backup_module
+from ..functions.import_backup import import_backup
+
+def build_request(name: str, contents: bytes, accept: str = None):
+    mock_request = mock.MagicMock()
+    mock_request.method='POST'
+    mock_request.url='api/import-backup'
+    mock_request.headers = { "Accept": accept } if accept else {}
+    files_mock = mock.MagicMock()
+    files_mock.values.return_value = [type('',(object,),{"filename": name,"stream": io.BytesIO(contents),"content_type": "application/zip"})()]
+    type(mock_request).files = mock.PropertyMock(return_value=files_mock)
+
+    return mock_request
+
+def read_image():
+    with open("test/test_image.jpeg", "rb") as file:
+        return file.read()
+
+def test_import_backup_zip():
+    backup = {
+        "version": 2,
+        "categories": [{"id": 1, "name": "Bread"}],
+        "recipes": [
+            {"title": "Bread", "categoryId": 1, "ingredients": [{"raw": "500 grams flour"}, "10 grams salt"], "steps": ["Bake for 45 minutes"],
+             "media": [{"type": "img", "url": "images/bread.jpeg"}, {"type": "img", "url": "https://example.com/bread.jpeg"}]},
+            {"title": "Water", "ingredients": ["1 cup water"], "steps": [],
+             "image": "data:image/jpeg;base64," + base64.b64encode(read_image()).decode()},
+        ]
+    }
+
+    archive = io.BytesIO()
+    with ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("backup.json", json.dumps(backup))
+        zip_file.writestr("images/bread.jpeg", read_image())
+
+    func_call = import_backup.build().get_user_function()
+    response = func_call(build_request("backup.zip", archive.getvalue()))
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+
+    assert parsed_response["categories"] == [{"id": 1, "name": "Bread"}]
+    assert len(parsed_response["recipes"]) == 2
+
+    bread = parsed_response["recipes"][0]
+    assert bread["title"] == "Bread"
+    assert bread["categoryId"] == 1
+    assert bread["ingredients"] == [
+        {"raw": "500 grams flour", "quantity": 500, "unit": "gram"},
+        {"raw": "10 grams salt", "quantity": 10, "unit": "gram"},
+    ]
+    assert bread["steps"] == [{"raw": "Bake for 45 minutes", "minutes": 45}]
+    assert bread["media"][0]["url"].startswith("data:image/jpeg;base64,/9j/")
+    assert bread["media"][1] == {"type": "img", "url": "https://example.com/bread.jpeg"}
+
+    water = parsed_response["recipes"][1]
+    assert "image" not in water
+    assert water["media"][0]["type"] == "img"
+    assert water["media"][0]["url"].startswith("data:image/jpeg;base64,/9j/")
+
+def test_import_backup_json_v1_ndjson():
+    backup = [
+        {"title": "Bread", "ingredients": ["500 grams flour"], "steps": ["Mix"]},
+        {"title": "Broken", "ingredients": [], "steps": [], "media": [{"type": "img", "url": "data:image/jpeg;base64,bm90IGFuIGltYWdl"}]},
+    ]
+
+    func_call = import_backup.build().get_user_function()
+    response = func_call(build_request("backup.json", json.dumps(backup).encode(), "application/x-ndjson"))
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_body().decode().splitlines()]
+
+    assert lines[0] == {"categories": []}
+    recipes = { line["index"]: line["recipe"] for line in lines[1:] }
+    assert recipes[0]["ingredients"] == [{"raw": "500 grams flour", "quantity": 500, "unit": "gram"}]
+    # images that cannot be decoded are kept as they were
+    assert recipes[1]["media"] == backup[1]["media"]
+
+def test_import_backup_invalid():
+    func_call = import_backup.build().get_user_function()
+    response = func_call(build_request("backup.json", b'{"title": "not a backup"}'))
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not import the backup because the file provided is invalid. Please try again."
+
+def test_import_backup_invalid_recipes():
+    func_call = import_backup.build().get_user_function()
+
+    for backup in ([1, 2], [{"title": "Bread", "ingredients": "500 grams flour", "steps": []}], [{"title": "Bread", "ingredients": [], "steps": "Mix"}]):
+        response = func_call(build_request("backup.json", json.dumps(backup).encode()))
+
+        assert response.status_code == 400
+        assert response.get_body().decode() == "Could not import the backup because the file provided is invalid. Please try again."
+
+def test_import_backup_skips_null_items():
+    backup = {"recipes": [{"title": "Bread", "ingredients": [None, "500 grams flour"], "steps": [None]}]}
+
+    func_call = import_backup.build().get_user_function()
+    response = func_call(build_request("backup.json", json.dumps(backup).encode()))
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert "version" not in parsed_response
+    assert parsed_response["recipes"][0]["ingredients"] == [{"raw": "500 grams flour", "quantity": 500, "unit": "gram"}]
+    assert parsed_response["recipes"][0]["steps"] == []
+
+def test_import_backup_member_limits():
+    backup = {"recipes": [{"title": "Bread", "ingredients": ["500 grams flour"], "steps": ["Mix"]}]}
+    image = read_image()
+
+    archive = io.BytesIO()
+    with ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("backup.json", json.dumps(backup))
+        zip_file.writestr("images/bread.jpeg", image)
+
+    func_call = import_backup.build().get_user_function()
+
+    # images over the limit are skipped
+    with mock.patch.object(import_backup_module, "MAX_BACKUP_MEMBER_BYTES", len(image) - 1):
+        response = func_call(build_request("backup.zip", archive.getvalue()))
+
+    assert response.status_code == 200
+    assert json.loads(response.get_body().decode())["recipes"][0]["title"] == "Bread"
+
+    # a recipe document over the limit fails the import instead of returning no recipes
+    with mock.patch.object(import_backup_module, "MAX_BACKUP_MEMBER_BYTES", 10):
+        response = func_call(build_request("backup.zip", archive.getvalue()))
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not import the backup because the file provided is invalid. Please try again."
@@ -0,0 +1,50 @@
+from pint import UnitRegistry
+from unittest import mock
+
+from ..functions.ingredient_parser import IngredientParser, get_ingredient_parser
+
+ureg = UnitRegistry()
+
+def test_parser_all_vulgar_fractions():
+    parser = IngredientParser(ureg)
+
+    assert parser.parse("⅛ teaspoon salt") == { "raw": "1/8 teaspoon salt", "quantity": 0.12, "unit": "teaspoon" }
+    assert parser.parse("⅔ cup milk") == { "raw": "2/3 cup milk", "quantity": 0.67, "unit": "cup" }
+    assert parser.parse("1 ⅝ cups flour") == { "raw": "1 5/8 cups flour", "quantity": 1.62, "unit": "cup" }
+
+def test_parser_matches_registry_lookups():
+    parser = IngredientParser(ureg)
+
+    for token in ["cups", "tbsp", "grams", "eggs", "ggg", "lbs", "pinch", "Tbsp"]:
+        expected = ureg.get_name(token) if token in ureg else ""
+        assert parser.lookup_unit(token) == expected
+
+def test_parser_uncommon_units_are_looked_up_once():
+    parser = IngredientParser()
+
+    with mock.patch.object(parser, "_lookup_unit_in_registry", wraps=parser._lookup_unit_in_registry) as registry_lookup:
+        assert parser.parse("2 furlongs of rope")["unit"] == "furlong"
+        assert parser.parse("2 µg of salt")["unit"] == "microgram"
+        assert parser.parse("3 µg of salt")["unit"] == "microgram"
+
+    assert registry_lookup.call_count == 1
+    assert parser.lookup_unit.cache_info().hits == 1
+
+def test_parser_unit_table_matches_registry():
+    parser = IngredientParser()
+    tokens = list(ureg._units) + [prefix + unit for prefix in ["k", "m", "kilo", "milli", "c", "d", "centi", "deci"] for unit in ["g", "gram", "l", "liter", "cup", "degC", "s", "second"]]
+    tokens += [token + "s" for token in tokens] + ["large", "eggs", "flour", "pinch", "Tbsp", "dimensionless", "x", "Cups", "ggg"]
+
+    for token in tokens:
+        if not token.isalpha():
+            continue
+
+        expected = parser.units.lookup(token)
+        if expected is None:
+            continue
+
+        assert expected == (ureg.get_name(token) if token in ureg else ""), token
+
+def test_get_ingredient_parser_reuses_parser():
+    assert get_ingredient_parser(ureg) is get_ingredient_parser(ureg)
+    assert get_ingredient_parser() is get_ingredient_parser(None)
@@ -0,0 +1,40 @@
+from recipe_scrapers import SCRAPERS
+
+from ..functions.json_ld import is_schema_backed, reduce_page, scrape_json_ld
+
+test_url = "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+
+def test_reduce_page():
+    html = open("test/test_recipe.html", "rb").read()
+
+    reduced = reduce_page(html)
+
+    assert len(reduced) < len(html) / 20
+    assert reduced.startswith(b'<html lang="en"><head>')
+    assert b'name="og:image"' in reduced
+    assert b"application/ld+json" in reduced
+    assert reduce_page(html.decode()) == reduced.decode()
+
+def test_reduce_page_without_recipe():
+    assert reduce_page("<html><head><script type=\"application/ld+json\">{\"@type\": \"WebSite\"}</script></head></html>") is None
+    assert reduce_page(b"<html><body><h1>Pork chops</h1></body></html>") is None
+
+def test_is_schema_backed():
+    assert is_schema_backed(SCRAPERS["food.com"])
+    assert not is_schema_backed(next(scraper for scraper in SCRAPERS.values() if "ingredients" in vars(scraper)))
+
+def test_scrape_json_ld():
+    html = open("test/test_recipe.html", "r").read()
+
+    scraper = scrape_json_ld(html, test_url)
+
+    assert scraper.title() == "Pork Chops With Golden Applesauce"
+    assert scraper.language() == "en"
+    assert len(scraper.ingredients()) == 12
+
+def test_scrape_json_ld_needs_whole_page():
+    html = open("test/test_recipe.html", "r").read()
+    host = next(host for host, scraper in SCRAPERS.items() if "ingredients" in vars(scraper))
+
+    assert scrape_json_ld(html, f"https://{host}/recipe/1") is None
+    assert scrape_json_ld("<html><body></body></html>", test_url) is None
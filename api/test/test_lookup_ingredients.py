@@ -0,0 +1,54 @@
+import json
+import azure.functions as func
+
+from unittest import mock
+
+from ..functions import lookup_ingredients
+from ..functions.lookup_ingredients import lookup_ingredients as lookup_ingredients_route
+from ..functions.food_search import FoodSearchIndex, build_search_index
+
+lookup_url = 'api/lookup-ingredients'
+
+def setup_module():
+    with open("test/merged_data.json") as file:
+        lookup_ingredients.mock_search_index(FoodSearchIndex(build_search_index(json.load(file))))
+
+def teardown_module():
+    lookup_ingredients.mock_search_index(None)
+
+def test_lookup_ingredients():
+    request = func.HttpRequest(
+        method='POST',
+        url=lookup_url,
+        params={"limit": "1"},
+        body=json.dumps(["bread flour", "eggs", "xyz"]).encode('utf8')
+    )
+
+    func_call = lookup_ingredients_route.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert [item["name"] for item in parsed_response] == ["bread flour", "eggs", "xyz"]
+    assert [[food["id"] for food in item["items"]] for item in parsed_response] == [["790018"], ["748967"], []]
+    assert parsed_response[0]["items"][0]["description"] == "Flour, bread, white, enriched, unbleached"
+
+def test_lookup_ingredients_bad_data():
+    func_call = lookup_ingredients_route.build().get_user_function()
+
+    for params, body in [({}, {"name": "eggs"}), ({"limit": "100"}, ["eggs"]), ({"limit": "many"}, ["eggs"]), ({}, ["eggs"] * 201)]:
+        request = func.HttpRequest(method='POST', url=lookup_url, params=params, body=json.dumps(body).encode('utf8'))
+        response = func_call(request)
+
+        assert response.status_code == 400
+        assert response.get_body().decode() == "Could not lookup ingredients because the data provided is invalid. Please try again."
+
+def test_lookup_ingredients_unexpected_error():
+    request = func.HttpRequest(method='POST', url=lookup_url, body=json.dumps(["eggs"]).encode('utf8'))
+
+    with mock.patch.object(FoodSearchIndex, "search_many", side_effect=RuntimeError("boom")):
+        func_call = lookup_ingredients_route.build().get_user_function()
+        response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not lookup ingredients due to an internal issue. Please try again."
@@ -0,0 +1,122 @@
+import os
+import base64
+
+from unittest import mock
+
+from ..functions.media_store import BlobMediaStore, LocalMediaStore, get_shared_media_store, offload_media, resolve_media
+
+image_uri = "data:image/jpeg;base64," + base64.b64encode(b"jpeg bytes").decode()
+
+def test_local_media_store_round_trip(tmp_path):
+    store = LocalMediaStore(str(tmp_path))
+
+    digest = store.put(b"jpeg bytes", "image/jpeg")
+
+    assert store.put(b"jpeg bytes", "image/jpeg") == digest
+    assert len(os.listdir(tmp_path)) == 1
+    assert store.get(digest) == (b"jpeg bytes", "image/jpeg")
+    assert store.get("0" * 64) is None
+    assert store.get("../" + digest) is None
+
+def test_shared_media_store_is_created_on_first_use(tmp_path):
+    get_shared_media_store.cache_clear()
+    try:
+        with mock.patch.dict(os.environ, { "MEDIA_STORE_DIR": str(tmp_path / "media") }):
+            store = get_shared_media_store()
+
+        assert isinstance(store, LocalMediaStore)
+        assert get_shared_media_store() is store
+    finally:
+        get_shared_media_store.cache_clear()
+
+def test_local_media_store_prune(tmp_path):
+    store = LocalMediaStore(str(tmp_path), ttl=60)
+    old = store.put(b"old", "image/png")
+    os.utime(os.path.join(tmp_path, old), (0, 0))
+    new = store.put(b"new", "image/png")
+
+    store.prune()
+
+    assert store.get(old) is None
+    assert store.get(new) == (b"new", "image/png")
+
+def test_offload_and_resolve_media(tmp_path):
+    store = LocalMediaStore(str(tmp_path))
+    media = [{"type": "img", "url": image_uri}, {"type": "img", "url": "https://example.com/bread.jpg"}]
+
+    offloaded = offload_media(media, store)
+
+    assert offloaded[0] == {"type": "img", "hash": store.put(b"jpeg bytes", "image/jpeg"), "mime": "image/jpeg", "url": None}
+    assert offloaded[1] == media[1]
+    assert resolve_media(offloaded, store) == media
+
+def test_offload_media_without_store():
+    media = [{"type": "img", "url": image_uri}]
+
+    assert offload_media(media, None) is media
+
+def test_resolve_media_prefers_public_url():
+    store = mock.MagicMock()
+
+    resolved = resolve_media([{"type": "img", "hash": "a" * 64, "mime": "image/jpeg", "url": "https://blob/" + "a" * 64}], store)
+
+    assert resolved == [{"type": "img", "url": "https://blob/" + "a" * 64}]
+    assert store.get.call_count == 0
+
+def test_resolve_media_keeps_missing_content(tmp_path):
+    store = LocalMediaStore(str(tmp_path))
+    media = [{"type": "img", "hash": "a" * 64, "mime": "image/jpeg", "url": None}]
+
+    assert resolve_media(media, store) == media
+    assert resolve_media(media, None) == media
+
+def create_blob_store(public: bool = False):
+    with mock.patch("azure.storage.blob.BlobServiceClient.from_connection_string") as from_connection_string:
+        store = BlobMediaStore("UseDevelopmentStorage=true", "share-media", public)
+
+    from_connection_string.return_value.get_container_client.assert_called_once_with("share-media")
+
+    return store
+
+def test_blob_media_store_round_trip():
+    from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+    store = create_blob_store()
+    container = store.container
+
+    digest = store.put(b"jpeg bytes", "image/jpeg")
+
+    name, content = container.upload_blob.call_args.args
+    assert (name, content) == (digest, b"jpeg bytes")
+    assert container.upload_blob.call_args.kwargs["overwrite"] is False
+    assert container.upload_blob.call_args.kwargs["content_settings"].content_type == "image/jpeg"
+
+    # the same content is already stored under its hash
+    container.upload_blob.side_effect = ResourceExistsError("exists")
+    assert store.put(b"jpeg bytes", "image/jpeg") == digest
+
+    download = container.download_blob.return_value
+    download.readall.return_value = b"jpeg bytes"
+    download.properties.content_settings.content_type = "image/jpeg"
+    assert store.get(digest) == (b"jpeg bytes", "image/jpeg")
+    container.download_blob.assert_called_once_with(digest)
+
+    container.download_blob.side_effect = ResourceNotFoundError("missing")
+    assert store.get(digest) is None
+    assert store.get("../" + digest) is None
+    assert store.url(digest) is None
+
+def test_blob_media_store_public_url():
+    store = create_blob_store(public=True)
+    store.container.url = "https://account.blob.core.windows.net/share-media"
+
+    assert store.url("a" * 64) == "https://account.blob.core.windows.net/share-media/" + "a" * 64
+
+def test_shared_media_store_uses_blob_storage():
+    get_shared_media_store.cache_clear()
+    try:
+        with mock.patch.dict(os.environ, { "MEDIA_BLOB_CONNECTION_STRING": "UseDevelopmentStorage=true" }):
+            with mock.patch("azure.storage.blob.BlobServiceClient.from_connection_string"):
+                assert isinstance(get_shared_media_store(), BlobMediaStore)
+    finally:
+        get_shared_media_store.cache_clear()
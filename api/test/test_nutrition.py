@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+
+from ..functions.nutrition import NUTRIENTS, build_nutrition_data, load_nutrition_table, nutrition_data_available, write_nutrition_data
+
+def read_foods() -> list:
+    with open("test/merged_data.json") as file:
+        return json.load(file)
+
+def test_build_nutrition_data():
+    matrix, index = build_nutrition_data(read_foods())
+
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (8, len(NUTRIENTS))
+    assert index["ids"][0] == "789890"
+    assert [nutrient["name"] for nutrient in index["nutrients"]] == list(NUTRIENTS.values())
+    assert index["nutrients"][0]["uom"] == "kcal"
+
+    # amounts are stored per gram
+    assert matrix[0, 0] == np.float32(3.64)
+
+    # king arthur weights replace the usda ones for the same unit
+    assert index["portions"][0]["cup"] == 120
+    assert index["portions"][6]["cup"] == 226
+    assert index["portions"][6]["tablespoon"] == 14.2
+    assert index["portions"][2]["large"] == 50.3
+    assert index["portions"][2]["each"] == 50
+
+def test_load_and_calculate(tmp_path):
+    assert not nutrition_data_available(str(tmp_path))
+    write_nutrition_data(*build_nutrition_data(read_foods()), str(tmp_path))
+    assert nutrition_data_available(str(tmp_path))
+    table = load_nutrition_table(str(tmp_path))
+
+    assert isinstance(table.matrix, np.memmap)
+    assert table is load_nutrition_table(str(tmp_path))
+
+    result = table.calculate([
+        { "id": "789890", "quantity": 500, "unit": "gram" },
+        { "id": "746775", "quantity": 0.01, "unit": "kilogram" },
+        { "id": "748967", "quantity": 2, "unit": "each" },
+        { "id": "746782", "quantity": 1, "unit": "cups" },
+        { "id": "746782", "quantity": 1, "unit": "pinch" },
+        { "id": "unknown", "quantity": 1, "unit": "gram" },
+    ])
+
+    assert result["grams"] == 837
+    assert result["nutrition"]["calories"] == round(5 * 364 + 148 + 2.27 * 61, 2)
+    assert result["nutrition"]["sodium"] == round(5 * 2 + 0.1 * 38758 + 129 + 2.27 * 38, 2)
+    assert result["missing"] == [
+        { "id": "746782", "quantity": 1, "unit": "pinch" },
+        { "id": "unknown", "quantity": 1, "unit": "gram" },
+    ]
+
+def test_calculate_nothing(tmp_path):
+    write_nutrition_data(*build_nutrition_data(read_foods()), str(tmp_path))
+
+    result = load_nutrition_table(str(tmp_path)).calculate([])
+
+    assert result["grams"] == 0
+    assert result["nutrition"]["calories"] == 0
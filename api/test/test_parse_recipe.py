@@ -1,6 +1,9 @@
 import json
 import azure.functions as func
 
+from unittest import mock
+
+from ..functions import parse_recipe as parse_recipe_module
 from ..functions.parse_recipe import parse_recipe, set_mock_recipe_html
 
 # parse recipe post method
@@ -88,3 +91,37 @@ def test_recipe_parse_exception():
     assert response.status_code == 400
     parsed_response = response.get_body().decode()
     assert parsed_response == r'Could not find a recipe in the web page'
+
+def test_recipe_parse_download_image_multipart():
+    request = func.HttpRequest(
+        method='POST',
+        url='api/parse-recipe',
+        headers={"Accept": "multipart/mixed"},
+        body=json.dumps({
+            'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781',
+            "downloadImage": True
+        }).encode('utf8')
+    )
+
+    mock_recipe_html = open("test/test_recipe.html", "r").read()
+    set_mock_recipe_html(mock_recipe_html)
+
+    with mock.patch.object(parse_recipe_module, "download_recipe_image", return_value=(b"\xff\xd8image", "image/jpeg")) as download:
+        func_call = parse_recipe.build().get_user_function()
+        response = func_call(request)
+
+    assert response.status_code == 200
+    assert download.call_args.args[0].startswith("http")
+
+    content_type = response.headers["Content-Type"]
+    assert content_type.startswith("multipart/mixed; boundary=")
+    boundary = content_type.split("boundary=")[1].encode()
+
+    parts = response.get_body().split(b"--" + boundary)
+    assert len(parts) == 4
+    assert b"Content-Type: application/json" in parts[1]
+    recipe = json.loads(parts[1].split(b"\r\n\r\n", 1)[1])
+    assert recipe["title"] == "Pork Chops With Golden Applesauce"
+    assert b"Content-Type: image/jpeg" in parts[2]
+    assert parts[2].split(b"\r\n\r\n", 1)[1] == b"\xff\xd8image\r\n"
+    assert parts[3] == b"--\r\n"
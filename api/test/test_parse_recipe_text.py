@@ -0,0 +1,67 @@
+import json
+import azure.functions as func
+
+from ..functions.parse_recipe_text import parse_recipe_text
+
+parse_url = 'api/parse-recipe-text'
+
+def test_recipe_text_parse():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps([
+            {"id": "1", "ingredients": "500 grams flour\n\n10 grams salt", "steps": "Mix everything\nRest for 1 hour"},
+            {"id": "2", "ingredients": "1 cup water\n10 grams salt", "steps": "Bake for 45 minutes"},
+            {"id": "3"},
+        ]).encode('utf8')
+    )
+
+    func_call = parse_recipe_text.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert len(parsed_response) == 3
+
+    assert parsed_response[0]["id"] == "1"
+    assert parsed_response[0]["ingredients"] == [
+        {"raw": "500 grams flour", "quantity": 500, "unit": "gram"},
+        {"raw": "10 grams salt", "quantity": 10, "unit": "gram"},
+    ]
+    assert parsed_response[0]["steps"] == [
+        {"raw": "Mix everything", "minutes": 0},
+        {"raw": "Rest for 1 hour", "minutes": 60},
+    ]
+
+    assert parsed_response[1]["id"] == "2"
+    assert parsed_response[1]["ingredients"][0] == {"raw": "1 cup water", "quantity": 1, "unit": "cup"}
+    assert parsed_response[1]["ingredients"][1] == {"raw": "10 grams salt", "quantity": 10, "unit": "gram"}
+    assert parsed_response[1]["steps"] == [{"raw": "Bake for 45 minutes", "minutes": 45}]
+
+    assert parsed_response[2] == {"id": "3", "ingredients": [], "steps": []}
+
+def test_recipe_text_parse_bad_data():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps({"ingredients": "1 cup water"}).encode('utf8')
+    )
+
+    func_call = parse_recipe_text.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not parse recipes because the data provided is invalid. Please try again."
+
+def test_recipe_text_parse_too_many():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps([{"id": str(index), "ingredients": "1 cup water"} for index in range(501)]).encode('utf8')
+    )
+
+    func_call = parse_recipe_text.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not parse recipes because the data provided is invalid. Please try again."
@@ -0,0 +1,152 @@
+import json
+import threading
+import azure.functions as func
+
+from unittest import mock
+
+from ..functions import parse_recipes as parse_recipes_module
+from ..functions.parse_recipes import parse_recipes, set_mock_recipe_html
+
+parse_url = 'api/parse-recipes'
+
+def test_recipes_parse():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps([
+            {'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781'},
+            {'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150782', 'downloadImage': False},
+        ]).encode('utf8')
+    )
+
+    mock_recipe_html = open("test/test_recipe.html", "r").read()
+    set_mock_recipe_html(mock_recipe_html)
+
+    func_call = parse_recipes.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert len(parsed_response) == 2
+    assert parsed_response[0]["url"] == "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+    assert parsed_response[0]["recipe"]["title"] == "Pork Chops With Golden Applesauce"
+    assert len(parsed_response[0]["recipe"]["ingredients"]) == 12
+    assert parsed_response[1]["url"] == "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150782"
+    assert parsed_response[1]["recipe"]["steps"][0]["minutes"] == 20
+
+def test_recipes_parse_partial_failure():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps([
+            {'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781'},
+            {'url': 'https://www.foodnk.com/recipes/rachael-ray/pork-chops-with-golden-apple-sauce-recipe-1915826'},
+        ]).encode('utf8')
+    )
+
+    set_mock_recipe_html(None)
+
+    def fake_fetch_html(url: str):
+        if "foodnk" in url:
+            raise Exception("Test")
+        return open("test/test_recipe.html", "rb").read()
+
+    with mock.patch.object(parse_recipes_module, "fetch_html", side_effect=fake_fetch_html):
+        func_call = parse_recipes.build().get_user_function()
+        response = func_call(request)
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert parsed_response[0]["recipe"]["title"] == "Pork Chops With Golden Applesauce"
+    assert "error" not in parsed_response[0]
+    assert parsed_response[1]["error"] == "Could not find a recipe in the web page"
+    assert "recipe" not in parsed_response[1]
+
+def test_recipes_parse_ndjson():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        headers={"Accept": "application/x-ndjson"},
+        body=json.dumps([
+            {'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781'},
+            {'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150782'},
+        ]).encode('utf8')
+    )
+
+    mock_recipe_html = open("test/test_recipe.html", "r").read()
+    set_mock_recipe_html(mock_recipe_html)
+
+    func_call = parse_recipes.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_body().decode().splitlines()]
+    assert len(lines) == 2
+    assert sorted(line["url"] for line in lines) == [
+        "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781",
+        "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150782",
+    ]
+    assert all(line["recipe"]["title"] == "Pork Chops With Golden Applesauce" for line in lines)
+    assert sorted(line["index"] for line in lines) == [0, 1]
+    assert all(line["url"].endswith(str(150781 + line["index"])) for line in lines)
+
+def test_recipes_parse_timeout():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps([
+            {'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781'},
+            {'url': 'https://www.slow.com/recipe/1'},
+        ]).encode('utf8')
+    )
+
+    set_mock_recipe_html(None)
+    release = threading.Event()
+
+    def fake_fetch_html(url: str):
+        if "slow" in url:
+            release.wait(5)
+        return open("test/test_recipe.html", "rb").read()
+
+    try:
+        with mock.patch.object(parse_recipes_module, "fetch_html", side_effect=fake_fetch_html), \
+             mock.patch.object(parse_recipes_module, "BATCH_TIMEOUT", 0.5):
+            func_call = parse_recipes.build().get_user_function()
+            response = func_call(request)
+    finally:
+        release.set()
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert parsed_response[0]["recipe"]["title"] == "Pork Chops With Golden Applesauce"
+    assert parsed_response[1] == {"url": "https://www.slow.com/recipe/1", "error": "Timed out waiting for the web page"}
+
+def test_recipes_parse_unexpected_error():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps([{'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781'}]).encode('utf8')
+    )
+
+    with mock.patch.object(parse_recipes_module.executor, "submit", side_effect=RuntimeError("shut down")):
+        func_call = parse_recipes.build().get_user_function()
+        response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not parse recipes due to an internal issue. Please try again."
+
+def test_recipes_parse_bad_data():
+    request = func.HttpRequest(
+        method='POST',
+        url=parse_url,
+        body=json.dumps({
+            'url': 'https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781',
+        }).encode('utf8')
+    )
+
+    func_call = parse_recipes.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not parse recipes because the data provided is invalid. Please try again."
@@ -1,13 +1,17 @@
+import io
 import json
 
 from unittest import mock;
 
+from ..functions.executor import ExecutorSaturatedError
 from ..functions.process_image import process_image
+from ..functions.util import image_cache
 
 def test_process_image():
     mock_request = mock.MagicMock()
     mock_request.method='POST'
     mock_request.url='api/process-image'
+    mock_request.form = {}
     files_mock = mock.MagicMock()
     files_mock.values.return_value = [type('',(object,),{"filename": "test_image.jpeg","stream": open("test/test_image.jpeg", "rb"),"content_type": "image/jpeg"})()]
     type(mock_request).files = mock.PropertyMock(return_value=files_mock)
@@ -25,6 +29,7 @@ def test_process_image_bad_mime():
     mock_request = mock.MagicMock()
     mock_request.method='POST'
     mock_request.url='api/process-image'
+    mock_request.form = {}
     files_mock = mock.MagicMock()
     files_mock.values.return_value = [type('',(object,),{"filename": "test_image.jpeg","stream": open("test/test_image.jpeg", "rb"),"content_type": "application/jpeg"})()]
     type(mock_request).files = mock.PropertyMock(return_value=files_mock)
@@ -42,6 +47,7 @@ def test_process_image_no_file():
     mock_request = mock.MagicMock()
     mock_request.method='POST'
     mock_request.url='api/process-image'
+    mock_request.form = {}
     
     func_call = process_image.build().get_user_function()
     response = func_call(mock_request)
@@ -49,4 +55,116 @@ def test_process_image_no_file():
     assert response.status_code == 400
     parsed_response = response.get_body().decode()
     
-    assert parsed_response == "A single file is required to process"
\ No newline at end of file
+    assert parsed_response == "A single file is required to process"
+
+
+def test_process_image_binary():
+    mock_request = mock.MagicMock()
+    mock_request.method='POST'
+    mock_request.url='api/process-image'
+    mock_request.form = {}
+    mock_request.headers = {"Accept": "image/*"}
+    files_mock = mock.MagicMock()
+    files_mock.values.return_value = [type('',(object,),{"filename": "test_image.jpeg","stream": open("test/test_image.jpeg", "rb"),"content_type": "image/jpeg"})()]
+    type(mock_request).files = mock.PropertyMock(return_value=files_mock)
+
+    func_call = process_image.build().get_user_function()
+    response = func_call(mock_request)
+
+    assert response.status_code == 200
+    assert response.mimetype == "image/jpeg"
+    assert response.headers["Content-Disposition"] == 'inline; filename="test_image.jpeg"'
+    assert response.get_body().startswith(b"\xff\xd8")
+
+def test_process_image_prefers_json():
+    mock_request = mock.MagicMock()
+    mock_request.method='POST'
+    mock_request.url='api/process-image'
+    mock_request.form = {}
+    mock_request.headers = {"Accept": "application/json, image/*;q=0.5"}
+    files_mock = mock.MagicMock()
+    files_mock.values.return_value = [type('',(object,),{"filename": "test_image.jpeg","stream": open("test/test_image.jpeg", "rb"),"content_type": "image/jpeg"})()]
+    type(mock_request).files = mock.PropertyMock(return_value=files_mock)
+
+    func_call = process_image.build().get_user_function()
+    response = func_call(mock_request)
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert parsed_response["image"].startswith("data:image/jpeg;base64,")
+
+def large_image_request(variants: list, accept: str = "application/json"):
+    from PIL import Image
+
+    buffered = io.BytesIO()
+    Image.new("RGB", (2048, 1536), (200, 100, 50)).save(buffered, format="JPEG")
+    buffered.seek(0)
+
+    mock_request = mock.MagicMock()
+    mock_request.method='POST'
+    mock_request.url='api/process-image'
+    mock_request.form = {"variants": json.dumps(variants)}
+    mock_request.headers = {"Accept": accept}
+    files_mock = mock.MagicMock()
+    files_mock.values.return_value = [type('',(object,),{"filename": "large.jpeg","stream": buffered,"content_type": "image/jpeg"})()]
+    type(mock_request).files = mock.PropertyMock(return_value=files_mock)
+
+    return mock_request
+
+def test_process_image_variants():
+    mock_request = large_image_request([
+        {"size": 256, "format": "webp", "quality": 70},
+        {"size": 1024, "format": "jpeg"},
+        {"size": 512, "format": "png"},
+    ])
+
+    func_call = process_image.build().get_user_function()
+    response = func_call(mock_request)
+
+    assert response.status_code == 200
+    parsed_response = json.loads(response.get_body().decode())
+    assert parsed_response["name"] == "large.jpeg"
+    variants = parsed_response["variants"]
+    assert [(variant["size"], variant["format"]) for variant in variants] == [(256, "webp"), (1024, "jpeg"), (512, "png")]
+    assert variants[0]["quality"] == 70
+    assert variants[0]["image"].startswith("data:image/webp;base64,")
+    assert variants[1]["image"].startswith("data:image/jpeg;base64,")
+    assert variants[2]["image"].startswith("data:image/png;base64,")
+
+def test_process_image_variants_multipart():
+    mock_request = large_image_request([{"size": 256, "format": "jpeg"}, {"size": 512, "format": "jpeg"}], "multipart/mixed")
+
+    func_call = process_image.build().get_user_function()
+    response = func_call(mock_request)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("multipart/mixed; boundary=")
+    body = response.get_body()
+    assert b'name="256.jpeg"' in body
+    assert b'name="512.jpeg"' in body
+
+def test_process_image_variants_invalid():
+    mock_request = large_image_request([{"size": 256, "format": "gif"}])
+
+    func_call = process_image.build().get_user_function()
+    response = func_call(mock_request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "The image variants requested are invalid"
+
+def test_process_image_busy():
+    mock_request = mock.MagicMock()
+    mock_request.method='POST'
+    mock_request.url='api/process-image'
+    mock_request.form = {}
+    files_mock = mock.MagicMock()
+    files_mock.values.return_value = [type('',(object,),{"filename": "test_image.jpeg","stream": open("test/test_image.jpeg", "rb"),"content_type": "image/jpeg"})()]
+    type(mock_request).files = mock.PropertyMock(return_value=files_mock)
+
+    image_cache.clear()
+    with mock.patch("api.functions.process_image.image_executor.run", side_effect=ExecutorSaturatedError(2)):
+        func_call = process_image.build().get_user_function()
+        response = func_call(mock_request)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,47 @@
+import io
+import base64
+
+import qrcode
+import qrcode.image.svg
+
+from ..functions.qr import encode, render_qr_code, to_bitmap
+
+def legacy_svg(data: str) -> str:
+    qr = qrcode.QRCode(image_factory=qrcode.image.svg.SvgPathImage)
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    return qr.make_image().to_string(encoding='unicode')
+
+def test_render_qr_code_svg_matches_qrcode():
+    for code in ["ABC123", "ZZZZZZ", "000000", "Q1W2E3"]:
+        assert render_qr_code(code) == legacy_svg(code)
+
+def test_render_qr_code_svg_falls_back_for_long_data():
+    data = "https://example.com/" + "a" * 60
+
+    assert render_qr_code(data) == legacy_svg(data)
+    assert len(encode(data)) > 21
+
+def test_render_qr_code_bitmap():
+    modules = encode("ABC123")
+    bitmap = base64.b64decode(render_qr_code("ABC123", "bitmap"))
+
+    assert len(modules) == 21
+    assert len(bitmap) == 21 * 3
+    assert bitmap == to_bitmap(modules)
+
+    first_row = int.from_bytes(bitmap[:3], "big") >> 3
+    assert [(first_row >> (20 - index)) & 1 == 1 for index in range(21)] == modules[0]
+
+def test_render_qr_code_png():
+    from PIL import Image
+
+    uri = render_qr_code("ABC123", "png")
+    assert uri.startswith("data:image/png;base64,")
+
+    image = Image.open(io.BytesIO(base64.b64decode(uri.split(",")[1])))
+    assert image.size == (29 * 4, 29 * 4)
+    # quiet zone is white and the top left finder pattern is black
+    assert image.getpixel((0, 0)) != 0
+    assert image.getpixel((4 * 4, 4 * 4)) == 0
@@ -4,7 +4,7 @@ from azure.cosmos import exceptions
 
 from unittest import mock;
 
-from ..functions.receive_recipe import receive_recipe, mock_repository
+from ..functions.receive_recipe import receive_recipe, receive_recipes, mock_repository
 
 receive_url = 'api/receive-recipe'
 
@@ -85,4 +85,77 @@ def test_receive_recipe_exception():
     
     assert response.status_code == 400
 
-    assert response.get_body().decode() == "Could not receive the recipe due to an internal issue. Please try again."
\ No newline at end of file
+    assert response.get_body().decode() == "Could not receive the recipe due to an internal issue. Please try again."
+
+def test_receive_recipes_success():
+    request = func.HttpRequest(
+        method='POST',
+        url='api/receive-recipes',
+        body=json.dumps({
+            "codes": ["123456", "654321", "123456", "AAAAAA"]
+        }).encode('utf8')
+    )
+
+    repository = mock.MagicMock()
+    repository.read_items.return_value = {
+        "654321": {"id": "654321", "title": "second", "ingredients": [], "steps": [], "_ts": 1, "_etag": "etag"},
+        "123456": {"id": "123456", "title": "first", "ingredients": ["1 cup of flour"], "steps": ["bake it"], "ttl": 3600},
+    }
+
+    mock_repository(repository)
+
+    func_call = receive_recipes.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 200
+    assert repository.read_items.call_args.args[0] == ["123456", "654321", "AAAAAA"]
+
+    parsed_response = json.loads(response.get_body().decode())
+    assert [item["id"] for item in parsed_response["items"]] == ["123456", "654321"]
+    assert parsed_response["items"][1] == {
+        "id": "654321", "title": "second", "notes": None, "ingredients": [], "steps": [], "source": None, "media": None
+    }
+    assert parsed_response["missing"] == ["AAAAAA"]
+
+def test_receive_recipes_bad_data():
+    request = func.HttpRequest(
+        method='POST',
+        url='api/receive-recipes',
+        body=json.dumps({
+            "codes": []
+        }).encode('utf8')
+    )
+
+    mock_repository(mock.MagicMock())
+
+    func_call = receive_recipes.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not receive the recipes because the data provided is invalid. Please try again."
+
+def test_receive_recipe_collection():
+    request = func.HttpRequest(
+        method='POST',
+        url=receive_url,
+        body=json.dumps({
+            "code": "COLLEC"
+        }).encode('utf8')
+    )
+
+    repository = mock.MagicMock()
+    repository.read_item.return_value = {"id": "COLLEC", "collection": ["123456", "654321"], "ttl": 3600}
+    repository.read_items.return_value = {"123456": {"id": "123456", "title": "first", "_etag": "etag"}}
+
+    mock_repository(repository)
+
+    func_call = receive_recipe.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 200
+    assert repository.read_items.call_args.args[0] == ["123456", "654321"]
+
+    parsed_response = json.loads(response.get_body().decode())
+    assert parsed_response["id"] == "COLLEC"
+    assert [item["title"] for item in parsed_response["items"]] == ["first"]
+    assert parsed_response["missing"] == ["654321"]
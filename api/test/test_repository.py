@@ -0,0 +1,198 @@
+import os
+import pytest
+
+from azure.cosmos import exceptions
+from time import monotonic, time
+from unittest import mock
+
+from ..functions.repository import Repository, LocalRepository, OperationMetrics, create_repository
+
+cosmos_settings = { "COSMOS_ENDPOINT": "https://localhost:8081", "COSMOS_KEY": "a2V5", "COSMOS_PREFERRED_REGIONS": "East US, West US" }
+
+def test_repository_not_configured():
+    with mock.patch.dict(os.environ):
+        os.environ.pop("COSMOS_ENDPOINT", None)
+
+        repository = Repository()
+        repository.connect()
+
+    assert not repository.connected
+
+def test_repository_creates_a_single_client():
+    with mock.patch.dict(os.environ, cosmos_settings), mock.patch("azure.cosmos.CosmosClient") as client:
+        repository = Repository()
+        repository.connect()
+        repository.connect()
+
+    assert repository.connected
+    assert client.call_count == 1
+    assert client.call_args.kwargs["preferred_locations"] == ["East US", "West US"]
+    assert client.call_args.kwargs["transport"] is not None
+
+def test_repository_records_latency_and_request_charge():
+    def read_item(id, partition_key, response_hook):
+        response_hook({ "x-ms-request-charge": "1.5" }, {})
+        return { "id": id }
+
+    repository = Repository()
+    repository.container = mock.MagicMock()
+    repository.container.read_item.side_effect = read_item
+
+    assert repository.read_item("123456") == { "id": "123456" }
+    assert repository.read_item("654321") == { "id": "654321" }
+
+    stats = repository.stats()["read_item"]
+    assert stats["count"] == 2
+    assert stats["requestCharge"] == 3.0
+    assert stats["maxMs"] >= stats["p50Ms"] >= 0
+
+def test_repository_warm_up_reads_container():
+    with mock.patch.dict(os.environ, cosmos_settings), mock.patch("azure.cosmos.CosmosClient") as client:
+        repository = Repository()
+        repository.warm_up()
+
+    container = client.return_value.get_database_client.return_value.get_container_client.return_value
+    assert container.read.call_count == 1
+
+def test_operation_metrics_percentiles():
+    metrics = OperationMetrics()
+    for elapsed in range(1, 101):
+        metrics.record(elapsed / 1000, 1)
+
+    stats = metrics.stats()
+    assert stats["p50Ms"] == 51
+    assert stats["p95Ms"] == 96
+    assert stats["maxMs"] == 100
+
+def test_repository_read_item_is_cached_until_it_expires():
+    repository = Repository()
+    repository.container = mock.MagicMock()
+    repository.container.read_item.return_value = { "id": "123456", "ttl": 3600, "_ts": time() - 3000 }
+
+    assert repository.read_item("123456")["id"] == "123456"
+    assert repository.read_item("123456")["id"] == "123456"
+    assert repository.container.read_item.call_count == 1
+
+    entry = repository.cache.get_entry("123456")
+    assert 590 < entry.expires_at - monotonic() <= 600
+
+def test_repository_does_not_cache_expired_items():
+    repository = Repository()
+    repository.container = mock.MagicMock()
+    repository.container.read_item.return_value = { "id": "123456", "ttl": 3600, "_ts": time() - 4000 }
+
+    repository.read_item("123456")
+    repository.read_item("123456")
+
+    assert repository.container.read_item.call_count == 2
+
+def test_repository_does_not_cache_items_about_to_expire():
+    repository = Repository()
+    repository.container = mock.MagicMock()
+    repository.container.read_item.return_value = { "id": "AAAAAA", "ttl": 0 }
+
+    repository.read_item("AAAAAA")
+    assert repository.cache.get_entry("AAAAAA") is None
+
+    repository.container.read_item.return_value = { "id": "BBBBBB" }
+    repository.read_item("BBBBBB")
+    entry = repository.cache.get_entry("BBBBBB")
+    assert 3590 < entry.expires_at - monotonic() <= 3600
+
+def test_repository_caches_not_found_until_created():
+    repository = Repository()
+    repository.container = mock.MagicMock()
+    repository.container.read_item.side_effect = exceptions.CosmosResourceNotFoundError(404)
+
+    for _ in range(2):
+        with pytest.raises(exceptions.CosmosResourceNotFoundError):
+            repository.read_item("123456")
+
+    assert repository.container.read_item.call_count == 1
+
+    repository.create_item({ "id": "123456", "ttl": 3600 })
+    repository.container.read_item.side_effect = None
+    repository.container.read_item.return_value = { "id": "123456", "ttl": 3600 }
+
+    assert repository.read_item("123456")["id"] == "123456"
+    assert repository.container.read_item.call_count == 2
+
+def test_repository_read_items_uses_cache_and_a_single_read():
+    items = mock.MagicMock()
+    items.__iter__.return_value = [{ "id": "BBBBBB", "ttl": 3600 }]
+    items.get_response_headers.return_value = { "x-ms-request-charge": "2.5" }
+
+    repository = Repository()
+    repository.container = mock.MagicMock()
+    repository.container.read_item.return_value = { "id": "AAAAAA", "ttl": 3600 }
+    repository.container.read_items.return_value = items
+
+    repository.read_item("AAAAAA")
+    result = repository.read_items(["AAAAAA", "BBBBBB", "CCCCCC", "BBBBBB"])
+
+    assert set(result) == { "AAAAAA", "BBBBBB" }
+    assert repository.container.read_items.call_args.args[0] == [("BBBBBB", "BBBBBB"), ("CCCCCC", "CCCCCC")]
+    assert repository.stats()["read_items"]["requestCharge"] == 2.5
+
+    # found and missing codes are both cached now
+    assert set(repository.read_items(["BBBBBB", "CCCCCC"])) == { "BBBBBB" }
+    assert repository.container.read_items.call_count == 1
+
+def test_repository_create_items():
+    repository = Repository()
+    repository.container = mock.MagicMock()
+    repository.container.create_item.side_effect = lambda item, response_hook: item
+
+    items = [{ "id": str(index) } for index in range(20)]
+
+    assert repository.create_items(items) == items
+    assert repository.container.create_item.call_count == 20
+    assert repository.stats()["create_item"]["count"] == 20
+
+def test_local_repository(tmp_path):
+    with mock.patch.dict(os.environ, { "LOCAL_REPOSITORY_PATH": str(tmp_path / "items.db") }):
+        repository = LocalRepository()
+        repository.connect()
+
+    assert repository.connected
+
+    created = repository.create_item({ "id": "AAAAAA", "title": "bread", "ttl": 3600 })
+    assert created["_ts"] > 0
+
+    with pytest.raises(exceptions.CosmosResourceExistsError):
+        repository.create_item({ "id": "AAAAAA", "title": "bread", "ttl": 3600 })
+
+    repository.cache.clear()
+    assert repository.read_item("AAAAAA")["title"] == "bread"
+    assert set(repository.read_items(["AAAAAA", "BBBBBB"])) == { "AAAAAA" }
+
+    with pytest.raises(exceptions.CosmosResourceNotFoundError):
+        repository.read_item("CCCCCC")
+
+    stats = repository.stats()
+    assert stats["create_item"]["requestCharge"] == 5.5
+    assert stats["read_item"]["requestCharge"] == 2
+
+def test_local_repository_expires_items(tmp_path):
+    with mock.patch.dict(os.environ, { "LOCAL_REPOSITORY_PATH": str(tmp_path / "items.db") }):
+        repository = LocalRepository()
+        repository.connect()
+
+    repository.create_item({ "id": "AAAAAA", "ttl": 0 })
+    repository.cache.clear()
+
+    with pytest.raises(exceptions.CosmosResourceNotFoundError):
+        repository.read_item("AAAAAA")
+
+    # the expired id can be taken again
+    repository.create_item({ "id": "AAAAAA", "ttl": 3600 })
+
+def test_create_repository():
+    with mock.patch.dict(os.environ, { "REPOSITORY_BACKEND": "local" }):
+        assert isinstance(create_repository(), LocalRepository)
+
+    with mock.patch.dict(os.environ, { "REPOSITORY_BACKEND": "cosmos" }):
+        assert type(create_repository()) is Repository
+
+    with mock.patch.dict(os.environ, { "REPOSITORY_BACKEND": "sqlserver" }), pytest.raises(ValueError):
+        create_repository()
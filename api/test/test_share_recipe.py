@@ -1,9 +1,12 @@
 import json
+import base64
 import azure.functions as func
 
 from unittest import mock;
 
-from ..functions.share_recipe import share_recipe, mock_repository
+from ..functions.share_recipe import share_recipe, share_recipes, mock_repository, mock_media_store
+from ..functions.receive_recipe import receive_recipe, mock_repository as mock_receive_repository, mock_media_store as mock_receive_media_store
+from ..functions.media_store import LocalMediaStore
 
 share_url = 'api/share-recipe'
 
@@ -87,4 +90,130 @@ def test_share_recipe_internal_error():
     response = func_call(request)
     
     assert response.status_code == 400
-    assert response.get_body().decode() == "Could share the recipe due to an internal issue. Please try again."
\ No newline at end of file
+    assert response.get_body().decode() == "Could share the recipe due to an internal issue. Please try again."
+
+def test_share_recipes_success():
+    recipes = [{"title": str(index), "ingredients": ["1 cup of flour"], "steps": ["bake it"]} for index in range(3)]
+    request = func.HttpRequest(
+        method='POST',
+        url='api/share-recipes',
+        body=json.dumps(recipes).encode('utf8')
+    )
+
+    repository = mock.MagicMock()
+    mock_repository(repository)
+
+    func_call = share_recipes.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 202
+    parsed_response = json.loads(response.get_body().decode())
+
+    items = repository.create_items.call_args.args[0]
+    assert [item["title"] for item in items] == ["0", "1", "2"]
+    assert all(item["ttl"] == 3600 for item in items)
+
+    collection = repository.create_item.call_args.args[0]
+    assert collection["id"] == parsed_response["id"]
+    assert collection["collection"] == [item["id"] for item in items]
+    assert parsed_response["recipes"] == collection["collection"]
+    assert parsed_response["qr_code"].startswith("<svg")
+    assert parsed_response["ttl"] == 3600
+
+def test_share_recipes_bad_data():
+    request = func.HttpRequest(
+        method='POST',
+        url='api/share-recipes',
+        body=json.dumps([{"title": "1", "ingredients": ["1 cup of flour"], "steps": ["bake it"]}, {"title": "2"}]).encode('utf8')
+    )
+
+    repository = mock.MagicMock()
+    mock_repository(repository)
+
+    func_call = share_recipes.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 400
+    assert response.get_body().decode() == "Could not share recipes because the data provided is invalid. Please try again."
+    assert repository.create_items.call_count == 0
+
+def test_share_recipe_bitmap_qr_code():
+    request = func.HttpRequest(
+        method='POST',
+        url=share_url,
+        params={"qrFormat": "bitmap"},
+        body=json.dumps({
+            "title": "1",
+            "ingredients": ["1 cup of flour"],
+            "steps": ["bake it"]
+        }).encode('utf8')
+    )
+
+    mock_repository(mock.MagicMock())
+
+    func_call = share_recipe.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 202
+    parsed_response = json.loads(response.get_body().decode())
+    assert len(base64.b64decode(parsed_response["qr_code"])) == 21 * 3
+
+def test_share_recipe_unknown_qr_format():
+    request = func.HttpRequest(
+        method='POST',
+        url=share_url,
+        params={"qrFormat": "gif"},
+        body=json.dumps({
+            "title": "1",
+            "ingredients": ["1 cup of flour"],
+            "steps": ["bake it"]
+        }).encode('utf8')
+    )
+
+    repository = mock.MagicMock()
+    mock_repository(repository)
+
+    func_call = share_recipe.build().get_user_function()
+    response = func_call(request)
+
+    assert response.status_code == 400
+    assert repository.create_item.call_count == 0
+
+def test_share_recipe_offloads_media(tmp_path):
+    image = "data:image/jpeg;base64," + base64.b64encode(b"jpeg bytes").decode()
+    request = func.HttpRequest(
+        method='POST',
+        url=share_url,
+        body=json.dumps({
+            "title": "1",
+            "ingredients": ["1 cup of flour"],
+            "steps": ["bake it"],
+            "media": [{"type": "img", "url": image}]
+        }).encode('utf8')
+    )
+
+    store = LocalMediaStore(str(tmp_path))
+    repository = mock.MagicMock()
+    mock_repository(repository)
+    mock_media_store(store)
+    try:
+        response = share_recipe.build().get_user_function()(request)
+    finally:
+        mock_media_store(None)
+
+    assert response.status_code == 202
+    item = repository.create_item.call_args.args[0]
+    assert "base64" not in json.dumps(item)
+    assert item["media"][0]["mime"] == "image/jpeg"
+
+    repository.read_item.return_value = item
+    mock_receive_repository(repository)
+    mock_receive_media_store(store)
+    try:
+        response = receive_recipe.build().get_user_function()(func.HttpRequest(
+            method='POST', url='api/receive-recipe', body=json.dumps({"code": item["id"]}).encode('utf8')))
+    finally:
+        mock_receive_media_store(None)
+
+    assert response.status_code == 200
+    assert json.loads(response.get_body().decode())["media"] == [{"type": "img", "url": image}]
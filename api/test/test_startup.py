@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import logging
+import subprocess
+
+from unittest import mock
+
+from ..functions.startup import profile_imports
+
+api_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_function_app_import_is_lazy():
+    script = "import sys, function_app; print(','.join(m for m in ('pint', 'PIL', 'recipe_scrapers', 'qrcode', 'azure.cosmos', 'azure.storage', 'requests', 'numpy') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=api_folder, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
+
+def registered_routes(environment: dict) -> list:
+    script = "import function_app; print(','.join(sorted(f.get_function_name() for f in function_app.app.get_functions())))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=api_folder, capture_output=True, text=True, check=True,
+                            env={ **os.environ, **environment })
+
+    return result.stdout.strip().split(",")
+
+def test_function_app_registers_nutrition_with_data(tmp_path):
+    from ..functions.nutrition import build_nutrition_data, write_nutrition_data
+    from ..functions.food_search import build_search_index, write_search_index
+
+    routes = registered_routes({ "NUTRITION_DATA_DIR": str(tmp_path) })
+    assert "calc_nutrition" not in routes
+    assert "lookup_ingredients" not in routes
+
+    with open(os.path.join(api_folder, "test", "merged_data.json")) as file:
+        foods = json.load(file)
+    write_nutrition_data(*build_nutrition_data(foods), str(tmp_path))
+    write_search_index(build_search_index(foods), str(tmp_path))
+
+    routes = registered_routes({ "NUTRITION_DATA_DIR": str(tmp_path) })
+    assert "calc_nutrition" in routes
+    assert "lookup_ingredients" in routes
+
+def test_profile_imports_disabled():
+    with mock.patch.dict(os.environ, {"IMPORT_PROFILE": ""}):
+        with profile_imports() as profiler:
+            pass
+
+    assert profiler is None
+
+def test_profile_imports_records_timings(caplog):
+    sys.modules.pop("colorsys", None)
+
+    with mock.patch.dict(os.environ, {"IMPORT_PROFILE": "1", "IMPORT_BUDGET_MS": "0.000001"}):
+        with caplog.at_level(logging.INFO):
+            with profile_imports() as profiler:
+                import colorsys
+
+    assert "colorsys" in profiler.timings
+    assert profiler.timings["colorsys"]["cumulative"] >= profiler.timings["colorsys"]["self"]
+    assert any("colorsys" in line for line in profiler.report())
+    assert any("over the budget" in record.message for record in caplog.records)
@@ -0,0 +1,64 @@
+import json
+
+from pint import UnitRegistry
+
+from ..functions.units import UNIT_TABLE_PATH, UnitTable, build_unit_table, load_unit_table, unit_key
+
+def test_unit_table_is_up_to_date():
+    # fails when pint is upgraded, run python -m functions.units from the api folder to regenerate the table
+    with open(UNIT_TABLE_PATH) as file:
+        assert json.load(file) == build_unit_table(UnitRegistry())
+
+def test_unit_table_lookup():
+    table = load_unit_table()
+
+    assert table.lookup("cups") == "cup"
+    assert table.lookup("tbsp") == "tablespoon"
+    assert table.lookup("kg") == "kilogram"
+    assert table.lookup("milliliters") == "milliliter"
+    assert table.lookup("eggs") == ""
+    assert table.lookup("µg") is None
+    assert table.lookup("m2") is None
+
+def test_unit_table_factor():
+    table = load_unit_table()
+    ureg = UnitRegistry()
+
+    for unit, base in [("cup", "milliliter"), ("tablespoon", "milliliter"), ("milliliter", "milliliter"), ("deciliter", "milliliter"),
+                       ("fluid_ounce", "milliliter"), ("gram", "gram"), ("kilogram", "gram"), ("milligram", "gram"), ("pound", "gram")]:
+        dimension, factor = table.factor(unit)
+
+        assert { "milliliter": "volume", "gram": "mass" }[base] == dimension
+        assert abs(factor - ureg.Quantity(1, unit).to(base).magnitude) < 1e-9
+
+    assert table.factor("meter") is None
+    assert table.factor("") is None
+    # fl oz is read as femtoliter, prefixes below milli are not used by recipes
+    assert table.factor("femtoliter") is None
+    assert table.factor("nanogram") is None
+
+def test_unit_key():
+    assert unit_key("tbsp") == "tablespoon"
+    assert unit_key("Cups") == "cup"
+    assert unit_key("Each") == "each"
+
+def test_unit_table_regenerated_for_other_pint_version(tmp_path):
+    path = str(tmp_path / "unit_table.json")
+    with open(path, "w") as file:
+        json.dump({ "pint_version": "0.0.1", "units": {}, "prefixes": [], "suffixes": [], "non_multiplicative": [] }, file)
+
+    table = load_unit_table(path)
+
+    assert table.lookup("cups") == "cup"
+    with open(path) as file:
+        assert json.load(file)["pint_version"] == table.pint_version != "0.0.1"
+
+def test_unit_table_created_when_missing(tmp_path):
+    path = str(tmp_path / "data" / "unit_table.json")
+
+    table = load_unit_table(path)
+
+    assert isinstance(table, UnitTable)
+    assert table.lookup("grams") == "gram"
+    with open(path) as file:
+        assert json.load(file)["units"]["g"] == "gram"
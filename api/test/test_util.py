@@ -1,6 +1,17 @@
 from ..functions.util import parse_recipe_ingredient, parse_recipe_ingredients, parse_recipe_instruction
 from ..functions.util import parse_recipe_instructions, replace_unicode_fractions, parse_image
+from ..functions.util import fetch_html, normalize_url, html_cache, get_recipe_from_html, recipe_cache
+from ..functions.util import parse_recipe_texts, open_image_reduced, negotiate, build_multipart
+from ..functions.util import transform_image_variants, download_recipe_image, ImageDownloadError
+from ..functions.util import image_cache, transform_image_cached, transform_image_variants_cached
+from ..functions.util import get_recipe_from_json_ld, get_recipe_from_scraper
+from ..functions.ingredient_parser import get_ingredient_parser
+from ..functions import util
 from pint import UnitRegistry
+import recipe_scrapers
+from unittest import mock
+import io
+import pytest
 
 test_url = "/recipe/parse"
 
@@ -113,3 +124,276 @@ def test_parse_image_avif():
     avif_file = open("test/test_image.avif", "rb")
     result = parse_image("test_image.avif", avif_file.read(), True)
     assert result.startswith("data:image/avif;base64,AAAAIGZ0eXBhdmlmAAAAAGF2aWZtaWY")
+
+# html fetch cache
+def fetch_response(status_code: int, content: bytes = b"", headers: dict = {}):
+    response = mock.MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers
+    return response
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://WWW.Food.com:443/recipe/1?b=2&a=1#reviews") == "https://www.food.com/recipe/1?a=1&b=2"
+    assert normalize_url("http://food.com") == "http://food.com/"
+
+def test_fetch_html_cache_hit():
+    html_cache.clear()
+
+    with mock.patch("requests.get", return_value=fetch_response(200, b"<html></html>")) as get:
+        assert fetch_html("https://www.food.com/recipe/1") == b"<html></html>"
+        assert fetch_html("https://WWW.FOOD.COM/recipe/1#top") == b"<html></html>"
+
+    assert get.call_count == 1
+    assert html_cache.stats()["hits"] == 1
+    assert html_cache.stats()["misses"] == 1
+    assert get.call_args.kwargs["timeout"] == util.HTML_FETCH_TIMEOUT
+
+def test_fetch_html_revalidates_expired_entry():
+    html_cache.clear()
+    headers = {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+    with mock.patch("requests.get", return_value=fetch_response(200, b"<html></html>", headers)):
+        fetch_html("https://www.food.com/recipe/2")
+
+    html_cache.set(normalize_url("https://www.food.com/recipe/2"), html_cache.get_entry(normalize_url("https://www.food.com/recipe/2")).value, ttl=0)
+
+    with mock.patch("requests.get", return_value=fetch_response(304)) as get:
+        assert fetch_html("https://www.food.com/recipe/2") == b"<html></html>"
+
+    sent_headers = get.call_args.kwargs["headers"]
+    assert sent_headers["If-None-Match"] == '"v1"'
+    assert sent_headers["If-Modified-Since"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert html_cache.stats()["revalidations"] == 1
+    assert html_cache.get_entry(normalize_url("https://www.food.com/recipe/2")).expired is False
+
+def test_fetch_html_does_not_cache_errors():
+    html_cache.clear()
+
+    with mock.patch("requests.get", return_value=fetch_response(404, b"not found")) as get:
+        fetch_html("https://www.food.com/recipe/3")
+        fetch_html("https://www.food.com/recipe/3")
+
+    assert get.call_count == 2
+    assert html_cache.stats()["entries"] == 0
+
+# parsed recipe cache
+def test_get_recipe_from_html_cache():
+    recipe_cache.clear()
+    html = open("test/test_recipe.html", "rb").read()
+    url = "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+
+    with mock.patch("recipe_scrapers.scrape_html", wraps=recipe_scrapers.scrape_html) as scrape:
+        first = get_recipe_from_html(html, url)
+        second = get_recipe_from_html(html, url)
+        different_html = get_recipe_from_html(html + b" ", url)
+
+    assert scrape.call_count == 2
+    assert first == second
+    assert first["title"] == "Pork Chops With Golden Applesauce"
+    assert different_html == first
+    assert recipe_cache.stats()["hits"] == 1
+
+def test_get_recipe_from_html_cache_keeps_image_variant_separate():
+    recipe_cache.clear()
+    html = open("test/test_recipe.html", "rb").read()
+    url = "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+
+    with mock.patch.object(util, "get_recipe_image", return_value="data:image/jpeg;base64,AAAA") as get_image:
+        without_image = get_recipe_from_html(html, url)
+        with_image = get_recipe_from_html(html, url, True)
+        with_image_again = get_recipe_from_html(html, url, True)
+
+    assert get_image.call_count == 1
+    assert without_image["image"].startswith("http")
+    assert with_image["image"] == "data:image/jpeg;base64,AAAA"
+    assert with_image_again["image"] == "data:image/jpeg;base64,AAAA"
+
+# structured data fast path
+def test_get_recipe_from_json_ld_matches_scraper():
+    html = open("test/test_recipe.html", "rb").read()
+    url = "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+
+    expected = get_recipe_from_scraper(recipe_scrapers.scrape_html(html, url, supported_only=False))
+
+    assert get_recipe_from_json_ld(html, url) == expected
+
+def test_get_recipe_from_html_falls_back_when_fields_are_missing():
+    recipe_cache.clear()
+    html = open("test/test_recipe.html", "r").read()
+    url = "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+    # without ingredients in the structured data the recipe comes from the whole page
+    without_ingredients = html.replace('"recipeIngredient"', '"otherIngredient"')
+
+    assert get_recipe_from_json_ld(without_ingredients, url) is None
+
+    with mock.patch("recipe_scrapers.scrape_html", wraps=recipe_scrapers.scrape_html) as scrape:
+        result = get_recipe_from_html(without_ingredients, url)
+
+    assert scrape.call_count == 2
+    assert scrape.call_args.args[0] == without_ingredients
+    assert result["title"] == "Pork Chops With Golden Applesauce"
+
+def test_parse_recipe_texts_parses_each_line_once():
+    parser = get_ingredient_parser()
+
+    with mock.patch.object(parser, "parse", wraps=parser.parse) as parse:
+        parsed = parse_recipe_texts([
+            {"id": 1, "ingredients": "10 grams salt\n1 cup water", "steps": "Bake for 45 minutes"},
+            {"id": 2, "ingredients": "10 grams salt", "steps": "Bake for 45 minutes"},
+        ])
+
+    assert parse.call_count == 2
+    assert parsed[0]["ingredients"][0] == parsed[1]["ingredients"][0]
+    assert parsed[1]["steps"] == [{"raw": "Bake for 45 minutes", "minutes": 45}]
+
+def test_open_image_reduced_jpeg_uses_decoder_downscale():
+    from PIL import Image, JpegImagePlugin
+
+    buffered = io.BytesIO()
+    Image.new("RGB", (4096, 3072), (200, 100, 50)).save(buffered, format="JPEG")
+
+    with mock.patch.object(JpegImagePlugin.JpegImageFile, "draft", autospec=True, side_effect=JpegImagePlugin.JpegImageFile.draft) as draft:
+        result = open_image_reduced(buffered.getvalue(), (1024, 1024))
+
+    assert result.size == (1024, 768)
+    assert draft.call_args_list[0].args[1:] == (None, (1024, 1024))
+
+def test_open_image_reduced_keeps_small_images():
+    result = open_image_reduced(open("test/test_image.jpeg", "rb").read(), (1024, 1024))
+
+    assert result.size == (27, 27)
+
+# content negotiation
+def test_negotiate():
+    offered = ["application/json", "image/jpeg", "application/octet-stream"]
+
+    assert negotiate(None, offered) == "application/json"
+    assert negotiate("*/*", offered) == "application/json"
+    assert negotiate("image/*", offered) == "image/jpeg"
+    assert negotiate("application/octet-stream", offered) == "application/octet-stream"
+    assert negotiate("application/json;q=0.5, image/jpeg", offered) == "image/jpeg"
+    assert negotiate("text/html", offered) == "application/json"
+
+def test_build_multipart():
+    body, content_type = build_multipart([("recipe", "application/json", b"{}"), ("image", "image/png", b"png")])
+    boundary = content_type.split("boundary=")[1]
+
+    assert content_type.startswith("multipart/mixed; boundary=")
+    assert body == (f"--{boundary}\r\nContent-Type: application/json\r\nContent-Disposition: inline; name=\"recipe\"\r\n\r\n{{}}\r\n"
+                    f"--{boundary}\r\nContent-Type: image/png\r\nContent-Disposition: inline; name=\"image\"\r\n\r\npng\r\n"
+                    f"--{boundary}--\r\n").encode()
+
+def test_transform_image_variants_sizes():
+    from PIL import Image
+
+    buffered = io.BytesIO()
+    Image.new("RGBA", (2000, 1000), (200, 100, 50, 128)).save(buffered, format="PNG")
+
+    results = transform_image_variants(buffered.getvalue(), [
+        {"size": 100, "format": "jpeg", "quality": 50},
+        {"size": 800, "format": "png"},
+        {"size": 100, "format": "webp"},
+    ])
+
+    sizes = [Image.open(io.BytesIO(image)).size for _, image, _ in results]
+    assert sizes == [(100, 50), (800, 400), (100, 50)]
+    assert [mime for _, _, mime in results] == ["image/jpeg", "image/png", "image/webp"]
+
+def test_transform_image_cached_skips_repeated_images():
+    from PIL import Image
+
+    buffered = io.BytesIO()
+    Image.new("RGB", (200, 100), (200, 100, 50)).save(buffered, format="PNG")
+    content = buffered.getvalue()
+    image_cache.clear()
+
+    with mock.patch.object(util.image_executor, "run", wraps=util.image_executor.run) as run:
+        first = transform_image_cached("first.png", content)
+        second = transform_image_cached("second.png", content)
+        transform_image_cached("first.png", content, False)
+        transform_image_variants_cached(content, [{"size": 50, "format": "webp"}])
+        transform_image_variants_cached(content, [{"format": "webp", "size": 50}])
+
+    assert first == second
+    assert run.call_count == 3
+
+    stats = image_cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    assert stats["bytesSaved"] == 2 * len(content)
+
+# recipe image download
+def image_response(content: bytes, headers: dict):
+    response = mock.MagicMock()
+    response.__enter__.return_value = response
+    response.headers = headers
+    response.url = "https://img.food.com/pic.jpg"
+    response.iter_content.return_value = [content[i:i + 100] for i in range(0, len(content), 100)]
+    return response
+
+def large_jpeg() -> bytes:
+    from PIL import Image
+
+    buffered = io.BytesIO()
+    Image.new("RGB", (2048, 1024), (200, 100, 50)).save(buffered, format="JPEG")
+    return buffered.getvalue()
+
+def test_download_recipe_image_reduces_image():
+    from PIL import Image
+
+    content = large_jpeg()
+
+    with mock.patch("requests.get", return_value=image_response(content, {"Content-Type": "image/jpeg", "Content-Length": str(len(content))})) as get:
+        image, mime = download_recipe_image("https://img.food.com/pic.jpg")
+
+    assert get.call_args.kwargs["stream"] is True
+    assert mime == "image/jpeg"
+    assert Image.open(io.BytesIO(image)).size == (1024, 512)
+
+def test_download_recipe_image_rejects_declared_size():
+    response = image_response(b"", {"Content-Type": "image/jpeg", "Content-Length": "999999"})
+
+    with mock.patch("requests.get", return_value=response):
+        with pytest.raises(ImageDownloadError):
+            download_recipe_image("https://img.food.com/pic.jpg", max_bytes=1000)
+
+    response.iter_content.assert_not_called()
+
+def test_download_recipe_image_rejects_streamed_size():
+    with mock.patch("requests.get", return_value=image_response(large_jpeg(), {"Content-Type": "image/jpeg"})):
+        with pytest.raises(ImageDownloadError):
+            download_recipe_image("https://img.food.com/pic.jpg", max_bytes=1000)
+
+def test_download_recipe_image_rejects_non_images():
+    with mock.patch("requests.get", return_value=image_response(b"<html></html>", {"Content-Type": "text/html; charset=utf-8"})):
+        with pytest.raises(ImageDownloadError):
+            download_recipe_image("https://img.food.com/pic.jpg")
+
+def test_get_recipe_from_html_keeps_url_when_image_fails():
+    recipe_cache.clear()
+    html = open("test/test_recipe.html", "rb").read()
+
+    with mock.patch.object(util, "download_recipe_image", side_effect=ImageDownloadError("too large")):
+        result = get_recipe_from_html(html, "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781", True)
+
+    assert result["image"].startswith("http")
+
+def test_get_recipe_from_html_retries_failed_image():
+    import requests
+    from PIL import UnidentifiedImageError
+
+    recipe_cache.clear()
+    html = open("test/test_recipe.html", "rb").read()
+    url = "https://www.food.com/recipe/pork-chops-with-golden-applesauce-150781"
+
+    for error in (requests.ConnectionError("offline"), requests.Timeout("slow"), UnidentifiedImageError("not an image")):
+        with mock.patch.object(util, "download_recipe_image", side_effect=error) as download:
+            assert get_recipe_from_html(html, url, True)["image"].startswith("http")
+            assert get_recipe_from_html(html, url, True)["image"].startswith("http")
+
+        # the url fallback is not cached so the download is tried again
+        assert download.call_count == 2
+
+    with mock.patch.object(util, "download_recipe_image", return_value=(b"\xff\xd8image", "image/jpeg")):
+        assert get_recipe_from_html(html, url, True)["image"].startswith("data:image/jpeg")